@@ -34,7 +34,7 @@ from graia.amnesia.transport.common.storage import CacheStorage
 from graia.broadcast import Broadcast
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
 
-from .connection import ConnectionInterface
+from .connection import ConnectionInterface, HttpClientConnection
 from .connection._info import U_Info
 from .connection.util import CallMethod, UploadMethod, build_event
 from .context import enter_context, enter_message_send_context
@@ -66,7 +66,7 @@ from .model import (
     Stranger,
 )
 from .model.relationship import Client
-from .model.util import AriadneOptions
+from .model.util import AriadneOptions, is_deferred
 from .service import ElizabethService
 from .typing import (
     SendMessageActionProtocol,
@@ -83,9 +83,14 @@ from .util import (
     loguru_exc_callback,
     loguru_exc_callback_async,
 )
+from .util.bulk import BulkResult, TokenBucket, run_bulk
+from .util.observer import observers
 
 if TYPE_CHECKING:
+    from .connection.filter import EventFilter
+    from .connection.gate import DispatchGate, OrderedDispatchGate
     from .message.element import Image, Voice
+    from .storage import EntityStore, MessageStore
 
 
 class Ariadne:
@@ -100,6 +105,10 @@ class Ariadne:
     connection: ConnectionInterface
     default_send_action: SendMessageActionProtocol
     log_config: LogConfig
+    entity_store: Optional["EntityStore"]
+    message_store: Optional["MessageStore"]
+    dispatch_gate: Optional[Union["DispatchGate", "OrderedDispatchGate"]]
+    event_filter: Optional["EventFilter"]
 
     @class_property
     def broadcast(cls) -> Broadcast:
@@ -186,6 +195,10 @@ class Ariadne:
         self,
         connection: Iterable[U_Info] = (),
         log_config: Optional[LogConfig] = None,
+        entity_store: Optional["EntityStore"] = None,
+        message_store: Optional["MessageStore"] = None,
+        dispatch_gate: Optional[Union["DispatchGate", "OrderedDispatchGate"]] = None,
+        event_filter: Optional["EventFilter"] = None,
     ) -> None:
         """针对单个账号初始化 Ariadne 实例.
 
@@ -194,6 +207,13 @@ class Ariadne:
         Args:
             connection (Iterable[U_Info]): 连接信息, 通过 `graia.ariadne.connection.config` 生成
             log_config (Optional[LogConfig], optional): 日志配置
+            entity_store (Optional[EntityStore], optional): 好友, 群组与群成员的持久化存储
+            message_store (Optional[MessageStore], optional): 消息历史的持久化存储
+            dispatch_gate (Optional[Union[DispatchGate, OrderedDispatchGate]], optional): 事件分发闸门, \
+                `DispatchGate` 限制并发与排队, `OrderedDispatchGate` 按会话保序分发, \
+                为 None 时收到的事件会立即分发
+            event_filter (Optional[EventFilter], optional): 在构造事件前按原始数据过滤事件, \
+                可拒绝指定的事件类型, 群组, 用户或没有监听器的事件
 
         Returns:
             None: 无返回值
@@ -215,19 +235,29 @@ class Ariadne:
             account
         )
         self.log_config: LogConfig = log_config or LogConfig()
+        self.entity_store = entity_store
+        self.message_store = message_store
+        self.dispatch_gate = dispatch_gate
+        self.event_filter = event_filter
+        if event_filter:
+            event_filter.bind(self.service.broadcast)
+            self.connection.set_event_filter(event_filter)
         self.connection.add_callback(self.log_config.event_hook(self))
         self.connection.add_callback(self._event_hook)
 
     async def _event_hook(self, event: MiraiEvent):
         with ExitStack() as stack:
             stack.enter_context(enter_context(self, event))
-            sys.audit("AriadnePostRemoteEvent", event)
+            if observers.event_active:
+                observers.emit_event(event)
             cache_set = self.launch_manager.get_interface(Memcache).set
 
             if isinstance(event, (MessageEvent, ActiveMessage)):
                 await cache_set(f"account.{self.account}.message.{int(event)}", event, timedelta(seconds=120))
-                if not event.message_chain:
+                if not is_deferred(event, "message_chain") and not event.message_chain:
                     event.message_chain.append("<! 不支持的消息类型 !>")
+                if self.message_store:
+                    self.message_store.put(self.account, event)
 
             if isinstance(event, FriendEvent):
                 stack.enter_context(enter_message_send_context(UploadMethod.Friend))
@@ -237,6 +267,8 @@ class Ariadne:
                     await cache_set(
                         f"account.{self.account}.friend.{int(friend)}", friend, timedelta(seconds=120)
                     )
+                    if self.entity_store:
+                        self.entity_store.put_friend(self.account, friend)
 
             elif isinstance(event, GroupEvent):
                 stack.enter_context(enter_message_send_context(UploadMethod.Group))
@@ -257,13 +289,20 @@ class Ariadne:
                         member,
                         timedelta(seconds=120),
                     )
+                    if self.entity_store:
+                        self.entity_store.put_member(self.account, member)
 
                 if group:
                     await cache_set(
                         f"account.{self.account}.group.{int(group)}", group, timedelta(seconds=120)
                     )
+                    if self.entity_store:
+                        self.entity_store.put_group(self.account, group)
 
-            self.service.broadcast.postEvent(event)
+            if self.dispatch_gate:
+                await self.dispatch_gate.submit(event, self.service.broadcast.postEvent)
+            else:
+                self.service.broadcast.postEvent(event)
 
     @classmethod
     def _patch_launch_manager(cls) -> None:
@@ -357,6 +396,18 @@ class Ariadne:
             raise ValueError("Ambiguous account reference, set Ariadne.default_account")
         return Ariadne.instances[cls.options["default_account"]]
 
+    async def _lookup_message(
+        self, message_id: int, target: Optional[int] = None
+    ) -> Optional[Union[MessageEvent, ActiveMessage]]:
+        if target is None and (
+            event := await self.launch_manager.get_interface(Memcache).get(
+                f"account.{self.account}.message.{message_id}"
+            )
+        ):
+            return event
+        if self.message_store:
+            return await self.message_store.get(self.account, message_id, target)
+
     @ariadne_api
     async def get_version(self, *, cache: bool = False) -> str:
         """获取后端 Mirai HTTP API 版本.
@@ -1022,6 +1073,90 @@ class Ariadne:
             },
         )
 
+    def _bulk_concurrency(self, concurrency: Optional[int], default: int) -> int:
+        if concurrency is not None:
+            return concurrency
+        connection = self.connection.connection
+        if isinstance(connection, HttpClientConnection):
+            return connection.info.pool.concurrency
+        return default
+
+    @ariadne_api
+    async def mute_members(
+        self,
+        group: Union[Group, int],
+        members: Iterable[Union[Member, int]],
+        time: int,
+        *,
+        concurrency: Optional[int] = None,
+        rate: Union[float, TokenBucket, None] = 10.0,
+    ) -> BulkResult[int, None]:
+        """在指定群组批量禁言群成员, 以有界的并发发起调用, 单个成员的失败不会中断其他成员
+
+        Args:
+            group (Union[Group, int]): 指定的群组
+            members (Iterable[Union[Member, int]]): 指定的群成员
+            time (int): 禁言时长, 单位秒, 修正规则同 `mute_member`
+            concurrency (int, optional): 同时进行的调用数上限, 默认为 HTTP 连接池的并发上限, \
+                其他连接为 8.
+            rate (Union[float, TokenBucket, None], optional): 每秒调用数上限或共享的 `TokenBucket`, \
+                默认为 10.0.
+
+        Returns:
+            BulkResult[int, None]: 以成员 QQ 号为键的批量结果
+        """
+        time = max(0, min(time, 2592000))
+        group_id = int(group)
+
+        async def mute(member: Union[Member, int]) -> None:
+            if time:
+                await self.connection.call(
+                    "mute", CallMethod.POST, {"target": group_id, "memberId": int(member), "time": time}
+                )
+
+        return await run_bulk(
+            mute, members, int, concurrency=self._bulk_concurrency(concurrency, 8), rate=rate
+        )
+
+    @ariadne_api
+    async def kick_members(
+        self,
+        group: Union[Group, int],
+        members: Iterable[Union[Member, int]],
+        message: str = "",
+        block: bool = False,
+        *,
+        concurrency: Optional[int] = None,
+        rate: Union[float, TokenBucket, None] = 10.0,
+    ) -> BulkResult[int, None]:
+        """将多个成员从指定群组踢出, 以有界的并发发起调用, 单个成员的失败不会中断其他成员
+
+        Args:
+            group (Union[Group, int]): 指定的群组
+            members (Iterable[Union[Member, int]]): 指定的群成员
+            message (str, optional): 对踢出对象要展示的消息
+            block (bool, optional): 是否不再接受这些成员的加群申请
+            concurrency (int, optional): 同时进行的调用数上限, 默认为 HTTP 连接池的并发上限, \
+                其他连接为 8.
+            rate (Union[float, TokenBucket, None], optional): 每秒调用数上限或共享的 `TokenBucket`, \
+                默认为 10.0.
+
+        Returns:
+            BulkResult[int, None]: 以成员 QQ 号为键的批量结果
+        """
+        group_id = int(group)
+
+        async def kick(member: Union[Member, int]) -> None:
+            await self.connection.call(
+                "kick",
+                CallMethod.POST,
+                {"target": group_id, "memberId": int(member), "msg": message, "block": block},
+            )
+
+        return await run_bulk(
+            kick, members, int, concurrency=self._bulk_concurrency(concurrency, 8), rate=rate
+        )
+
     @ariadne_api
     async def quit_group(self, group: Union[Group, int]) -> None:
         """
@@ -1071,11 +1206,9 @@ class Ariadne:
         if tuple(map(int, (await self.get_version(cache=True)).split("."))) >= (2, 6, 0):
             if target is not None:
                 pass
-            elif (
-                event := await self.launch_manager.get_interface(Memcache).get(
-                    f"account.{self.account}.message.{int(message)}"
-                )
-            ) and isinstance(event, (GroupMessage, ActiveGroupMessage)):
+            elif (event := await self._lookup_message(int(message))) and isinstance(
+                event, (GroupMessage, ActiveGroupMessage)
+            ):
                 return await self.set_essence(event)
             elif (
                 target := await DispatcherInterface.ctx.get().lookup_param("target", Optional[Group], None)
@@ -1276,6 +1409,8 @@ class Ariadne:
         await asyncio.gather(
             *(cache_set(f"account.{self.account}.friend.{int(i)}", i, timedelta(seconds=120)) for i in result)
         )
+        if self.entity_store:
+            self.entity_store.replace_friends(self.account, result)
         return result
 
     @overload
@@ -1331,6 +1466,9 @@ class Ariadne:
         if cache and (friend := await cache_get(key)):
             return friend
 
+        if cache and self.entity_store and (friend := self.entity_store.get_friend(self.account, friend_id)):
+            return friend
+
         await self.get_friend_list()
 
         if friend := await cache_get(key):
@@ -1359,6 +1497,8 @@ class Ariadne:
         await asyncio.gather(
             *(cache_set(f"account.{self.account}.group.{int(i)}", i, timedelta(120)) for i in result)
         )
+        if self.entity_store:
+            self.entity_store.replace_groups(self.account, result)
         return result
 
     @overload
@@ -1414,6 +1554,9 @@ class Ariadne:
         if cache and (group := await cache_get(key)):
             return group
 
+        if cache and self.entity_store and (group := self.entity_store.get_group(self.account, group_id)):
+            return group
+
         await self.get_group_list()
 
         if group := await cache_get(key):
@@ -1435,6 +1578,11 @@ class Ariadne:
         """
         group_id = int(group)
 
+        if cache and self.entity_store:
+            stored = self.entity_store.get_member_list(self.account, group_id)
+            if stored is not None:
+                return stored
+
         result = [
             Member.parse_obj(i)
             for i in await (
@@ -1468,6 +1616,8 @@ class Ariadne:
                 for i in result
             ),
         )
+        if self.entity_store:
+            self.entity_store.replace_members(self.account, group_id, result)
 
         return result
 
@@ -1490,6 +1640,10 @@ class Ariadne:
         if cache and (member := await interface.get(key)):
             return member
 
+        if cache and self.entity_store:
+            if member := self.entity_store.get_member(self.account, group_id, member_id):
+                return member
+
         result = Member.parse_obj(
             await self.connection.call(
                 "memberInfo",
@@ -1505,6 +1659,8 @@ class Ariadne:
             interface.set(f"account.{self.account}.group.{group_id}", result.group, timedelta(seconds=120)),
             interface.set(key, result, timedelta(seconds=120)),
         )
+        if self.entity_store:
+            self.entity_store.put_member(self.account, result)
 
         return result
 
@@ -1601,6 +1757,8 @@ class Ariadne:
         """从 消息 ID 提取 消息事件.
 
         Note:
+            若配置了 `message_store`, 将优先从中查找.
+
             后端 Mirai HTTP API 版本 >= 2.6.0, 仅指定 message 时,
             将尝试使用缓存获得消息事件或以当前事件来源作为 target.
 
@@ -1613,13 +1771,15 @@ class Ariadne:
             MessageEvent: 提取的事件.
         """
 
+        if event := await self._lookup_message(
+            int(message),
+            None if target is None else self.account if isinstance(target, Client) else int(target),
+        ):
+            return event
+
         if tuple(map(int, (await self.get_version(cache=True)).split("."))) >= (2, 6, 0):
             if target is not None:
                 pass
-            elif event := await self.launch_manager.get_interface(Memcache).get(
-                f"account.{self.account}.message.{message}"
-            ):
-                return event
             elif (
                 target := await DispatcherInterface.ctx.get().lookup_param(
                     "target", Optional[Union[Friend, Group, Member, Stranger, Client]], None
@@ -1703,6 +1863,8 @@ class Ariadne:
                     source=Source(id=result["messageId"], time=datetime.now()),
                     subject=(await self.get_friend(int(target), assertion=True, cache=True)),
                 )
+                if self.message_store:
+                    self.message_store.put(self.account, event)
                 with enter_context(self, event):
                     await self.log_config.log(self, event)
                     self.service.broadcast.postEvent(event)
@@ -1781,6 +1943,8 @@ class Ariadne:
                     source=Source(id=result["messageId"], time=datetime.now()),
                     subject=(await self.get_group(int(target), assertion=True, cache=True)),
                 )
+                if self.message_store:
+                    self.message_store.put(self.account, event)
                 with enter_context(self, event):
                     await self.log_config.log(self, event)
                     self.service.broadcast.postEvent(event)
@@ -1793,6 +1957,38 @@ class Ariadne:
                 )
                 raise
 
+    @ariadne_api
+    async def send_to_groups(
+        self,
+        targets: Iterable[Union[Group, int]],
+        message: MessageContainer,
+        *,
+        concurrency: Optional[int] = None,
+        rate: Union[float, TokenBucket, None] = 2.0,
+    ) -> BulkResult[int, ActiveGroupMessage]:
+        """将同一条消息发送到多个群组, 以有界的并发与限速发起调用, 单个群组的失败不会中断其他群组
+
+        Args:
+            targets (Iterable[Union[Group, int]]): 指定的群组
+            message (MessageContainer): 有效的消息容器.
+            concurrency (int, optional): 同时进行的调用数上限, 默认为 HTTP 连接池的并发上限, \
+                其他连接为 4.
+            rate (Union[float, TokenBucket, None], optional): 每秒调用数上限或共享的 `TokenBucket`, \
+                默认为 2.0.
+
+        Returns:
+            BulkResult[int, ActiveGroupMessage]: 以群号为键的批量结果
+        """
+        message = MessageChain(message)
+        send = Ariadne.send_group_message.__wrapped__  # type: ignore
+
+        async def send_one(target: Union[Group, int]) -> ActiveGroupMessage:
+            return await send(self, target, message.copy(), action=None)
+
+        return await run_bulk(
+            send_one, targets, int, concurrency=self._bulk_concurrency(concurrency, 4), rate=rate
+        )
+
     @ariadne_api
     async def send_temp_message(
         self,
@@ -1863,6 +2059,8 @@ class Ariadne:
                     source=Source(id=result["messageId"], time=datetime.now()),
                     subject=(await self.get_member(int(group), int(target), cache=True)),
                 )
+                if self.message_store:
+                    self.message_store.put(self.account, event)
                 with enter_context(self, event):
                     await self.log_config.log(self, event)
                     self.service.broadcast.postEvent(event)
@@ -2072,9 +2270,7 @@ class Ariadne:
         if tuple(map(int, (await self.get_version(cache=True)).split("."))) >= (2, 6, 0):
             if target is not None:
                 pass
-            elif event := await self.launch_manager.get_interface(Memcache).get(
-                f"account.{self.account}.message.{int(message)}"
-            ):
+            elif event := await self._lookup_message(int(message)):
                 return await self.recall_message(event)
             elif (
                 target := await DispatcherInterface.ctx.get().lookup_param(
@@ -2094,6 +2290,38 @@ class Ariadne:
 
         await self.connection.call("recall", CallMethod.POST, params)
 
+    @ariadne_api
+    async def recall_messages(
+        self,
+        messages: Iterable[Union[MessageEvent, ActiveMessage, Source, int]],
+        target: Optional[Union[Friend, Group, Member, Stranger, Client, int]] = None,
+        *,
+        concurrency: Optional[int] = None,
+        rate: Union[float, TokenBucket, None] = 10.0,
+    ) -> BulkResult[int, None]:
+        """批量撤回消息, 以有界的并发发起调用, 单条消息的失败不会中断其他消息
+
+        Args:
+            messages (Iterable[Union[MessageEvent, ActiveMessage, Source, int]]): 指定的消息
+            target (Union[Friend, Group, Member, Stranger, Client, int], optional): 指定的好友或群组, \
+                规则同 `recall_message`
+            concurrency (int, optional): 同时进行的调用数上限, 默认为 HTTP 连接池的并发上限, \
+                其他连接为 8.
+            rate (Union[float, TokenBucket, None], optional): 每秒调用数上限或共享的 `TokenBucket`, \
+                默认为 10.0.
+
+        Returns:
+            BulkResult[int, None]: 以消息 ID 为键的批量结果
+        """
+        recall = Ariadne.recall_message.__wrapped__  # type: ignore
+
+        async def recall_one(message: Union[MessageEvent, ActiveMessage, Source, int]) -> None:
+            await recall(self, message, target)
+
+        return await run_bulk(
+            recall_one, messages, int, concurrency=self._bulk_concurrency(concurrency, 8), rate=rate
+        )
+
     @ariadne_api
     async def get_roaming_message(
         self, start: datetime, end: datetime, target: Union[Friend, int]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Generic
 from typing_extensions import Self
 
@@ -11,7 +13,9 @@ from graia.amnesia.transport.common.status import ConnectionStatus as BaseConnec
 from ..event import MiraiEvent
 from ..util import camel_to_snake
 from ._info import HttpClientInfo, HttpServerInfo, T_Info, U_Info, WebsocketClientInfo, WebsocketServerInfo
-from .util import CallMethod
+from .filter import EventFilter
+from .reconnect import CircuitState
+from .util import CallMethod, build_event
 
 if TYPE_CHECKING:
     from ..service import ElizabethService
@@ -21,9 +25,21 @@ class ConnectionStatus(BaseConnectionStatus, LaunchableStatus):
     """连接状态"""
 
     alive = Stats[bool]("alive", default=False)
+    failures = Stats[int]("failures", default=0)
+    circuit = Stats[CircuitState]("circuit", default=CircuitState.CLOSED)
+
+    outage_since: float | None
+    """当前故障开始的时间戳, 未处于故障时为 None"""
+    outage_count: int
+    """累计故障次数"""
+    outage_total: float
+    """已恢复的故障的累计时长, 单位为秒"""
 
     def __init__(self) -> None:
         self._session_key: str | None = None
+        self.outage_since = None
+        self.outage_count = 0
+        self.outage_total = 0.0
         super().__init__()
 
     @property
@@ -39,6 +55,23 @@ class ConnectionStatus(BaseConnectionStatus, LaunchableStatus):
     def available(self) -> bool:
         return bool(self.connected and self.session_key and self.alive)
 
+    @property
+    def outage(self) -> float:
+        """当前故障已持续的时间, 单位为秒"""
+        return 0.0 if self.outage_since is None else time.time() - self.outage_since
+
+    def begin_outage(self) -> None:
+        """标记故障开始, 已处于故障时不做任何事"""
+        if self.outage_since is None:
+            self.outage_since = time.time()
+            self.outage_count += 1
+
+    def end_outage(self) -> None:
+        """标记故障结束, 并计入累计时长"""
+        if self.outage_since is not None:
+            self.outage_total += self.outage
+            self.outage_since = None
+
     def __repr__(self) -> str:
         return "<ConnectionStatus {}>".format(
             " ".join(
@@ -47,6 +80,7 @@ class ConnectionStatus(BaseConnectionStatus, LaunchableStatus):
                     f"alive={self.alive}",
                     f"verified={self.session_key is not None}",
                     f"stage={self.stage}",
+                    *([f"circuit={self.circuit.value}"] if self.circuit != CircuitState.CLOSED else []),
                 ]
             )
         )
@@ -59,6 +93,7 @@ class ConnectionMixin(Launchable, Generic[T_Info]):
 
     fallback: HttpClientConnection | None
     event_callbacks: list[Callable[[MiraiEvent], Awaitable[Any]]]
+    event_filter: EventFilter | None
     _connection_fail: Callable
 
     @property
@@ -81,6 +116,7 @@ class ConnectionMixin(Launchable, Generic[T_Info]):
         self.info = info
         self.fallback = None
         self.event_callbacks = []
+        self.event_filter = None
         self.status = ConnectionStatus()
 
     async def call(
@@ -104,10 +140,32 @@ class ConnectionMixin(Launchable, Generic[T_Info]):
             f"Connection {self} can't perform {command!r}, consider configuring a HttpClientConnection?"
         )
 
+    async def _post_event(self, event: MiraiEvent) -> None:
+        """将事件交给所有回调, 全部完成后才会返回
+
+        Args:
+            event (MiraiEvent): 事件
+        """
+        callbacks = self.event_callbacks
+        if len(callbacks) == 1:
+            await callbacks[0](event)
+        else:
+            await asyncio.gather(*(callback(event) for callback in callbacks))
+
+    async def _handle_event(self, data: dict) -> None:
+        """过滤原始事件数据, 通过后才构造事件并交给所有回调
+
+        Args:
+            data (dict): 原始事件数据
+        """
+        if self.event_filter is None or self.event_filter.accept(data):
+            await self._post_event(build_event(data))
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.status} with {len(self.event_callbacks)} callbacks>"
 
 
+from .group import ConnectionGroup as ConnectionGroup  # noqa: E402
 from .http import HttpClientConnection as HttpClientConnection  # noqa: E402
 from .http import HttpServerConnection as HttpServerConnection  # noqa: E402
 from .ws import WebsocketClientConnection as WebsocketClientConnection  # noqa: E402
@@ -192,6 +250,16 @@ class ConnectionInterface(ExportInterface["ElizabethService"]):
             raise ValueError("Unable to find connection to add callback")
         self.connection.event_callbacks.append(callback)
 
+    def set_event_filter(self, event_filter: EventFilter | None) -> None:
+        """设置在构造事件前过滤原始数据的 `EventFilter`
+
+        Args:
+            event_filter (EventFilter, optional): 事件过滤器, 为 None 时不过滤
+        """
+        if self.connection is None:
+            raise ValueError("Unable to find connection to set event filter")
+        self.connection.event_filter = event_filter
+
     @property
     def status(self) -> ConnectionStatus:
         """获取连接状态"""
@@ -1,12 +1,69 @@
-from typing import Dict, NamedTuple, TypeVar, Union
+from typing import Dict, NamedTuple, Optional, TypeVar, Union
 
 from yarl import URL
 
+from .reconnect import ReconnectPolicy
+
+
+class HttpPoolConfig(NamedTuple):
+    """HTTP 客户端连接池配置"""
+
+    limit: int = 64
+    """连接总数上限, 为 0 时不限制"""
+
+    limit_per_host: int = 32
+    """到同一主机的连接数上限, 即同时进行的请求数, 为 0 时不限制"""
+
+    keepalive_timeout: float = 30.0
+    """空闲连接的保持时间, 单位为秒"""
+
+    dns_cache_ttl: Optional[int] = 300
+    """DNS 缓存时间, 单位为秒, 为 None 时不缓存"""
+
+    timeout: Optional[float] = 300.0
+    """单个请求的总超时时间, 单位为秒, 为 None 时不限制"""
+
+    connect_timeout: Optional[float] = 30.0
+    """建立连接的超时时间, 单位为秒, 为 None 时不限制"""
+
+    @property
+    def concurrency(self) -> int:
+        """连接池允许的最大并发请求数, 不限制时为 0"""
+        return min(filter(None, (self.limit, self.limit_per_host)), default=0)
+
+
+class WebhookQueueConfig(NamedTuple):
+    """HTTP 服务器的事件队列配置
+
+    启用后收到事件即响应, 事件在后台由工作者处理; 队列已满时以 503 拒绝.
+    """
+
+    size: int = 0
+    """队列容量, 为 0 时不启用队列, 事件处理完毕后才响应"""
+
+    workers: int = 4
+    """处理事件的工作者数量, 为 1 时保持事件的处理顺序"""
+
+    drain_timeout: float = 5.0
+    """退出时等待队列中的事件处理完毕的时间, 单位为秒"""
+
+
+class WebsocketTransportConfig(NamedTuple):
+    """Websocket 客户端的传输配置"""
+
+    compress: int = 0
+    """permessage-deflate 压缩的窗口位数 (9 ~ 15), 越大压缩率越高, 内存占用也越大; 为 0 时不协商压缩"""
+
+    max_msg_size: int = 4 * 1024 * 1024
+    """单条消息的大小上限, 单位为字节, 超出时连接会被关闭; 大群的 `memberList` 可能需要调大, 为 0 时不限制"""
+
 
 class HttpClientInfo(NamedTuple):
     account: int
     verify_key: str
     host: str
+    reconnect: ReconnectPolicy = ReconnectPolicy()
+    pool: HttpPoolConfig = HttpPoolConfig()
 
     def get_url(self, route: str) -> str:
         return str(URL(self.host) / route)
@@ -16,6 +73,8 @@ class WebsocketClientInfo(NamedTuple):
     account: int
     verify_key: str
     host: str
+    reconnect: ReconnectPolicy = ReconnectPolicy()
+    transport: WebsocketTransportConfig = WebsocketTransportConfig()
 
     def get_url(self, route: str) -> str:
         return str(URL(self.host) / route)
@@ -34,6 +93,7 @@ class HttpServerInfo(NamedTuple):
     verify_key: str
     path: str
     headers: Dict[str, str]
+    queue: WebhookQueueConfig = WebhookQueueConfig()
 
 
 U_Info = Union[HttpClientInfo, WebsocketClientInfo, WebsocketServerInfo, HttpServerInfo]
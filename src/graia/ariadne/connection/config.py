@@ -3,6 +3,10 @@ from typing_extensions import NotRequired, Required, TypedDict
 
 from ..typing import DictStrAny
 from ._info import HttpClientInfo, HttpServerInfo, U_Info, WebsocketClientInfo, WebsocketServerInfo
+from ._info import HttpPoolConfig as HttpPoolConfig
+from ._info import WebhookQueueConfig as WebhookQueueConfig
+from ._info import WebsocketTransportConfig as WebsocketTransportConfig
+from .reconnect import ReconnectPolicy as ReconnectPolicy
 
 if TYPE_CHECKING:
     from ..app import Ariadne
@@ -13,6 +17,10 @@ class WebsocketClientConfig(NamedTuple):
 
     host: str = "http://localhost:8080"
     """mirai-api-http 的 Endpoint"""
+    reconnect: ReconnectPolicy = ReconnectPolicy()
+    """断线重连策略"""
+    transport: WebsocketTransportConfig = WebsocketTransportConfig()
+    """压缩与消息大小配置"""
 
 
 class WebsocketServerConfig(NamedTuple):
@@ -31,6 +39,10 @@ class HttpClientConfig(NamedTuple):
 
     host: str = "http://localhost:8080"
     """mirai-api-http 的 Endpoint"""
+    reconnect: ReconnectPolicy = ReconnectPolicy()
+    """断线重连策略"""
+    pool: HttpPoolConfig = HttpPoolConfig()
+    """连接池配置"""
 
 
 class HttpServerConfig(NamedTuple):
@@ -42,6 +54,9 @@ class HttpServerConfig(NamedTuple):
     headers: Dict[str, str] = {}
     """用于验证的请求头"""
 
+    queue: WebhookQueueConfig = WebhookQueueConfig()
+    """事件队列配置, 启用后收到事件即响应"""
+
 
 U_Config = Union[HttpClientConfig, WebsocketClientConfig, WebsocketServerConfig, HttpServerConfig]
 
@@ -0,0 +1,161 @@
+"""在构造事件模型前, 按原始数据过滤事件
+
+`EventFilter` 在连接层检查远端推送的原始字典, 被拒绝的事件不会被解析, 也不会交给任何回调.
+
+Example:
+    ```py
+    Ariadne(
+        ...,
+        event_filter=EventFilter(
+            block_types={"FriendInputStatusChangedEvent"},
+            block_groups={12345678},
+            listened_only=True,
+        ),
+    )
+    ```
+"""
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Optional
+
+if TYPE_CHECKING:
+    from graia.broadcast import Broadcast
+
+
+def raw_group(data: Dict[str, Any]) -> Optional[int]:
+    """从原始事件数据中提取群号
+
+    Args:
+        data (Dict[str, Any]): 原始事件数据
+
+    Returns:
+        Optional[int]: 群号, 事件与群组无关时为 None
+    """
+    for key in ("sender", "member", "operator"):
+        entity = data.get(key)
+        if isinstance(entity, dict) and isinstance(entity.get("group"), dict):
+            return entity["group"].get("id")
+    group = data.get("group")
+    if isinstance(group, dict):
+        return group.get("id")
+    subject = data.get("subject")
+    if isinstance(subject, dict) and subject.get("kind") == "Group":
+        return subject.get("id")
+
+
+def raw_user(data: Dict[str, Any]) -> Optional[int]:
+    """从原始事件数据中提取触发事件的用户 QQ 号
+
+    Args:
+        data (Dict[str, Any]): 原始事件数据
+
+    Returns:
+        Optional[int]: QQ 号, 无法确定时为 None
+    """
+    for key in ("sender", "member", "friend"):
+        entity = data.get(key)
+        if isinstance(entity, dict):
+            return entity.get("id")
+    return data.get("fromId")
+
+
+class EventFilter:
+    """按事件类型, 群组, 用户与监听器注册情况过滤原始事件
+
+    允许列表为 None 时不限制, 阻止列表优先于允许列表.
+    """
+
+    dropped: "Counter[str]"
+    """按事件类型统计的被拒绝的事件数"""
+
+    def __init__(
+        self,
+        *,
+        allow_types: Optional[Iterable[str]] = None,
+        block_types: Iterable[str] = (),
+        allow_groups: Optional[Iterable[int]] = None,
+        block_groups: Iterable[int] = (),
+        allow_users: Optional[Iterable[int]] = None,
+        block_users: Iterable[int] = (),
+        listened_only: bool = False,
+    ) -> None:
+        """
+        Args:
+            allow_types (Iterable[str], optional): 只接受这些类型的事件, 如 "GroupMessage"
+            block_types (Iterable[str], optional): 拒绝这些类型的事件
+            allow_groups (Iterable[int], optional): 只接受这些群的事件, 与群组无关的事件不受影响
+            block_groups (Iterable[int], optional): 拒绝这些群的事件
+            allow_users (Iterable[int], optional): 只接受这些用户触发的事件, 无法确定用户的事件不受影响
+            block_users (Iterable[int], optional): 拒绝这些用户触发的事件
+            listened_only (bool, optional): 是否拒绝没有任何监听器的事件类型. 默认为 False. \
+                被拒绝的事件也不会被记录, 缓存或写入 `MessageStore`.
+        """
+        self.allow_types: Optional[FrozenSet[str]] = None if allow_types is None else frozenset(allow_types)
+        self.block_types: FrozenSet[str] = frozenset(block_types)
+        self.allow_groups: Optional[FrozenSet[int]] = (
+            None if allow_groups is None else frozenset(allow_groups)
+        )
+        self.block_groups: FrozenSet[int] = frozenset(block_groups)
+        self.allow_users: Optional[FrozenSet[int]] = None if allow_users is None else frozenset(allow_users)
+        self.block_users: FrozenSet[int] = frozenset(block_users)
+        self.listened_only = listened_only
+        self.broadcast: Optional[Broadcast] = None
+        self.dropped = Counter()
+        self._check_groups = self.allow_groups is not None or bool(self.block_groups)
+        self._check_users = self.allow_users is not None or bool(self.block_users)
+
+    def bind(self, broadcast: "Broadcast") -> None:
+        """绑定事件系统, 用于查询监听器注册情况
+
+        Args:
+            broadcast (Broadcast): 事件系统
+        """
+        self.broadcast = broadcast
+
+    @property
+    def listened(self) -> FrozenSet[str]:
+        """有监听器的事件类型名, 每次读取时根据当前的监听器重新计算"""
+        if self.broadcast is None:
+            return frozenset()
+        return frozenset(
+            event.__name__ for listener in self.broadcast.listeners for event in listener.listening_events
+        )
+
+    def accept(self, data: Dict[str, Any]) -> bool:
+        """检查原始事件数据, 被拒绝的事件会计入 `dropped`
+
+        Args:
+            data (Dict[str, Any]): 原始事件数据
+
+        Returns:
+            bool: 是否接受该事件
+        """
+        event_type: str = data.get("type", "")
+        if not self._allowed(event_type, data):
+            self.dropped[event_type] += 1
+            return False
+        return True
+
+    def _allowed(self, event_type: str, data: Dict[str, Any]) -> bool:
+        if event_type in self.block_types:
+            return False
+        if self.allow_types is not None and event_type not in self.allow_types:
+            return False
+        if self.listened_only and self.broadcast is not None and event_type not in self.listened:
+            return False
+        if self._check_groups:
+            group = raw_group(data)
+            if group is not None and (
+                group in self.block_groups
+                or (self.allow_groups is not None and group not in self.allow_groups)
+            ):
+                return False
+        if self._check_users:
+            user = raw_user(data)
+            if user is not None and (
+                user in self.block_users or (self.allow_users is not None and user not in self.allow_users)
+            ):
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"<EventFilter dropped={sum(self.dropped.values())}>"
@@ -0,0 +1,350 @@
+"""连接与 Broadcast 之间的事件分发闸门"""
+import asyncio
+import contextvars
+import enum
+from collections import Counter, deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from loguru import logger
+
+from ..event import MiraiEvent
+from ..event.message import MessageEvent, TempMessage
+from ..event.mirai import (
+    BotOfflineEventActive,
+    BotOfflineEventDropped,
+    BotOfflineEventForce,
+    BotOnlineEvent,
+    BotReloginEvent,
+    FriendEvent,
+)
+from ..model import Friend, Group, Member
+
+Dispatch = Callable[[MiraiEvent], "asyncio.Future[Any]"]
+
+CRITICAL = 0
+"""关键通道, 不排队, 不丢弃, 不受并发上限限制"""
+
+DEFAULT = 1
+"""默认通道"""
+
+DEFAULT_PRIORITIES: Dict[Type[MiraiEvent], int] = {
+    BotOnlineEvent: CRITICAL,
+    BotOfflineEventActive: CRITICAL,
+    BotOfflineEventForce: CRITICAL,
+    BotOfflineEventDropped: CRITICAL,
+    BotReloginEvent: CRITICAL,
+}
+
+
+class OverflowPolicy(str, enum.Enum):
+    """队列已满时的处理策略"""
+
+    DROP_OLDEST = "drop_oldest"
+    """丢弃优先级最低的通道中最早的事件"""
+
+    DROP_TYPES = "drop_types"
+    """丢弃 `drop_types` 中最早的事件, 没有可丢弃的事件时阻塞读取"""
+
+    BLOCK = "block"
+    """阻塞连接的读取, 直到队列有空位"""
+
+
+class DispatchGate:
+    """事件分发闸门
+
+    限制单个账号同时执行的事件数, 超出的事件按通道排队, 队列满时按 `OverflowPolicy` 处理.
+    通道号越小越先分发, `CRITICAL` 通道 (默认为上下线与重新登录事件) 总是立即分发.
+
+    Note:
+        连接会等待事件回调完成后再读取下一条数据, 因此阻塞会反压至连接.
+        Websocket 连接的 API 响应与事件共用同一读取循环,
+        阻塞期间正在执行的监听器无法收到 API 响应, 所以阻塞最多持续 `block_timeout` 秒,
+        之后改为丢弃最早的事件.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_queue: int = 1024,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        *,
+        drop_types: Iterable[Type[MiraiEvent]] = (),
+        priorities: Optional[Mapping[Type[MiraiEvent], int]] = None,
+        block_timeout: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            max_in_flight (int, optional): 同时执行的事件数上限. 默认为 64.
+            max_queue (int, optional): 排队的事件数上限. 默认为 1024.
+            overflow (OverflowPolicy, optional): 队列满时的处理策略. 默认为 `OverflowPolicy.BLOCK`.
+            drop_types (Iterable[Type[MiraiEvent]], optional): `OverflowPolicy.DROP_TYPES` 可丢弃的事件类型, \
+                包括其子类
+            priorities (Optional[Mapping[Type[MiraiEvent], int]], optional): 事件类型到通道号的映射, \
+                按 MRO 查找, 默认为 `DEFAULT_PRIORITIES`, 未命中的事件使用 `DEFAULT` 通道
+            block_timeout (float, optional): 阻塞读取的最长时间, 单位为秒. 默认为 5.0.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.overflow = OverflowPolicy(overflow)
+        self.drop_types: Tuple[Type[MiraiEvent], ...] = tuple(drop_types)
+        self.priorities: Dict[Type[MiraiEvent], int] = dict(
+            DEFAULT_PRIORITIES if priorities is None else priorities
+        )
+        self.block_timeout = block_timeout
+        self.in_flight: int = 0
+        self.queued: int = 0
+        self.dropped: Counter[str] = Counter()
+        self.lanes: Dict[int, Deque[Tuple[MiraiEvent, Dispatch, contextvars.Context]]] = {}
+        self._lane_cache: Dict[type, int] = {}
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    def lane_of(self, event: MiraiEvent) -> int:
+        """获取事件所属的通道
+
+        Args:
+            event (MiraiEvent): 事件
+
+        Returns:
+            int: 通道号
+        """
+        cls = event.__class__
+        if cls not in self._lane_cache:
+            self._lane_cache[cls] = next(
+                (self.priorities[base] for base in cls.__mro__ if base in self.priorities), DEFAULT
+            )
+        return self._lane_cache[cls]
+
+    async def submit(self, event: MiraiEvent, dispatch: Dispatch) -> None:
+        """提交事件, 在有空闲时以当前上下文调用 `dispatch(event)`
+
+        Args:
+            event (MiraiEvent): 事件
+            dispatch (Dispatch): 实际的分发函数, 如 `Broadcast.postEvent`
+        """
+        lane = self.lane_of(event)
+        if lane <= CRITICAL or (self.in_flight < self.max_in_flight and not self.queued):
+            self._start(event, dispatch, contextvars.copy_context())
+            return
+        while self.queued >= self.max_queue:
+            if not await self._make_room(event):
+                return
+        if lane not in self.lanes:
+            self.lanes = dict(sorted({**self.lanes, lane: deque()}.items()))
+        self.lanes[lane].append((event, dispatch, contextvars.copy_context()))
+        self.queued += 1
+        self._pump()
+
+    async def _make_room(self, event: MiraiEvent) -> bool:
+        if self.overflow is OverflowPolicy.DROP_TYPES:
+            if self.drop_types and isinstance(event, self.drop_types):
+                self._drop(event)
+                return False
+            if self._drop_queued(lambda e: isinstance(e, self.drop_types)):
+                return True
+        elif self.overflow is OverflowPolicy.DROP_OLDEST:
+            if self._drop_queued(lambda _: True):
+                return True
+            self._drop(event)
+            return False
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.block_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dispatch gate blocked for {self.block_timeout}s, dropping the oldest event")
+            if not self._drop_queued(lambda _: True):
+                self._drop(event)
+                return False
+        finally:
+            if not fut.done():
+                fut.cancel()
+                self._waiters.remove(fut)
+        return True
+
+    def _drop_queued(self, predicate: Callable[[MiraiEvent], bool]) -> bool:
+        for lane in reversed(self.lanes.values()):
+            for index, (event, _, _) in enumerate(lane):
+                if predicate(event):
+                    del lane[index]
+                    self.queued -= 1
+                    self._drop(event)
+                    return True
+        return False
+
+    def _drop(self, event: MiraiEvent) -> None:
+        self.dropped[event.type] += 1
+        logger.debug(f"Dispatch gate dropped {event.type}")
+
+    def _start(self, event: MiraiEvent, dispatch: Dispatch, context: contextvars.Context) -> None:
+        self.in_flight += 1
+        try:
+            task = context.run(dispatch, event)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        task.add_done_callback(self._done)
+
+    def _done(self, _: Any) -> None:
+        self.in_flight -= 1
+        self._pump()
+
+    def _pump(self) -> None:
+        for lane in self.lanes.values():
+            while lane and self.in_flight < self.max_in_flight:
+                self.queued -= 1
+                self._start(*lane.popleft())
+        while self._waiters and self.queued < self.max_queue:
+            self._waiters.popleft().set_result(None)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """当前状态, 包含执行中, 排队中与已丢弃的事件数"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "lanes": {lane: len(queue) for lane, queue in self.lanes.items()},
+            "dropped": dict(self.dropped),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<DispatchGate in_flight={self.in_flight}/{self.max_in_flight} "
+            f"queued={self.queued}/{self.max_queue} overflow={self.overflow.value}>"
+        )
+
+
+def conversation_key(event: MiraiEvent) -> Optional[Hashable]:
+    """按事件所在的会话生成分片键
+
+    群组事件与群消息以群号分片, 好友事件与好友消息以好友 QQ 号分片, 临时消息以群号与成员 QQ 号分片.
+
+    Args:
+        event (MiraiEvent): 事件
+
+    Returns:
+        Optional[Hashable]: 分片键, 无法确定会话时为 None
+    """
+    if isinstance(event, MessageEvent):
+        sender = event.sender
+        if isinstance(sender, Member):
+            if isinstance(event, TempMessage):
+                return ("temp", sender.group.id, sender.id)
+            return ("group", sender.group.id)
+        return (sender.__class__.__name__.lower(), sender.id)
+    for name in ("group", "member", "operator", "friend"):
+        obj = getattr(event, name, None)
+        if isinstance(obj, Group):
+            return ("group", obj.id)
+        if isinstance(obj, Member):
+            return ("group", obj.group.id)
+        if isinstance(obj, Friend):
+            return ("friend", obj.id)
+    if isinstance(event, FriendEvent):
+        for name in ("supplicant", "author_id"):
+            if isinstance(target := getattr(event, name, None), int):
+                return ("friend", target)
+    return None
+
+
+class OrderedDispatchGate:
+    """按会话保序的事件分发闸门
+
+    以 `key` 将事件分配到各自的串行队列, 同一队列中的事件在上一个事件处理完成后才会分发,
+    不同队列由最多 `max_workers` 个工作者并行处理.
+    每个队列同时只由一个工作者处理, 且连续处理 `quantum` 个事件后让出, 活跃的会话不会占满所有工作者.
+    分片键为 None 的事件 (如上下线事件) 立即分发.
+
+    Note:
+        在监听器中等待同一会话的后续事件 (如 `FunctionWaiter`) 会使队列停滞,
+        因此单个事件占用队列的时间最多为 `hold_timeout` 秒, 超时后该事件继续执行, 队列继续分发.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[MiraiEvent], Optional[Hashable]] = conversation_key,
+        max_workers: int = 16,
+        *,
+        quantum: int = 8,
+        hold_timeout: Optional[float] = 3.0,
+    ) -> None:
+        """
+        Args:
+            key (Callable[[MiraiEvent], Optional[Hashable]], optional): 分片键函数. 默认为 `conversation_key`.
+            max_workers (int, optional): 并行处理的队列数上限. 默认为 16.
+            quantum (int, optional): 工作者连续处理同一队列的事件数. 默认为 8.
+            hold_timeout (Optional[float], optional): 单个事件占用队列的最长时间, 单位为秒, \
+                为 None 时等待事件处理完成. 默认为 3.0.
+        """
+        self.key = key
+        self.max_workers = max_workers
+        self.quantum = quantum
+        self.hold_timeout = hold_timeout
+        self.queues: Dict[Hashable, Deque[Tuple[MiraiEvent, Dispatch, contextvars.Context]]] = {}
+        self.ready: Deque[Hashable] = deque()
+        self.pending: int = 0
+        self._workers: Set[asyncio.Task[None]] = set()
+
+    async def submit(self, event: MiraiEvent, dispatch: Dispatch) -> None:
+        """提交事件, 轮到其所在队列时以当前上下文调用 `dispatch(event)`
+
+        Args:
+            event (MiraiEvent): 事件
+            dispatch (Dispatch): 实际的分发函数, 如 `Broadcast.postEvent`
+        """
+        key = self.key(event)
+        if key is None:
+            contextvars.copy_context().run(dispatch, event)
+            return
+        item = (event, dispatch, contextvars.copy_context())
+        self.pending += 1
+        if key in self.queues:
+            self.queues[key].append(item)
+            return
+        self.queues[key] = deque((item,))
+        self.ready.append(key)
+        if len(self._workers) < self.max_workers:
+            task = asyncio.create_task(self._work())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    async def _work(self) -> None:
+        while self.ready:
+            key = self.ready.popleft()
+            queue = self.queues[key]
+            for _ in range(self.quantum):
+                event, dispatch, context = queue.popleft()
+                self.pending -= 1
+                try:
+                    task = context.run(dispatch, event)
+                    await asyncio.wait((task,), timeout=self.hold_timeout)
+                except Exception as e:
+                    logger.exception(e)
+                if not queue:
+                    break
+            if queue:
+                self.ready.append(key)
+            else:
+                del self.queues[key]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """当前状态, 包含工作者数, 活跃队列数与排队中的事件数"""
+        return {"workers": len(self._workers), "queues": len(self.queues), "pending": self.pending}
+
+    def __repr__(self) -> str:
+        return (
+            f"<OrderedDispatchGate workers={len(self._workers)}/{self.max_workers} "
+            f"queues={len(self.queues)} pending={self.pending}>"
+        )
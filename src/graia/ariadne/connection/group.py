@@ -0,0 +1,214 @@
+"""同一账号的多条 Websocket 连接
+
+为一个账号配置多个 `WebsocketClientConfig` / `WebsocketServerConfig` 时,
+`ElizabethService` 会将它们组合为一个 `ConnectionGroup`:
+调用被分配到进行中调用最少的可用连接上, 连接断开时未完成的调用会转移到其他连接,
+各连接推送的同一事件只会被处理一次.
+
+Example:
+    ```py
+    Ariadne(
+        config(
+            12345678,
+            "verify_key",
+            WebsocketClientConfig("http://host-a:8080"),
+            WebsocketClientConfig("http://host-b:8080"),
+            HttpClientConfig("http://host-a:8080"),
+        )
+    )
+    ```
+"""
+import asyncio
+import functools
+import json
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+from launart import Launart
+from loguru import logger
+
+from . import ConnectionMixin, ConnectionStatus
+from ._info import T_Info
+from .filter import raw_group, raw_user
+from .util import CallMethod
+from .ws import WebsocketConnectionMixin
+
+
+class GroupStatus(ConnectionStatus):
+    """连接组的状态, 由各成员连接的状态汇总而来"""
+
+    members: List[ConnectionStatus]
+
+    def __init__(self, members: Sequence[ConnectionStatus]) -> None:
+        self.members = list(members)
+        super().__init__()
+
+    @property
+    def connected(self) -> bool:
+        return any(status.connected for status in self.members)
+
+    @property
+    def alive(self) -> bool:
+        return any(status.alive for status in self.members)
+
+    @property
+    def session_key(self) -> Optional[str]:
+        for status in self.members:
+            if status.available:
+                return status.session_key
+        return self._session_key
+
+    @session_key.setter
+    def session_key(self, value: Optional[str]) -> None:  # written by the fallback HttpClientConnection
+        self._session_key = value
+
+    @property
+    def available(self) -> bool:
+        return any(status.available for status in self.members)
+
+    async def wait_for_update(self) -> "GroupStatus":
+        updates = [super().wait_for_update(), *(status.wait_for_update() for status in self.members)]
+        waiters = [asyncio.ensure_future(update) for update in updates]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        return self
+
+
+def event_key(data: dict) -> Hashable:
+    """计算原始事件数据的去重键
+
+    消息事件使用消息的 Source 与所在的群或用户, 其他事件使用数据本身.
+
+    Args:
+        data (dict): 原始事件数据
+
+    Returns:
+        Hashable: 去重键
+    """
+    chain = data.get("messageChain")
+    if chain and isinstance(chain[0], dict) and chain[0].get("type") == "Source":
+        return data.get("type"), raw_group(data), raw_user(data), chain[0].get("id"), chain[0].get("time")
+    return json.dumps(data, sort_keys=True)
+
+
+class ConnectionGroup(ConnectionMixin[T_Info]):
+    """同一账号的多条 Websocket 连接, 自身不会被启动, 成员连接由 launart 分别启动"""
+
+    dependencies = set()
+    members: List[WebsocketConnectionMixin]
+    inflight: List[int]
+    """各成员连接上进行中的调用数"""
+    duplicates: int
+    """被丢弃的重复事件数"""
+
+    def __init__(self, members: Sequence[WebsocketConnectionMixin], dedup_window: float = 10.0) -> None:
+        """
+        Args:
+            members (Sequence[WebsocketConnectionMixin]): 成员连接, 需为同一账号
+            dedup_window (float, optional): 事件去重的时间窗口, 单位为秒. 默认为 10.0.
+        """
+        if len({member.info.account for member in members}) != 1:
+            raise ValueError("All members of a ConnectionGroup must be for the same account")
+        super().__init__(members[0].info)
+        self.members = list(members)
+        self.status = GroupStatus([member.status for member in self.members])
+        self.inflight = [0] * len(self.members)
+        self.duplicates = 0
+        self.dedup_window = dedup_window
+        self._seen: OrderedDict[Hashable, Tuple[float, Counter]] = OrderedDict()
+        self._cursor: int = 0
+        for index, member in enumerate(self.members):
+            member.id = f"{member.id}.{index}"
+            member._handle_event = functools.partial(self._handle_event, member=index)
+            member._connection_fail = self._member_fail
+
+    async def launch(self, _: Launart) -> None:
+        pass
+
+    def _member_fail(self) -> None:
+        if not self.status.available:
+            self._connection_fail()
+
+    def is_duplicate(self, data: dict, member: int = 0) -> bool:
+        """检查事件是否已由其他成员连接推送过, 并记录该事件
+
+        同一成员连接推送的相同数据视为不同的事件, 只有其他成员连接推送过的次数不少于此时才视为重复.
+
+        Args:
+            data (dict): 原始事件数据
+            member (int, optional): 推送该事件的成员连接序号. 默认为 0.
+
+        Returns:
+            bool: 是否为重复事件
+        """
+        now = time.monotonic()
+        seen = self._seen
+        while seen and next(iter(seen.values()))[0] < now:
+            seen.popitem(last=False)
+        key = event_key(data)
+        _, counts = seen.pop(key, (0.0, Counter()))
+        handled = max(counts.values(), default=0)
+        counts[member] += 1
+        seen[key] = (now + self.dedup_window, counts)
+        return counts[member] <= handled
+
+    async def _handle_event(self, data: dict, member: int = 0) -> None:
+        if self.is_duplicate(data, member):
+            self.duplicates += 1
+            return
+        await super()._handle_event(data)
+
+    async def pick(self) -> int:
+        """选出进行中调用最少的可用成员连接, 没有可用连接时等待
+
+        Returns:
+            int: 成员连接的序号
+        """
+        count = len(self.members)
+        while True:
+            self._cursor = (self._cursor + 1) % count
+            order = [(self._cursor + offset) % count for offset in range(count)]
+            candidates = [index for index in order if self.members[index].status.available]
+            if candidates:
+                return min(candidates, key=self.inflight.__getitem__)
+            await self.status.wait_for_update()
+
+    async def call(
+        self,
+        command: str,
+        method: CallMethod,
+        params: Optional[dict] = None,
+        *,
+        in_session: bool = True,
+    ) -> Any:
+        """调用下层 API, 所用的连接断开时转移到其他连接重试
+
+        Note:
+            连接断开前请求可能已被执行, 转移后重试的调用有可能被重复执行.
+        """
+        if method == CallMethod.MULTIPART:
+            return await super().call(command, method, params, in_session=in_session)
+        attempts = len(self.members) + 1
+        for attempt in range(attempts):
+            index = await self.pick()
+            self.inflight[index] += 1
+            try:
+                return await self.members[index].call(command, method, params, in_session=in_session)
+            except ConnectionError as e:
+                if attempt + 1 == attempts:
+                    raise
+                logger.warning(
+                    f"{self.members[index].id}: {e!r}, failing over {command!r}", style="dark_orange"
+                )
+            finally:
+                self.inflight[index] -= 1
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConnectionGroup {len(self.members)} members {self.status} "
+            f"with {len(self.event_callbacks)} callbacks>"
+        )
@@ -1,13 +1,13 @@
 import asyncio
+import contextlib
 import json as json_mod
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
-from aiohttp import FormData
+from aiohttp import ClientSession, ClientTimeout, FormData, TCPConnector
 from launart import Launart
 from launart.utilles import wait_fut
 from loguru import logger
 
-from graia.amnesia.builtins.aiohttp import AiohttpClientInterface
 from graia.amnesia.builtins.memcache import Memcache
 from graia.amnesia.json import Json
 from graia.amnesia.transport import Transport
@@ -18,6 +18,7 @@ from graia.amnesia.transport.common.server import AbstractRouter
 from ..exception import InvalidSession
 from . import ConnectionMixin
 from ._info import HttpClientInfo, HttpServerInfo
+from .reconnect import Reconnector
 from .util import CallMethod, DatetimeJsonEncoder, build_event, validate_response
 
 
@@ -25,11 +26,27 @@ class HttpServerConnection(ConnectionMixin[HttpServerInfo], Transport):
     """HTTP 服务器连接"""
 
     dependencies = {AbstractRouter}
+    queue: Optional["asyncio.Queue[dict]"]
+    """启用事件队列时, 等待处理的原始事件"""
+    rejected: int
+    """因事件队列已满而拒绝的事件数"""
 
     def __init__(self, config: HttpServerInfo) -> None:
         super().__init__(config)
+        self.queue = None
+        self.rejected = 0
+        self._overflowing: bool = False
         self.handlers[HttpEndpoint(self.info.path, ["POST"])] = self.__class__.handle_request
 
+    @property
+    def stages(self):
+        return {"blocking"} if self.info.queue.size else {}
+
+    @property
+    def queue_depth(self) -> int:
+        """事件队列中等待处理的事件数"""
+        return self.queue.qsize() if self.queue else 0
+
     async def handle_request(self, io: AbstractServerRequestIO):
         req: HttpRequest = await io.extra(HttpRequest)
         if req.headers.get("qq") != str(self.info.account):
@@ -41,24 +58,105 @@ class HttpServerConnection(ConnectionMixin[HttpServerInfo], Transport):
         assert isinstance(data, dict)
         self.status.connected = True
         self.status.alive = True
-        event = build_event(data)
-        await asyncio.gather(*(callback(event) for callback in self.event_callbacks))
+        if self.queue is None:
+            await self._handle_event(data)
+        elif self.event_filter is None or self.event_filter.accept(data):
+            try:
+                self.queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.rejected += 1
+                if not self._overflowing:
+                    self._overflowing = True
+                    logger.warning(
+                        f"HttpServer: event queue is full ({self.queue.qsize()}), "
+                        f"{self.rejected} events rejected in total",
+                        style="dark_orange",
+                    )
+                return "Event queue is full", {"status": 503}
         return {"command": "", "data": {}}
 
+    async def _consume(self, queue: "asyncio.Queue[dict]") -> None:
+        while True:
+            data = await queue.get()
+            try:
+                await self._post_event(build_event(data))
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                queue.task_done()
+                if self._overflowing and queue.empty():
+                    self._overflowing = False
+
     async def launch(self, mgr: Launart) -> None:
         router = mgr.get_interface(AbstractRouter)
+        if not self.info.queue.size:
+            router.use(self)
+            return
+        queue = self.queue = asyncio.Queue(self.info.queue.size)
+        workers = [asyncio.create_task(self._consume(queue)) for _ in range(max(self.info.queue.workers, 1))]
         router.use(self)
+        async with self.stage("blocking"):
+            await mgr.status.wait_for_sigexit()
+        self.queue = None
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.join(), self.info.queue.drain_timeout)
+        for worker in workers:
+            worker.cancel()
 
 
 class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
     """HTTP 客户端连接"""
 
-    dependencies = {AiohttpClientInterface}
-    http_interface: AiohttpClientInterface
+    dependencies = set()
+    session: Optional[ClientSession]
 
     def __init__(self, config: HttpClientInfo) -> None:
         super().__init__(config)
         self.is_hook: bool = False
+        self.reconnector = Reconnector(config.reconnect, self.status)
+        self.session = None
+        self.urls: Dict[str, str] = {}
+
+    def get_url(self, command: str) -> str:
+        """获取命令对应的 URL, 结果会被缓存
+
+        Args:
+            command (str): 命令, 如 `sendGroupMessage` 或 `file_upload`
+
+        Returns:
+            str: URL
+        """
+        url = self.urls.get(command)
+        if url is None:
+            url = self.urls[command] = self.info.get_url(command.replace("_", "/"))
+        return url
+
+    def get_session(self) -> ClientSession:
+        """获取此连接独占的 ClientSession, 按 `HttpPoolConfig` 创建连接池
+
+        Returns:
+            ClientSession: ClientSession 对象
+        """
+        if self.session is None or self.session.closed:
+            pool = self.info.pool
+            connector = TCPConnector(
+                limit=pool.limit,
+                limit_per_host=pool.limit_per_host,
+                keepalive_timeout=pool.keepalive_timeout,
+                use_dns_cache=pool.dns_cache_ttl is not None,
+                ttl_dns_cache=pool.dns_cache_ttl,
+            )
+            self.session = ClientSession(
+                connector=connector,
+                timeout=ClientTimeout(total=pool.timeout, sock_connect=pool.connect_timeout),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """关闭连接池"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
 
     async def request(
         self,
@@ -75,8 +173,8 @@ class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
             data = form
         if json:
             data = json_mod.dumps(json, cls=DatetimeJsonEncoder)
-        rider = await self.http_interface.request(method, url, params=params, data=data)
-        byte_data = await rider.io().read()
+        async with self.get_session().request(method, url, params=params, data=data) as response:
+            byte_data = await response.read()
         result = Json.deserialize(byte_data.decode("utf-8"))
         return validate_response(result)
 
@@ -88,13 +186,13 @@ class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
 
         data = await self.request(
             "POST",
-            self.info.get_url("verify"),
+            self.get_url("verify"),
             json={"verifyKey": self.info.verify_key},
         )
         session_key = data["session"]
         await self.request(
             "POST",
-            self.info.get_url("bind"),
+            self.get_url("bind"),
             json={"qq": self.info.account, "sessionKey": session_key},
         )
         self.status.session_key = session_key
@@ -103,7 +201,7 @@ class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
         self, command: str, method: CallMethod, params: Optional[dict] = None, *, in_session: bool = True
     ) -> Any:
         params = params or {}
-        command = command.replace("_", "/")
+        url = self.get_url(command)
         while not self.status.connected:
             await self.status.wait_for_update()
         if in_session:
@@ -112,26 +210,30 @@ class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
             params["sessionKey"] = self.status.session_key
         try:
             if method in (CallMethod.GET, CallMethod.RESTGET):
-                return await self.request("GET", self.info.get_url(command), params=params)
+                return await self.request("GET", url, params=params)
             elif method in (CallMethod.POST, CallMethod.RESTPOST):
-                return await self.request("POST", self.info.get_url(command), json=params)
+                return await self.request("POST", url, json=params)
             elif method == CallMethod.MULTIPART:
-                return await self.request("POST", self.info.get_url(command), data=params)
+                return await self.request("POST", url, data=params)
         except InvalidSession:
             self.status.session_key = None
             raise
 
+    async def probe(self) -> None:
+        """探测 mirai-api-http 是否可用, 不可用时抛出异常"""
+        await self.request("GET", self.get_url("about"))
+
     @property
     def stages(self):
         return {} if self.is_hook else {"blocking"}
 
     async def launch(self, mgr: Launart) -> None:
-        self.http_interface = mgr.get_interface(AiohttpClientInterface)
         exit_signal = asyncio.create_task(mgr.status.wait_for_sigexit())
         if self.is_hook:  # FIXME
             await exit_signal
             return
         async with self.stage("blocking"):
+            self.reconnector.exit_signal = exit_signal
             while not exit_signal.done():
                 try:
                     if not self.status.session_key:
@@ -139,20 +241,28 @@ class HttpClientConnection(ConnectionMixin[HttpClientInfo]):
                         await self.http_auth()
                     data = await self.request(
                         "GET",
-                        self.info.get_url("fetchMessage"),
+                        self.get_url("fetchMessage"),
                         {"sessionKey": self.status.session_key, "count": 10},
                     )
+                    self.status.connected = True
                     self.status.alive = True
+                    self.reconnector.success()
                 except Exception as e:
-                    self.status.session_key = None
+                    if isinstance(e, InvalidSession) or not self.info.reconnect.resume_session:
+                        self.status.session_key = None
+                    self.status.connected = False
                     self.status.alive = False
                     self._connection_fail()
-                    logger.exception(e)
+                    if self.status.failures:
+                        logger.warning(f"HttpClient: {e!r}", style="dark_orange")
+                    else:
+                        logger.exception(e)
+                    self.reconnector.failure()
+                    await self.reconnector.wait(self.probe)
                     continue
                 assert isinstance(data, list)
                 for event_data in data:
-                    event = build_event(event_data)
-                    await asyncio.gather(*(callback(event) for callback in self.event_callbacks))
+                    await self._handle_event(event_data)
                 await wait_fut(
                     [asyncio.sleep(0.5), exit_signal],
                     return_when=asyncio.FIRST_COMPLETED,
@@ -0,0 +1,151 @@
+"""连接的重连策略: 带抖动的指数退避, 熔断与健康探测"""
+import asyncio
+import enum
+import random
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, NamedTuple, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from . import ConnectionStatus
+
+
+class CircuitState(str, enum.Enum):
+    """熔断器状态"""
+
+    CLOSED = "closed"
+    """正常重连"""
+
+    OPEN = "open"
+    """连续失败过多, 仅按冷却时间进行健康探测"""
+
+    HALF_OPEN = "half_open"
+    """探测成功, 允许一次重连尝试"""
+
+
+class ReconnectPolicy(NamedTuple):
+    """重连策略"""
+
+    initial_delay: float = 1.0
+    """首次重连前的等待时间, 单位为秒"""
+
+    max_delay: float = 60.0
+    """重连等待时间的上限, 单位为秒"""
+
+    multiplier: float = 2.0
+    """每次失败后等待时间的倍率"""
+
+    jitter: float = 0.2
+    """等待时间的随机抖动比例, 避免多个账号同时重连"""
+
+    failure_threshold: int = 8
+    """连续失败多少次后熔断"""
+
+    cooldown: float = 30.0
+    """熔断后两次健康探测的间隔, 单位为秒"""
+
+    probe_timeout: float = 5.0
+    """健康探测的超时时间, 单位为秒"""
+
+    resume_session: bool = True
+    """重连时是否复用仍然有效的 session key, 而不是重新 verify 与 bind"""
+
+    def delay(self, failures: int) -> float:
+        """计算第 `failures` 次连续失败后的等待时间
+
+        Args:
+            failures (int): 连续失败次数, 从 1 开始
+
+        Returns:
+            float: 等待时间, 单位为秒
+        """
+        return self.jittered(
+            min(self.max_delay, self.initial_delay * self.multiplier ** max(failures - 1, 0))
+        )
+
+    def jittered(self, delay: float) -> float:
+        """为等待时间加上随机抖动
+
+        Args:
+            delay (float): 等待时间, 单位为秒
+
+        Returns:
+            float: 抖动后的等待时间
+        """
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class Reconnector:
+    """按 `ReconnectPolicy` 控制重连节奏, 并将故障情况记录到 `ConnectionStatus`"""
+
+    def __init__(self, policy: ReconnectPolicy, status: "ConnectionStatus") -> None:
+        """
+        Args:
+            policy (ReconnectPolicy): 重连策略
+            status (ConnectionStatus): 记录故障指标的连接状态
+        """
+        self.policy = policy
+        self.status = status
+        self.exit_signal: Optional[asyncio.Future[Any]] = None
+
+    def success(self) -> None:
+        """记录一次成功的连接, 重置退避与熔断"""
+        if self.status.failures:
+            self.status.failures = 0
+        if self.status.circuit != CircuitState.CLOSED:
+            logger.info("Connection recovered, circuit closed", style="green")
+            self.status.circuit = CircuitState.CLOSED
+        self.status.end_outage()
+
+    def failure(self) -> None:
+        """记录一次失败的连接, 达到阈值后熔断"""
+        self.status.begin_outage()
+        self.status.failures += 1
+        if self.status.circuit == CircuitState.HALF_OPEN or (
+            self.status.circuit == CircuitState.CLOSED
+            and self.status.failures >= self.policy.failure_threshold
+        ):
+            logger.warning(
+                f"Connection failed {self.status.failures} times, circuit opened", style="dark_orange"
+            )
+            self.status.circuit = CircuitState.OPEN
+
+    async def wait(self, probe: Optional[Callable[[], Awaitable[Any]]] = None) -> bool:
+        """等待到下一次可以重连的时间
+
+        熔断时每隔 `cooldown` 秒执行一次 `probe`, 成功后转为半开状态并返回.
+
+        Args:
+            probe (Optional[Callable[[], Awaitable[Any]]], optional): 健康探测, 抛出异常视为失败, \
+                为 None 时冷却结束即视为成功
+
+        Returns:
+            bool: 是否应当继续重连, 收到退出信号时为 False
+        """
+        if self.status.circuit != CircuitState.OPEN:
+            delay = self.policy.delay(self.status.failures)
+            logger.warning(f"Reconnecting in {delay:.1f}s...", style="dark_orange")
+            return await self._sleep(delay)
+        while await self._sleep(self.policy.jittered(self.policy.cooldown)):
+            if probe is None:
+                break
+            try:
+                await asyncio.wait_for(probe(), self.policy.probe_timeout)
+                break
+            except Exception as e:
+                logger.debug(f"Health probe failed: {e!r}")
+        else:
+            return False
+        self.status.circuit = CircuitState.HALF_OPEN
+        return True
+
+    async def _sleep(self, delay: float) -> bool:
+        if self.exit_signal is None:
+            await asyncio.sleep(delay)
+            return True
+        if self.exit_signal.done():
+            return False
+        sleep = asyncio.create_task(asyncio.sleep(delay))
+        await asyncio.wait((sleep, self.exit_signal), return_when=asyncio.FIRST_COMPLETED)
+        sleep.cancel()
+        return not self.exit_signal.done()
@@ -90,7 +90,11 @@ def build_event(data: dict) -> MiraiEvent:
     if not event_class:
         logger.error("An event is not recognized! Please report with your log to help us diagnose.")
         raise ValueError(f"Unable to find event: {event_type}", data)
+    from ..event.message import MessageEvent
+
     data = {k: v for k, v in data.items() if k != "type"}
+    if issubclass(event_class, MessageEvent):
+        return event_class.parse_lazy(data)
     return event_class.parse_obj(data)
 
 
@@ -1,5 +1,4 @@
 import asyncio
-import json as json_mod
 import secrets
 from typing import Any, Dict, MutableMapping, Optional
 from weakref import WeakValueDictionary
@@ -9,7 +8,7 @@ from launart.utilles import wait_fut
 from loguru import logger
 from yarl import URL
 
-from graia.amnesia.builtins.aiohttp import AiohttpClientInterface
+from graia.amnesia.builtins.aiohttp import AiohttpClientConnectionRider, AiohttpClientInterface
 from graia.amnesia.builtins.memcache import Memcache
 from graia.amnesia.transport import Transport
 from graia.amnesia.transport.common.http.extra import HttpRequest
@@ -25,11 +24,13 @@ from graia.amnesia.transport.common.websocket import (
     WSConnectionClose,
 )
 from graia.amnesia.transport.common.websocket.shortcut import data_type, json_require
+from graia.amnesia.transport.exceptions import ConnectionClosed
 from graia.amnesia.transport.utilles import TransportRegistrar
 
 from . import ConnectionMixin
 from ._info import T_Info, WebsocketClientInfo, WebsocketServerInfo
-from .util import CallMethod, DatetimeJsonEncoder, build_event, validate_response
+from .reconnect import Reconnector, ReconnectPolicy
+from .util import CallMethod, DatetimeJsonEncoder, validate_response
 
 t = TransportRegistrar()
 
@@ -38,10 +39,16 @@ t = TransportRegistrar()
 class WebsocketConnectionMixin(Transport, ConnectionMixin[T_Info]):
     ws_io: Optional[AbstractWebsocketIO]
     futures: MutableMapping[str, asyncio.Future]
+    reconnector: Reconnector
 
     def __init__(self, info: T_Info) -> None:
         super().__init__(info=info)
         self.futures = WeakValueDictionary()
+        self.reconnector = Reconnector(
+            info.reconnect if isinstance(info, WebsocketClientInfo) else ReconnectPolicy(), self.status
+        )
+        self._resume_key: Optional[str] = None
+        self._encoder = DatetimeJsonEncoder()
 
     @t.on(WebsocketReceivedEvent)
     @data_type(str)
@@ -50,6 +57,7 @@ class WebsocketConnectionMixin(Transport, ConnectionMixin[T_Info]):
         assert isinstance(raw, dict)
         if "code" in raw:  # something went wrong
             if raw["code"] in (2, 3, 4):
+                self._resume_key = None
                 await io.extra(WSConnectionClose)  # Invalidate session to allow reattempt
             validate_response(raw)  # raise it
         sync_id: str = raw.get("syncId", "#")
@@ -58,28 +66,23 @@ class WebsocketConnectionMixin(Transport, ConnectionMixin[T_Info]):
         if isinstance(data, Exception):
             if sync_id in self.futures:
                 self.futures[sync_id].set_exception(data)
+            else:  # handshake rejected, the session can't be resumed
+                self._resume_key = None
+                logger.warning(f"Websocket handshake failed: {data!r}", style="dark_orange")
             return
         if "session" in data:
-            self.status.session_key = data["session"]
+            self.status.session_key = self._resume_key = data["session"]
+            self.reconnector.success()
             logger.success("Successfully got session key", style="green bold")
             return
         if sync_id in self.futures:
             self.futures[sync_id].set_result(data)
         elif "type" in data:
             self.status.alive = True
-            event = build_event(data)
-            await asyncio.gather(*(callback(event) for callback in self.event_callbacks))
+            await self._handle_event(data)
         else:
             logger.warning(f"Got unknown data: {raw}")
 
-    @t.handle(WebsocketReconnect)
-    async def _(self, _) -> bool:
-        self._connection_fail()
-        logger.warning("Websocket reconnecting in 5s...", style="dark_orange")
-        await asyncio.sleep(5)
-        logger.warning("Websocket reconnecting...", style="dark_orange")
-        return True
-
     @t.on(WebsocketCloseEvent)
     async def _(self, _: AbstractWebsocketIO) -> None:
         from ..app import Ariadne
@@ -89,6 +92,10 @@ class WebsocketConnectionMixin(Transport, ConnectionMixin[T_Info]):
 
         self.status.session_key = None
         self.status.alive = False
+        self.status.begin_outage()
+        for fut in list(self.futures.values()):
+            if not fut.done():
+                fut.set_exception(ConnectionResetError("Websocket connection closed"))
         logger.info("Websocket connection closed", style="dark_orange")
 
     async def call(
@@ -113,10 +120,13 @@ class WebsocketConnectionMixin(Transport, ConnectionMixin[T_Info]):
             content["subCommand"] = "update"
         elif method == CallMethod.MULTIPART:
             return await super().call(command, method, params, in_session=in_session)
-        self.futures[sync_id] = fut
         await self.status.wait_for_available()
         assert self.ws_io
-        await self.ws_io.send(json_mod.dumps(content, cls=DatetimeJsonEncoder))
+        self.futures[sync_id] = fut
+        try:
+            await self.ws_io.send(self._encoder.encode(content))
+        except ConnectionClosed as e:
+            raise ConnectionResetError(*e.args) from e
         return await fut
 
 
@@ -170,25 +180,40 @@ class WebsocketClientConnection(WebsocketConnectionMixin[WebsocketClientInfo]):
 
     dependencies = {AiohttpClientInterface}
     http_interface: AiohttpClientInterface
+    rider: Optional[AiohttpClientConnectionRider] = None
 
     @property
     def stages(self):
         return {"blocking"}
 
+    def get_url(self) -> str:
+        """获取连接地址, 有可复用的 session key 时附带 `sessionKey` 参数
+
+        Returns:
+            str: 连接地址
+        """
+        query = {"qq": self.info.account, "verifyKey": self.info.verify_key}
+        if self._resume_key and self.info.reconnect.resume_session:
+            query["sessionKey"] = self._resume_key
+        return str((URL(self.info.host) / "all").with_query(query))
+
+    async def probe(self) -> None:
+        """探测 mirai-api-http 是否可用, 不可用时抛出异常"""
+        rider = await self.http_interface.request("GET", str(URL(self.info.host) / "about"))
+        await rider.io().read()
+
     async def launch(self, mgr: Launart) -> None:
         self.http_interface = mgr.get_interface(AiohttpClientInterface)
-        config = self.info
         async with self.stage("blocking"):
-            rider = self.http_interface.websocket(
-                str(
-                    (URL(config.host) / "all").with_query(
-                        {"qq": config.account, "verifyKey": config.verify_key}
-                    )
-                ),
+            transport = self.info.transport
+            self.rider = self.http_interface.websocket(
+                self.get_url(),
                 heartbeat=30.0,
+                compress=transport.compress,
+                max_msg_size=transport.max_msg_size,
             )
             await wait_fut(
-                [rider.use(self), mgr.status.wait_for_sigexit()],
+                [self.rider.use(self), mgr.status.wait_for_sigexit()],
                 return_when=asyncio.FIRST_COMPLETED,
             )
 
@@ -196,3 +221,14 @@ class WebsocketClientConnection(WebsocketConnectionMixin[WebsocketClientInfo]):
     async def _(self, io: AbstractWebsocketIO) -> None:  # start authenticate
         self.ws_io = io
         self.status.alive = True
+
+    @t.handle(WebsocketReconnect)
+    async def _(self, _) -> bool:
+        self._connection_fail()
+        self.reconnector.failure()
+        if not await self.reconnector.wait(self.probe):
+            return False
+        if self.rider:
+            self.rider.call_param["url"] = self.get_url()
+        logger.warning("Websocket reconnecting...", style="dark_orange")
+        return True
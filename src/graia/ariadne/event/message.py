@@ -1,7 +1,8 @@
 """Ariadne 消息事件"""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing_extensions import Self
 
-from pydantic import Field, root_validator
+from pydantic import Field, PrivateAttr, root_validator
 
 from graia.amnesia.message import Element
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
@@ -14,9 +15,11 @@ from ..dispatcher import (
     SourceDispatcher,
     SubjectDispatcher,
 )
-from ..message.chain import MessageChain
+from ..message.chain import ELEMENT_MAPPING, ORDINARY_ELEMENT_TYPES, MessageChain
 from ..message.element import Quote, Source
+from ..message.view import MessageView
 from ..model import Client, Friend, Group, Member, Stranger
+from ..model.util import Deferred, DeferredField, load_deferred
 from ..typing import generic_issubclass
 from . import MiraiEvent
 from .mirai import FriendEvent, GroupEvent
@@ -45,6 +48,52 @@ def _set_source_quote(_, values: Dict[str, Any]) -> Dict[str, Any]:
     return values
 
 
+def _load_chain(chain: List[Dict[str, Any]]) -> MessageChain:
+    message_chain = MessageChain.parse_obj(chain)
+    if not message_chain:
+        message_chain.append("<! 不支持的消息类型 !>")
+    return message_chain
+
+
+_required_fields: Dict[Type[Element], Tuple[Tuple[str, Optional[type]], ...]] = {}
+
+
+def _get_required_fields(typ: Type[Element]) -> Tuple[Tuple[str, Optional[type]], ...]:
+    fields = _required_fields.get(typ)
+    if fields is None:
+        fields = _required_fields[typ] = tuple(
+            (field.alias, field.outer_type_ if field.outer_type_ in (str, int, MessageChain) else None)
+            for field in typ.__fields__.values()  # type: ignore
+            if field.required
+        )
+    return fields
+
+
+def _check_chain(chain: Any) -> bool:
+    """粗略检查消息链数据的结构, 通过检查的数据在延迟解析时不会因缺少字段或类型错误而失败"""
+    if not isinstance(chain, list):
+        return False
+    special_cnt: int = 0
+    for element in chain:
+        if not isinstance(element, dict):
+            return False
+        elem_typ = element.get("type", "Unknown")
+        typ = Quote if elem_typ == "Quote" else ELEMENT_MAPPING.get(elem_typ)
+        if typ is None:
+            continue
+        if typ not in ORDINARY_ELEMENT_TYPES:
+            special_cnt += 1
+        for alias, kind in _get_required_fields(typ):
+            if alias not in element:
+                return False
+            if kind is MessageChain:
+                if not _check_chain(element[alias]):
+                    return False
+            elif kind is not None and not isinstance(element[alias], kind):
+                return False
+    return special_cnt <= 1
+
+
 class MessageEvent(MiraiEvent):
     """Ariadne 消息事件基类"""
 
@@ -62,6 +111,8 @@ class MessageEvent(MiraiEvent):
     quote: Optional[Quote] = None
     """可能的引用消息对象"""
 
+    _view: Optional[MessageView] = PrivateAttr(None)
+
     __source_quote_setter = root_validator(pre=True, allow_reuse=True)(_set_source_quote)
 
     def __int__(self):
@@ -71,10 +122,55 @@ class MessageEvent(MiraiEvent):
     def id(self) -> int:
         return self.source.id
 
+    @classmethod
+    def parse_lazy(cls, obj: Dict[str, Any]) -> Self:
+        """从远端的事件数据生成事件, `message_chain` 与 `quote` 在首次访问时才解析
+
+        空消息链会被替换为 "<! 不支持的消息类型 !>".
+        消息链缺少必需字段或类型不符时退回 `parse_obj`, 以便在构造时抛出相同的异常.
+
+        Args:
+            obj (Dict[str, Any]): 事件数据
+
+        Returns:
+            MessageEvent: 事件
+        """
+        chain = obj.get("messageChain")
+        if not _check_chain(chain):
+            return cls.parse_obj(obj)
+        head = [element for element in chain[:2] if element.get("type") in ("Source", "Quote")]
+        event = cls.parse_obj({**obj, "messageChain": [e for e in head if e["type"] == "Source"]})
+        event.__dict__["message_chain"] = Deferred(
+            _load_chain, [e for e in chain if e.get("type", "Unknown") not in ("Source", "Quote")]
+        )
+        for element in head:
+            if element["type"] == "Quote":
+                event.__dict__["quote"] = Deferred(Quote.parse_obj, element)
+        return event
+
+    def _iter(self, *args, **kwargs):
+        load_deferred(self)
+        return super()._iter(*args, **kwargs)
+
+    def __repr_args__(self):
+        load_deferred(self)
+        return super().__repr_args__()
+
+    @property
+    def view(self) -> MessageView:
+        """消息链的派生视图, 供各解析器共享纯文本, 映射字符串与分割结果"""
+        if self._view is None or self._view.chain is not self.message_chain:
+            self._view = MessageView(self.message_chain)
+        return self._view
+
     class Dispatcher(BaseDispatcher):
         mixin = [MessageChainDispatcher, SourceDispatcher, QuoteDispatcher, SenderDispatcher]
 
 
+MessageEvent.message_chain = DeferredField("message_chain")  # type: ignore
+MessageEvent.quote = DeferredField("quote")  # type: ignore
+
+
 class FriendMessage(MessageEvent, FriendEvent):
     """好友消息"""
 
@@ -167,6 +263,8 @@ class ActiveMessage(MiraiEvent):
     quote: Optional[Quote] = None
     """可能的引用消息对象"""
 
+    _view: Optional[MessageView] = PrivateAttr(None)
+
     __source_quote_setter = root_validator(pre=True, allow_reuse=True)(_set_source_quote)
 
     def __int__(self):
@@ -176,6 +274,13 @@ class ActiveMessage(MiraiEvent):
     def id(self) -> int:
         return self.source.id
 
+    @property
+    def view(self) -> MessageView:
+        """消息链的派生视图, 与 `MessageEvent.view` 相同"""
+        if self._view is None or self._view.chain is not self.message_chain:
+            self._view = MessageView(self.message_chain)
+        return self._view
+
     class Dispatcher(BaseDispatcher):
         mixin = [MessageChainDispatcher, SourceDispatcher, QuoteDispatcher, SubjectDispatcher]
 
@@ -1,6 +1,8 @@
 """Ariadne 消息链的实现"""
+import json
 import re
 from copy import deepcopy
+from hashlib import blake2b
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -8,6 +10,7 @@ from typing import (
     Iterable,
     List,
     Literal,
+    Optional,
     Sequence,
     Tuple,
     Type,
@@ -17,6 +20,8 @@ from typing import (
 )
 from typing_extensions import Self
 
+from pydantic import PrivateAttr
+
 from graia.amnesia.json import Json
 from graia.amnesia.message import MessageChain as BaseMessageChain
 
@@ -47,6 +52,9 @@ ELEMENT_MAPPING: Dict[str, Type[Element]] = {
 }
 ORDINARY_ELEMENT_TYPES = frozenset([Plain, Image, Face, At, AtAll, Source, Quote])
 
+_PERSISTENT_SPLIT = re.compile(r"(\[mirai:.+?\])")
+_PERSISTENT_ELEMENT = re.compile(r"\[mirai:(.+?)(:(.+?))\]")
+
 MessageOrigin = Union[str, Element]
 
 MessageContainer = Union[MessageOrigin, Sequence["MessageContainer"], "MessageChain"]
@@ -60,6 +68,8 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
     __root__: List[Element]
     """底层元素列表"""
 
+    _fingerprint: Optional[int] = PrivateAttr(None)
+
     @property
     def content(self) -> List[Element]:
         """Amnesia MessageChain 的内容代理"""
@@ -206,6 +216,56 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
             other = MessageChain(other)
         return other.content == self.content
 
+    @property
+    def fingerprint(self) -> int:
+        """消息链内容的 64 位指纹, 首次访问时计算并缓存.
+
+        由各元素的类型与内容决定, 内容相同的消息链指纹相同, 可用作去重与解析缓存的键.
+        `Source` 只记录其位置而不记录消息 ID 与时间, 因此不同事件中的相同消息拥有相同的指纹.
+
+        Note:
+            仅 `append`, `extend`, `+=`, `*=` 与 `copy=False` 的 `removeprefix`, `removesuffix`
+            会使缓存的指纹失效, 直接修改 `content` 或其中的元素后需调用 `invalidate_fingerprint`.
+
+        Returns:
+            int: 64 位无符号整数指纹
+        """
+        if self._fingerprint is None:
+            digest = blake2b(digest_size=8)
+            for elem in self.content:
+                if isinstance(elem, Source):
+                    digest.update(b"S;")
+                    continue
+                if isinstance(elem, Plain):
+                    tag, data = b"P", elem.text.encode("utf-8", "surrogatepass")
+                else:
+                    tag = b"E"
+                    data = json.dumps(elem.dict(), sort_keys=True, default=str, ensure_ascii=False).encode(
+                        "utf-8", "surrogatepass"
+                    )
+                digest.update(b"%s%d:" % (tag, len(data)))
+                digest.update(data)
+            self._fingerprint = int.from_bytes(digest.digest(), "big")
+        return self._fingerprint
+
+    def invalidate_fingerprint(self) -> None:
+        """使缓存的指纹失效, 在直接修改消息链内容后调用."""
+        self._fingerprint = None
+
+    def append(self, element: Union[Element, str], copy: bool = False) -> Self:
+        if not copy:
+            self._fingerprint = None
+        return super().append(element, copy)
+
+    def extend(self, *content: Union[Self, Element, List[Union[Element, str]]], copy: bool = False) -> Self:
+        if not copy:
+            self._fingerprint = None
+        return super().extend(*content, copy=copy)
+
+    def __iadd__(self, content: Union[Self, List[Element], Element, str]) -> Self:
+        self._fingerprint = None
+        return super().__iadd__(content)
+
     def __mul__(self, time: int) -> Self:
         result = []
         for _ in range(time):
@@ -218,6 +278,7 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
             result.extend(deepcopy(self.content))
         self.content.clear()
         self.content.extend(result)
+        self._fingerprint = None
         return self
 
     def __len__(self) -> int:
@@ -271,14 +332,18 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
 
     @classmethod
     def from_persistent_string(cls, string: str) -> Self:
-        """从持久化字符串生成消息链.
+        """从持久化字符串生成消息链, 也接受 `ChainCodec` 的编码结果.
 
         Returns:
             MessageChain: 还原的消息链.
         """
+        if string.startswith("[ariadne:"):
+            from .codec import ChainCodec
+
+            return ChainCodec().decode(string)  # type: ignore
         result: List[Element] = []
-        for match in re.split(r"(\[mirai:.+?\])", string):
-            if mirai := re.fullmatch(r"\[mirai:(.+?)(:(.+?))\]", match):
+        for match in _PERSISTENT_SPLIT.split(string):
+            if mirai := _PERSISTENT_ELEMENT.fullmatch(match):
                 j_string = mirai[3]
                 element_cls = ELEMENT_MAPPING[mirai[1]]
                 result.append(element_cls.parse_obj(Json.deserialize(unescape_bracket(j_string))))
@@ -384,6 +449,7 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
             return MessageChain(header + elements, inline=True)
         self.content.clear()
         self.content.extend(header + elements)
+        self._fingerprint = None
         return self
 
     def removesuffix(self, suffix: str, *, copy: bool = True) -> Self:
@@ -406,6 +472,7 @@ class MessageChain(BaseMessageChain, AriadneBaseModel):
             return MessageChain(elements, inline=True)
         self.content.clear()
         self.content.extend(elements)
+        self._fingerprint = None
         return self
 
     def replace(
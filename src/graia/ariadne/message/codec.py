@@ -0,0 +1,272 @@
+"""带版本的消息链持久化编解码器
+
+与 `MessageChain.as_persistent_string` 相比:
+
+- 编码结果以 `[ariadne:<版本>]` 开头, 无此前缀的字符串按旧格式解码.
+- 多媒体元素的二进制可以存入 `BlobStore`, 编码结果中只保留内容哈希.
+- 解析使用预编译的正则表达式.
+- `ChainCodec.dump` 与 `ChainCodec.load` 逐条写入与读取消息链存档, 不需要一次性载入全部消息链.
+
+Example:
+    ```py
+    codec = ChainCodec(DirectoryBlobStore("./blobs"))
+    with open("archive.txt", "w", encoding="utf-8") as fp:
+        codec.dump(chains, fp)
+    with open("archive.txt", encoding="utf-8") as fp:
+        for chain in codec.load(fp):
+            ...
+    ```
+"""
+import abc
+import json
+import re
+from base64 import b64decode, b64encode
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from ..util import unescape_bracket
+from .chain import ELEMENT_MAPPING, MessageChain
+from .element import Element, MultimediaElement, Plain
+
+CODEC_VERSION = 1
+"""当前的编码版本"""
+
+CODEC_PREFIX = "[ariadne:"
+"""带版本的编码结果的前缀"""
+
+_HEADER = re.compile(r"\[ariadne:(\d+)\]")
+_SEGMENT = re.compile(r"\[mirai:(\w+):([^\]]*)\]")
+_ESCAPED = re.compile(r"%(25|5B|5D)")
+_UNESCAPE = {"25": "%", "5B": "[", "5D": "]"}
+
+
+class BlobStore(abc.ABC):
+    """按内容寻址的二进制存储"""
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        """计算二进制数据的键
+
+        Args:
+            data (bytes): 二进制数据
+
+        Returns:
+            str: 数据的 sha256 哈希
+        """
+        return sha256(data).hexdigest()
+
+    @abc.abstractmethod
+    def put(self, data: bytes) -> str:
+        """存入二进制数据, 相同的数据只存储一次
+
+        Args:
+            data (bytes): 二进制数据
+
+        Returns:
+            str: 数据的键
+        """
+        ...
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bytes:
+        """取出二进制数据
+
+        Args:
+            key (str): 数据的键
+
+        Raises:
+            KeyError: 数据不存在
+
+        Returns:
+            bytes: 二进制数据
+        """
+        ...
+
+
+class MemoryBlobStore(BlobStore):
+    """存储在内存中的 `BlobStore`"""
+
+    def __init__(self) -> None:
+        self.blobs: Dict[str, bytes] = {}
+
+    def put(self, data: bytes) -> str:
+        key = self.key(data)
+        self.blobs.setdefault(key, data)
+        return key
+
+    def get(self, key: str) -> bytes:
+        return self.blobs[key]
+
+
+class DirectoryBlobStore(BlobStore):
+    """存储在目录中的 `BlobStore`, 每份数据一个文件"""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path (Union[str, Path]): 存储目录, 不存在时会被创建
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def locate(self, key: str) -> Path:
+        """数据对应的文件路径
+
+        Args:
+            key (str): 数据的键
+
+        Returns:
+            Path: 文件路径
+        """
+        return self.path / key[:2] / key
+
+    def put(self, data: bytes) -> str:
+        key = self.key(data)
+        file = self.locate(key)
+        if not file.exists():
+            file.parent.mkdir(exist_ok=True)
+            temp = file.with_suffix(".tmp")
+            temp.write_bytes(data)
+            temp.replace(file)
+        return key
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.locate(key).read_bytes()
+        except FileNotFoundError as e:
+            raise KeyError(key) from e
+
+
+def _escape(string: str) -> str:
+    return string.replace("%", "%25").replace("[", "%5B").replace("]", "%5D")
+
+
+def _unescape(string: str) -> str:
+    return _ESCAPED.sub(lambda m: _UNESCAPE[m[1]], string) if "%" in string else string
+
+
+class ChainCodec:
+    """消息链的编解码器"""
+
+    def __init__(self, blobs: Optional[BlobStore] = None, *, binary: bool = True) -> None:
+        """
+        Args:
+            blobs (BlobStore, optional): 存放多媒体元素二进制的存储, 为 None 时二进制内联在编码结果中.
+            binary (bool, optional): 是否保存多媒体元素的二进制. 默认为 True.
+        """
+        self.blobs = blobs
+        self.binary = binary
+
+    def encode_element(self, element: Element) -> str:
+        """编码单个元素
+
+        Args:
+            element (Element): 元素
+
+        Returns:
+            str: 编码结果
+        """
+        if isinstance(element, Plain):
+            return element.text.replace("[", "[_")
+        data = element.dict(exclude={"type"})
+        if isinstance(element, MultimediaElement) and element.base64:
+            if not self.binary:
+                del data["base64"]
+            elif self.blobs is not None:
+                data["blob"] = self.blobs.put(b64decode(data.pop("base64")))
+        payload = json.dumps(
+            data, default=element.__json_encoder__, ensure_ascii=False, separators=(",", ":")
+        )
+        return f"[mirai:{element.type}:{_escape(payload)}]"
+
+    def encode(self, chain: MessageChain) -> str:
+        """编码消息链
+
+        Args:
+            chain (MessageChain): 消息链
+
+        Returns:
+            str: 编码结果, 以 `[ariadne:<版本>]` 开头
+        """
+        return f"[ariadne:{CODEC_VERSION}]" + "".join(map(self.encode_element, chain.content))
+
+    def decode_element(self, type: str, payload: Dict) -> Element:
+        """从载荷还原单个元素
+
+        Args:
+            type (str): 元素类型
+            payload (Dict): 元素载荷
+
+        Raises:
+            ValueError: 元素引用了二进制数据, 但未提供 `BlobStore`
+
+        Returns:
+            Element: 元素
+        """
+        if "blob" in payload:
+            if self.blobs is None:
+                raise ValueError(f"{type} refers to blob {payload['blob']}, but no blob store is provided")
+            payload["base64"] = b64encode(self.blobs.get(payload.pop("blob"))).decode("ascii")
+        return ELEMENT_MAPPING[type].parse_obj(payload)
+
+    def decode(self, string: str) -> MessageChain:
+        """解码消息链, 同时兼容 `MessageChain.as_persistent_string` 的结果
+
+        Args:
+            string (str): 编码结果
+
+        Raises:
+            ValueError: 编码版本不受支持
+
+        Returns:
+            MessageChain: 消息链
+        """
+        legacy = True
+        if string.startswith(CODEC_PREFIX):
+            header = _HEADER.match(string)
+            if not header or int(header[1]) > CODEC_VERSION:
+                raise ValueError(f"Unsupported codec version: {string[:16]!r}")
+            string = string[header.end() :]
+            legacy = False
+        result: List[Element] = []
+        index = 0
+        for match in _SEGMENT.finditer(string):
+            if match.start() > index:
+                result.append(Plain(string[index : match.start()].replace("[_", "[")))
+            payload = unescape_bracket(match[2]) if legacy else _unescape(match[2])
+            result.append(self.decode_element(match[1], json.loads(payload)))
+            index = match.end()
+        if index < len(string):
+            result.append(Plain(string[index:].replace("[_", "[")))
+        return MessageChain(result, inline=True)
+
+    def dump(self, chains: Iterable[MessageChain], fp: TextIO) -> int:
+        """逐条将消息链写入存档, 每行一条
+
+        Args:
+            chains (Iterable[MessageChain]): 消息链, 可以是生成器
+            fp (TextIO): 文本文件
+
+        Returns:
+            int: 写入的消息链数量
+        """
+        count = 0
+        for chain in chains:
+            fp.write(json.dumps(self.encode(chain), ensure_ascii=False))
+            fp.write("\n")
+            count += 1
+        return count
+
+    def load(self, fp: Iterable[str]) -> Iterator[MessageChain]:
+        """逐条从存档读取消息链
+
+        Args:
+            fp (Iterable[str]): 文本文件或其他按行迭代的对象
+
+        Yields:
+            MessageChain: 消息链
+        """
+        for line in fp:
+            if line := line.strip():
+                yield self.decode(json.loads(line))
@@ -45,6 +45,7 @@ from ...typing import DictStrAny, MaybeFlag, Sentinel, Wrapper
 from ...util import constant, gen_subclass, resolve_dispatchers_mixin, type_repr
 from ..chain import MessageChain
 from ..element import Element, Plain
+from ..view import get_view
 from .util import (
     AnnotatedParam,
     ChainContent,
@@ -57,7 +58,6 @@ from .util import (
     convert_empty,
     extract_str,
     raw,
-    split,
     tokenize,
 )
 
@@ -572,13 +572,14 @@ class Commander:
             chain (MessageChain): 触发的消息链
         """
 
-        frags = split(chain)
+        event = event_ctx.get(None)
+        frags = get_view(chain, event).tokens
         pending_exec: Dict[int, List[Tuple[CommandEntry, dict]]] = {}
         pending_next: Deque[ParseData] = Deque([ParseData(0, self.match_root, ())])
 
         dispatchers: List[T_Dispatcher] = [param_dispatcher]
 
-        if event := event_ctx.get(None):
+        if event:
             dispatchers.extend(dispatcher_mixin_handler(event.Dispatcher))
 
         def push_pending(index: int, nxt: MatchNode[CommandEntry], params: Tuple[ChainContent, ...]):
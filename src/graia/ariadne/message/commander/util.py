@@ -4,10 +4,11 @@ import abc
 import functools
 import inspect
 import re
+from collections import OrderedDict
 from contextvars import ContextVar
-from typing import Any, Generic, Iterable, List, MutableMapping, TypeVar, Union
+from typing import Any, Generic, Iterable, List, TypeVar, Union, cast
 from typing_extensions import Self
-from weakref import WeakKeyDictionary, WeakSet
+from weakref import WeakSet
 
 from graia.broadcast.entities.decorator import Decorator
 from graia.broadcast.entities.dispatcher import BaseDispatcher
@@ -273,53 +274,89 @@ ChainContent = List[Union[str, Element]]
 
 ChainContentList = List[ChainContent]
 
-split_cache: MutableMapping[MessageChain, ChainContentList] = WeakKeyDictionary()
+SPLIT_CACHE_SIZE = 512
+
+split_cache: OrderedDict[int, tuple[tuple[str | int, ...], ...]] = OrderedDict()
+"""以消息链指纹为键的分割结果缓存, 元素以其在消息链中的下标保存, 命中时以当前消息链的元素重建结果"""
 
 quote_pairs = {"'": "'", '"': '"', "‘": "’", "“": "”"}
 
 
+def _quoted(right: str) -> str:
+    right = re.escape(right)
+    return rf"((?:[^{right}\\]+|\\.?)*)({right}?)"
+
+
+# 转义会同时移除反斜杠与其后的一个字符, 且不会跨越元素
+_escape_pattern = re.compile(r"\\.?", re.S)
+_quoted_patterns = {right: re.compile(_quoted(right), re.S) for right in quote_pairs.values()}
+_token_pattern = re.compile(
+    "|".join([r"\\.?"] + [re.escape(left) + _quoted(right) for left, right in quote_pairs.items()]),
+    re.S,
+)
+
+
 def extract_str(buf: ChainContent) -> str | None:
     if len(buf) == 1 and isinstance(buf[0], str):
         return buf[0]
 
 
 def split(chain: MessageChain) -> ChainContentList:
-    if chain in split_cache:
-        return split_cache[chain]
+    fingerprint = chain.fingerprint
+    root = chain.__root__
+    if fingerprint in split_cache:
+        split_cache.move_to_end(fingerprint)
+        return [[x if isinstance(x, str) else root[x] for x in buf] for buf in split_cache[fingerprint]]
     result: ChainContentList = []
     quote: str = ""
     buffer: ChainContent = []
 
-    for elem in chain.__root__:
+    for elem in root:
         if elem.__class__ in (Quote, Source):
             continue
         if not isinstance(elem, Plain):
             buffer.append(elem)
             continue
         cache: list[str] = []
-        skipping: bool = False
-        for char in elem.text:
-            if char == "\\" or skipping:
-                skipping = not skipping
-                continue
-            if char in quote_pairs and not quote:
-                quote = quote_pairs[char]
-                continue
-            elif char == quote:
+        text: str = elem.text
+        pos: int = 0
+        if quote:  # 引号跨越了元素边界
+            match = cast(re.Match, _quoted_patterns[quote].match(text))
+            if body := _escape_pattern.sub("", match[1]):
+                cache.append(body)
+            if match[2]:
                 quote = ""
-                continue
-            if char == " " and (cache or buffer) and not quote:
+            pos = match.end()
+        for match in (*_token_pattern.finditer(text, pos), None):
+            words = text[pos : match.start() if match else None].split(" ")
+            if words[0]:
+                cache.append(words[0])
+            if len(words) > 1:
                 if cache:
                     buffer.append("".join(cache))
                     cache.clear()
                 if buffer:
                     result.append(buffer)
                     buffer = []  # buffer is "move"d, so DO NOT clear.
-            elif quote or char != " ":
-                cache.append(char)
+                result.extend([word] for word in words[1:-1] if word)
+                if words[-1]:
+                    cache.append(words[-1])
+            if match is None:
+                break
+            pos = match.end()
+            if index := match.lastindex:  # 引号, 否则为转义
+                if body := _escape_pattern.sub("", match[index - 1]):
+                    cache.append(body)
+                if not match[index]:
+                    quote = quote_pairs[match[0][0]]
         if cache:
             buffer.append("".join(cache))
     if buffer:
         result.append(buffer)
-    split_cache[chain] = result
+    index = {id(elem): i for i, elem in enumerate(root)}
+    split_cache[fingerprint] = tuple(
+        tuple(x if isinstance(x, str) else index[id(x)] for x in buf) for buf in result
+    )
+    if len(split_cache) > SPLIT_CACHE_SIZE:
+        split_cache.popitem(last=False)
     return result
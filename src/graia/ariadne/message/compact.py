@@ -0,0 +1,155 @@
+"""Ariadne 消息元素的紧凑表示
+
+用于长期驻留在内存中的 `Plain` 与 `At` 元素:
+使用 `__slots__` 实例且字符串经过驻留 (intern), 公开属性与相等性判断与原元素一致.
+"""
+import sys
+from typing import Any, Dict, Optional, Union
+
+from graia.amnesia.message import Text as BaseText
+
+from .element import At, Plain
+
+
+class CompactPlain:
+    """`Plain` 的紧凑表示"""
+
+    __slots__ = ("text",)
+
+    type = "Plain"
+
+    text: str
+    """实际的文本"""
+
+    def __init__(self, text: str) -> None:
+        self.text = sys.intern(text)
+
+    @classmethod
+    def from_element(cls, element: Plain) -> "CompactPlain":
+        """从 `Plain` 构造
+
+        Args:
+            element (Plain): 文本元素
+
+        Returns:
+            CompactPlain: 紧凑文本元素
+        """
+        return cls(element.text)
+
+    def to_element(self) -> Plain:
+        """转换为完整的 `Plain` 元素"""
+        return Plain(self.text)
+
+    def dict(self) -> Dict[str, Any]:
+        """转化为与 `Plain.dict()` 相同结构的字典"""
+        return {"type": "Plain", "text": self.text}
+
+    @property
+    def display(self) -> str:
+        return self.text
+
+    def as_persistent_string(self) -> str:
+        return self.text
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"CompactPlain(text={self.text!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Plain, BaseText, CompactPlain)):
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # same as Element.__hash__ of the equal Plain
+        return hash((Plain, "Plain", self.text))
+
+    def __reduce__(self):
+        return CompactPlain, (self.text,)
+
+
+class CompactAt:
+    """`At` 的紧凑表示"""
+
+    __slots__ = ("target", "representation")
+
+    type = "At"
+
+    target: int
+    """At 的目标 QQ 号"""
+
+    representation: Optional[str]
+    """显示名称"""
+
+    def __init__(self, target: int, representation: Optional[str] = None) -> None:
+        self.target = target
+        self.representation = sys.intern(representation) if representation else None
+
+    @classmethod
+    def from_element(cls, element: At) -> "CompactAt":
+        """从 `At` 构造
+
+        Args:
+            element (At): At 元素
+
+        Returns:
+            CompactAt: 紧凑 At 元素
+        """
+        return cls(element.target, element.representation)
+
+    def to_element(self) -> At:
+        """转换为完整的 `At` 元素"""
+        return At(self.target, display=self.representation)
+
+    def dict(self) -> Dict[str, Any]:
+        """转化为与 `At.dict()` 相同结构的字典"""
+        data: Dict[str, Any] = {"type": "At", "target": self.target}
+        if self.representation is not None:
+            data["display"] = self.representation
+        return data
+
+    @property
+    def display(self) -> str:
+        return str(self)
+
+    def as_persistent_string(self) -> str:
+        return self.to_element().as_persistent_string()
+
+    def __str__(self) -> str:
+        return f"@{self.representation}" if self.representation else f"@{self.target}"
+
+    def __repr__(self) -> str:
+        return f"CompactAt(target={self.target!r}, representation={self.representation!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (At, CompactAt)):
+            return self.target == other.target
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # same as Element.__hash__ of the equal At
+        return hash((At, "At", self.target, self.representation))
+
+    def __reduce__(self):
+        return CompactAt, (self.target, self.representation)
+
+
+CompactElement = Union[CompactPlain, CompactAt]
+
+
+def compact(element: Union[Plain, At]) -> CompactElement:
+    """将 `Plain` 或 `At` 转换为对应的紧凑表示
+
+    Args:
+        element (Union[Plain, At]): 消息元素
+
+    Returns:
+        CompactElement: 对应的紧凑表示
+    """
+    if isinstance(element, Plain):
+        return CompactPlain.from_element(element)
+    if isinstance(element, At):
+        return CompactAt.from_element(element)
+    raise TypeError(f"{element!r} has no compact representation")
@@ -119,7 +119,9 @@ class Plain(Element, BaseText):
         return self.text
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, (Plain, BaseText)) and self.text == other.text
+        if isinstance(other, (Plain, BaseText)):
+            return self.text == other.text
+        return NotImplemented
 
 
 class At(Element):
@@ -147,7 +149,9 @@ class At(Element):
         super().__init__(**data)
 
     def __eq__(self, other: "At"):
-        return isinstance(other, At) and self.target == other.target
+        if isinstance(other, At):
+            return self.target == other.target
+        return NotImplemented
 
     def __str__(self) -> str:
         return f"@{self.representation}" if self.representation else f"@{self.target}"
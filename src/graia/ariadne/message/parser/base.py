@@ -3,7 +3,6 @@ import abc
 import difflib
 import fnmatch
 import re
-import weakref
 from collections import defaultdict
 from typing import ClassVar, DefaultDict, Dict, Iterable, List, Optional, Tuple, Type, Union
 from typing_extensions import get_args
@@ -20,11 +19,17 @@ from ...event.message import GroupMessage, MessageEvent
 from ...typing import Unions, generic_issubclass, get_origin
 from ..chain import MessageChain
 from ..element import At, Element, Plain
+from ..view import get_view
+from .fuzzy import EventResultCache, FuzzyIndex
+from .keywords import KeywordIndex
 
 
 class ChainDecorator(abc.ABC, Decorator, Derive[MessageChain]):
     pre = True
 
+    keyword_index: ClassVar[KeywordIndex] = KeywordIndex()
+    """前缀, 后缀, 关键字与完整内容检测共享的索引, 每条消息链只扫描一次"""
+
     @abc.abstractmethod
     async def __call__(self, chain: MessageChain, interface: DispatcherInterface) -> Optional[MessageChain]:
         ...
@@ -46,10 +51,12 @@ class DetectPrefix(ChainDecorator):
             prefix (Union[str, Iterable[str]]): 要匹配的前缀
         """
         self.prefix: List[str] = [prefix] if isinstance(prefix, str) else list(prefix)
+        self.keyword_index.add_prefix(*self.prefix)
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
+        matched = self.keyword_index.scan(chain).prefixes
         for prefix in self.prefix:
-            if chain.startswith(prefix):
+            if prefix in matched:
                 return chain.removeprefix(prefix).removeprefix(" ")
 
         raise ExecutionStop
@@ -65,10 +72,12 @@ class DetectSuffix(ChainDecorator):
             suffix (Union[str, Iterable[str]]): 要匹配的后缀
         """
         self.suffix: List[str] = [suffix] if isinstance(suffix, str) else list(suffix)
+        self.keyword_index.add_suffix(*self.suffix)
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
+        matched = self.keyword_index.scan(chain).suffixes
         for suffix in self.suffix:
-            if chain.endswith(suffix):
+            if suffix in matched:
                 return chain.removesuffix(suffix).removesuffix(" ")
         raise ExecutionStop
 
@@ -110,17 +119,16 @@ class Mention(ChainDecorator):
             如果是 int 则是账号, 如果是 str 则是名称
         """
         self.person: Union[int, str] = target
+        if isinstance(target, str):
+            self.keyword_index.add_prefix(target)
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
+        if isinstance(self.person, str):
+            if self.person in self.keyword_index.scan(chain).prefixes:
+                return chain.removeprefix(self.person).removeprefix(" ")
+            raise ExecutionStop
         first: Element = chain[0]
-        if (
-            chain
-            and isinstance(first, Plain)
-            and isinstance(self.person, str)
-            and str(first).startswith(self.person)
-        ):
-            return chain.removeprefix(self.person).removeprefix(" ")
-        if isinstance(first, At) and isinstance(self.person, int) and first.target == self.person:
+        if isinstance(first, At) and first.target == self.person:
             return MessageChain(chain.__root__[1:], inline=True).removeprefix(" ")
 
         raise ExecutionStop
@@ -136,9 +144,10 @@ class ContainKeyword(ChainDecorator):
             keyword (str): 关键字
         """
         self.keyword: str = keyword
+        self.keyword_index.add_keyword(keyword)
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
-        if self.keyword not in chain:
+        if self.keyword not in self.keyword_index.scan(chain).keywords:
             raise ExecutionStop
         return chain
 
@@ -153,9 +162,11 @@ class MatchContent(ChainDecorator):
             content (Union[str, MessageChain]): 匹配内容
         """
         self.content: Union[str, MessageChain] = content
+        if isinstance(content, str):
+            self.keyword_index.add_content(content)
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
-        if isinstance(self.content, str) and str(chain) != self.content:
+        if isinstance(self.content, str) and self.content not in self.keyword_index.scan(chain).contents:
             raise ExecutionStop
         if isinstance(self.content, MessageChain) and chain != self.content:
             raise ExecutionStop
@@ -179,12 +190,12 @@ class MatchRegex(ChainDecorator, BaseDispatcher):
         self.match_func = self.pattern.fullmatch if full else self.pattern.match
 
     async def __call__(self, chain: MessageChain, _) -> Optional[MessageChain]:
-        if not self.match_func(str(chain)):
+        if not self.match_func(get_view(chain).text):
             raise ExecutionStop
         return chain
 
     async def beforeExecution(self, interface: DispatcherInterface[MessageEvent]):
-        _mapping_str, _map = interface.event.message_chain._to_mapping_str()
+        _mapping_str, _map = interface.event.view.mapping()
         if res := self.match_func(_mapping_str):
             interface.local_storage["__parser_regex_match_obj__"] = res
             interface.local_storage["__parser_regex_match_map__"] = _map
@@ -302,13 +313,7 @@ class FuzzyMatch(ChainDecorator):
 
     def match(self, chain: MessageChain):
         """匹配消息链"""
-        text_frags: List[str] = []
-        for element in chain:
-            if isinstance(element, Plain):
-                text_frags.append(element.text)
-            else:
-                text_frags.append(str(element))
-        text = "".join(text_frags)
+        text = get_view(chain).text
         matcher = difflib.SequenceMatcher(a=text, b=self.template)
         # return false when **any** ratio calc falls undef the rate
         if matcher.real_quick_ratio() < self.min_rate:
@@ -325,7 +330,8 @@ class FuzzyMatch(ChainDecorator):
 
 class FuzzyDispatcher(BaseDispatcher):
     scope_map: ClassVar[DefaultDict[str, List[str]]] = defaultdict(list)
-    event_ref: ClassVar["Dict[int, Dict[str, Tuple[str, float]]]"] = {}
+    index: ClassVar[FuzzyIndex] = FuzzyIndex()
+    event_ref: ClassVar[EventResultCache] = EventResultCache()
 
     def __init__(self, template: str, min_rate: float = 0.6, scope: str = "") -> None:
         """初始化
@@ -339,42 +345,25 @@ class FuzzyDispatcher(BaseDispatcher):
         self.min_rate: float = min_rate
         self.scope: str = scope
         self.scope_map[scope].append(template)
+        self.index.add(template, scope)
 
-    async def beforeExecution(self, interface: DispatcherInterface):
+    async def result(self, interface: DispatcherInterface) -> Dict[str, Tuple[str, float]]:
         event = interface.event
-        if id(event) not in self.event_ref:
+        rate_calc = self.event_ref.get(event)
+        if rate_calc is None:
             chain: MessageChain = await interface.lookup_param("message_chain", MessageChain, None)
-            text_frags: List[str] = []
-            for element in chain:
-                if isinstance(element, Plain):
-                    text_frags.append(element.text)
-                else:
-                    text_frags.append(str(element))
-            text = "".join(text_frags)
-            matcher = difflib.SequenceMatcher()
-            matcher.set_seq2(text)
-            rate_calc = self.event_ref[id(event)] = {}
-            weakref.finalize(event, lambda d: self.event_ref.pop(d), id(event))
-            for scope, templates in self.scope_map.items():
-                max_match: float = 0.0
-                for template in templates:
-                    matcher.set_seq1(template)
-                    if matcher.real_quick_ratio() < max_match:
-                        continue
-                    if matcher.quick_ratio() < max_match:
-                        continue
-                    if matcher.ratio() < max_match:
-                        continue
-                    rate_calc[scope] = (template, matcher.ratio())
-                    max_match = matcher.ratio()
-        win_template, win_rate = self.event_ref[id(event)].get(self.scope, (self.template, 0.0))
+            rate_calc = self.index.match(get_view(chain, event).text)
+            self.event_ref.set(event, rate_calc)
+        return rate_calc
+
+    async def beforeExecution(self, interface: DispatcherInterface):
+        win_template, win_rate = (await self.result(interface)).get(self.scope, (self.template, 0.0))
         if win_template != self.template or win_rate < self.min_rate:
             raise ExecutionStop
 
     async def catch(self, i: DispatcherInterface) -> Optional[float]:
-        event = i.event
-        _, rate = self.event_ref[id(event)].get(self.scope, (self.template, 0.0))
         if generic_issubclass(float, i.annotation) and "rate" in i.name:
+            _, rate = (await self.result(i)).get(self.scope, (self.template, 0.0))
             return rate
 
 
@@ -0,0 +1,161 @@
+"""模糊匹配索引, 供 FuzzyDispatcher 使用"""
+import difflib
+import weakref
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+FuzzyResult = Dict[str, Tuple[str, float]]
+
+
+def _calculate_ratio(matches: int, length: int) -> float:
+    # 与 difflib 的计算方式保持一致, 以保证上界与实际值可以精确比较
+    return 2.0 * matches / length if length else 1.0
+
+
+def _lcs_length(masks: Dict[str, int], full: int, length: int, a: str) -> int:
+    # 位并行的最长公共子序列长度, difflib 的匹配块总长不会超过它
+    v = full
+    for char in a:
+        m = masks.get(char)
+        if m:
+            u = v & m
+            v = ((v + u) | (v - u)) & full
+    return length - bin(v).count("1")
+
+
+class FuzzyIndex:
+    """模糊匹配模板索引
+
+    通过字符倒排索引批量计算每个模板的 `quick_ratio` 上界,
+    再按上界从高到低依次以最长公共子序列长度收紧上界并计算精确的 `ratio`,
+    上界低于当前最优值时即停止.
+    结果与逐个模板调用 `difflib.SequenceMatcher` 完全一致:
+    每个作用域选出 `ratio` 最高的模板, 相同时取较晚注册的模板.
+    """
+
+    def __init__(self, cache_size: int = 256) -> None:
+        """
+        Args:
+            cache_size (int, optional): 按文本缓存的匹配结果数量. 默认为 256.
+        """
+        self.templates: List[str] = []
+        self.template_id: Dict[str, int] = {}
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.scopes: Dict[str, Dict[int, int]] = {}
+        self.cache_size = cache_size
+        self.cache: OrderedDict[str, FuzzyResult] = OrderedDict()
+        self._seq: int = 0
+
+    def add(self, template: str, scope: str = "") -> None:
+        """添加模板, 重复添加会将其视为最新注册的模板
+
+        Args:
+            template (str): 模板字符串
+            scope (str, optional): 作用域
+        """
+        tid = self.template_id.get(template)
+        if tid is None:
+            tid = self.template_id[template] = len(self.templates)
+            self.templates.append(template)
+            for char, count in Counter(template).items():
+                self.postings.setdefault(char, []).append((tid, count))
+        order = self.scopes.setdefault(scope, {})
+        order.pop(tid, None)
+        order[tid] = self._seq
+        self._seq += 1
+        self.cache.clear()
+
+    def _intersections(self, text: str) -> Dict[int, int]:
+        acc: Dict[int, int] = {}
+        get = acc.get
+        postings = self.postings
+        for char, avail in Counter(text).items():
+            for tid, count in postings.get(char, ()):
+                acc[tid] = get(tid, 0) + (count if count < avail else avail)
+        return acc
+
+    def match(self, text: str) -> FuzzyResult:
+        """计算每个作用域中最匹配的模板
+
+        Args:
+            text (str): 待匹配的文本
+
+        Returns:
+            Dict[str, Tuple[str, float]]: 作用域 -> (最佳模板, 匹配度)
+        """
+        if text in self.cache:
+            self.cache.move_to_end(text)
+            return self.cache[text]
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(text)
+        ratios: Dict[int, float] = {}
+        lcs_bounds: Dict[int, float] = {}
+        intersections = self._intersections(text)
+        text_len = len(text)
+        templates = self.templates
+        result: FuzzyResult = {}
+        masks: Dict[str, int] = {}
+        for index, char in enumerate(text):
+            masks[char] = masks.get(char, 0) | (1 << index)
+        full = (1 << text_len) - 1
+
+        def ratio(tid: int) -> float:
+            if tid not in ratios:
+                matcher.set_seq1(templates[tid])
+                ratios[tid] = matcher.ratio()
+            return ratios[tid]
+
+        def lcs_bound(tid: int) -> float:
+            if tid not in lcs_bounds:
+                template = templates[tid]
+                lcs = _lcs_length(masks, full, text_len, template)
+                lcs_bounds[tid] = _calculate_ratio(lcs, len(template) + text_len)
+            return lcs_bounds[tid]
+
+        for scope, order in self.scopes.items():
+            if not order:
+                continue
+            bounds = [
+                (_calculate_ratio(intersections.get(tid, 0), len(templates[tid]) + text_len), seq, tid)
+                for tid, seq in order.items()
+            ]
+            top = max(bounds)
+            best_rate, best_seq, best_tid = ratio(top[2]), top[1], top[2]
+            candidates = [b for b in bounds if b[0] >= best_rate]
+            candidates.sort(reverse=True)
+            for bound, seq, tid in candidates:
+                if bound < best_rate:
+                    break
+                if lcs_bound(tid) < best_rate:
+                    continue
+                rate = ratio(tid)
+                if rate > best_rate or (rate == best_rate and seq > best_seq):
+                    best_rate, best_seq, best_tid = rate, seq, tid
+            result[scope] = (templates[best_tid], best_rate)
+
+        self.cache[text] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+
+class EventResultCache:
+    """以事件为键的有界结果缓存
+
+    只持有事件的弱引用, 通过引用比对避免 `id()` 复用时返回错误的结果, 也不需要为每个事件注册 finalizer.
+    """
+
+    def __init__(self, size: int = 128) -> None:
+        self.size = size
+        self.data: OrderedDict[int, Tuple[weakref.ref, FuzzyResult]] = OrderedDict()
+
+    def get(self, event: object) -> Optional[FuzzyResult]:
+        entry = self.data.get(id(event))
+        if entry is not None and entry[0]() is event:
+            return entry[1]
+
+    def set(self, event: object, result: FuzzyResult) -> None:
+        self.data[id(event)] = (weakref.ref(event), result)
+        self.data.move_to_end(id(event))
+        if len(self.data) > self.size:
+            self.data.popitem(last=False)
@@ -0,0 +1,165 @@
+"""关键字索引, 供 DetectPrefix, DetectSuffix, Mention, ContainKeyword 与 MatchContent 使用"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Set
+
+from graia.amnesia.message.element import Text
+
+from ..chain import MessageChain
+
+
+class KeywordScan(NamedTuple):
+    """一次扫描的结果, 仅包含已注册的字符串"""
+
+    prefixes: FrozenSet[str]
+    """首个元素的文本以之开头的前缀"""
+
+    suffixes: FrozenSet[str]
+    """最后一个元素的文本以之结尾的后缀"""
+
+    keywords: FrozenSet[str]
+    """在连续的文本中出现的关键字"""
+
+    contents: FrozenSet[str]
+    """与消息链的字符串形式相同的内容"""
+
+
+class KeywordIndex:
+    """前缀, 后缀, 关键字与完整内容的共享索引
+
+    关键字使用 Aho-Corasick 自动机匹配, 前缀与后缀按已注册的长度切片后查表,
+    每条消息链只需扫描一次, 结果以消息链指纹为键缓存.
+    结果与逐个调用 `startswith`, `endswith`, `in` 与 `str` 比较完全一致.
+    """
+
+    def __init__(self, cache_size: int = 256) -> None:
+        """
+        Args:
+            cache_size (int, optional): 按消息链指纹缓存的扫描结果数量. 默认为 256.
+        """
+        self.prefixes: Set[str] = set()
+        self.suffixes: Set[str] = set()
+        self.keywords: Set[str] = set()
+        self.contents: Set[str] = set()
+        self.cache_size = cache_size
+        self.cache: OrderedDict[int, KeywordScan] = OrderedDict()
+        self._prefix_lengths: List[int] = []
+        self._suffix_lengths: List[int] = []
+        self._goto: List[Dict[str, int]] = []
+        self._output: List[FrozenSet[str]] = []
+        self._fail: List[int] = []
+        self._built: bool = True
+
+    def add_prefix(self, *prefixes: str) -> None:
+        """注册前缀"""
+        self.prefixes.update(prefixes)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+        self.cache.clear()
+
+    def add_suffix(self, *suffixes: str) -> None:
+        """注册后缀"""
+        self.suffixes.update(suffixes)
+        self._suffix_lengths = sorted({len(suffix) for suffix in self.suffixes})
+        self.cache.clear()
+
+    def add_keyword(self, *keywords: str) -> None:
+        """注册关键字, 自动机会在下次扫描时重建"""
+        self.keywords.update(keywords)
+        self._built = False
+        self.cache.clear()
+
+    def add_content(self, *contents: str) -> None:
+        """注册完整内容"""
+        self.contents.update(contents)
+        self.cache.clear()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Set[str]] = [set()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    output.append(set())
+                state = goto[state][char]
+            output[state].add(keyword)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:  # 广度优先, queue 在遍历时增长
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0)
+                output[child] |= output[fail[child]]
+        self._goto = goto
+        self._fail = fail
+        self._output = [frozenset(out) for out in output]
+        self._built = True
+
+    def _search(self, text: str, found: Set[str]) -> None:
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+    def scan(self, chain: MessageChain) -> KeywordScan:
+        """扫描消息链
+
+        Args:
+            chain (MessageChain): 消息链
+
+        Returns:
+            KeywordScan: 扫描结果
+        """
+        fingerprint = chain.fingerprint
+        if fingerprint in self.cache:
+            self.cache.move_to_end(fingerprint)
+            return self.cache[fingerprint]
+        content = chain.content
+        prefixes: FrozenSet[str] = frozenset()
+        suffixes: FrozenSet[str] = frozenset()
+        keywords: Set[str] = set()
+        if content and isinstance(content[0], Text) and self.prefixes:
+            text = content[0].text
+            prefixes = frozenset(
+                text[:length] for length in self._prefix_lengths if text[:length] in self.prefixes
+            )
+        if content and isinstance(content[-1], Text) and self.suffixes:
+            text = content[-1].text
+            suffixes = frozenset(
+                text[len(text) - length :]
+                for length in self._suffix_lengths
+                if length <= len(text) and text[len(text) - length :] in self.suffixes
+            )
+        if self.keywords:
+            if not self._built:
+                self._build()
+            if "" in self.keywords:
+                keywords.add("")
+            run: List[str] = []
+            for element in content:
+                if isinstance(element, Text):
+                    run.append(element.text)
+                elif run:
+                    self._search("".join(run), keywords)
+                    run.clear()
+            if run:
+                self._search("".join(run), keywords)
+        text = str(chain) if self.contents else ""
+        result = KeywordScan(
+            prefixes,
+            suffixes,
+            frozenset(keywords),
+            frozenset((text,)) if text in self.contents else frozenset(),
+        )
+        self.cache[fingerprint] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
@@ -5,6 +5,7 @@ import enum
 import inspect
 import re
 from argparse import Action, HelpFormatter
+from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -42,6 +43,7 @@ from ..commander.util import Param as ParamToken
 from ..commander.util import Text as TextToken
 from ..commander.util import tokenize
 from ..element import Element
+from ..view import get_view
 from .base import ChainDecorator
 from .util import (
     ElementType,
@@ -54,6 +56,33 @@ from .util import (
     transform_regex,
 )
 
+SPLIT_CACHE_SIZE = 512
+
+split_cache: "OrderedDict[Tuple[int, Tuple[Tuple[str, bool], ...]], Tuple[str, ...]]" = OrderedDict()
+"""以 (消息链指纹, 转化参数) 为键的参数分割缓存, 内容相同的消息链共享同一结果"""
+
+
+def split_chain(chain: MessageChain, map_param: Dict[str, bool]) -> Tuple[List[str], Dict[str, Element]]:
+    """将消息链转化为映射字符串并分割为参数列表, 分割结果按消息链指纹缓存.
+
+    Args:
+        chain (MessageChain): 消息链
+        map_param (Dict[str, bool]): 控制 MessageChain 转化的参数
+
+    Returns:
+        Tuple[List[str], Dict[str, Element]]: 参数列表与映射字典
+    """
+    mapping_str, elem_mapping = chain._to_mapping_str(**map_param)
+    key = (chain.fingerprint, tuple(sorted(map_param.items())))
+    if key in split_cache:
+        split_cache.move_to_end(key)
+        return list(split_cache[key]), elem_mapping
+    arguments = split(mapping_str, keep_quote=True)
+    split_cache[key] = tuple(arguments)
+    if len(split_cache) > SPLIT_CACHE_SIZE:
+        split_cache.popitem(last=False)
+    return arguments, elem_mapping
+
 
 class SpacePolicy(str, enum.Enum):
     """指示 RegexMatch 的尾随空格策略."""
@@ -660,9 +689,8 @@ class Twilight(Generic[T_Sparkle], BaseDispatcher):
         Returns:
             T_Sparkle: 生成的 Sparkle 对象.
         """
-        mapping_str, elem_mapping = chain._to_mapping_str(**self.map_param)
+        arguments, elem_mapping = get_view(chain).arguments(self.map_param)
         token = elem_mapping_ctx.set(elem_mapping)
-        arguments: List[str] = split(mapping_str, keep_quote=True)
         res, match = self.matcher.match(arguments, elem_mapping)
         if storage:
             storage["__parser_regex_match_obj__"] = match
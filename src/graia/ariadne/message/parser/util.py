@@ -28,6 +28,13 @@ if TYPE_CHECKING:
 elem_mapping_ctx: ContextVar[Dict[str, Element]] = ContextVar("elem_mapping_ctx")
 
 
+def _quoted(quote: str) -> str:
+    return rf"{quote}((?:[^{quote}\\]+|\\+{quote}|\\+(?!{quote}))*)({quote}?)"
+
+
+_split_pattern = re.compile("|".join([_quoted("'"), _quoted('"')]))
+
+
 def split(string: str, keep_quote: bool = False) -> List[str]:
     """尊重引号与转义的字符串切分
 
@@ -39,26 +46,23 @@ def split(string: str, keep_quote: bool = False) -> List[str]:
         List[str]: 切割后的字符串, 可能含有空格
     """
     result: List[str] = []
-    quote = ""
     cache: List[str] = []
-    for index, char in enumerate(string):
-        if char in {"'", '"'}:
-            if not quote:
-                quote = char
-            elif char == quote and index and string[index - 1] != "\\":  # is current quote, not transfigured
-                quote = ""
-            else:
-                cache.append(char)
-                continue
-            if keep_quote:
-                cache.append(char)
-        elif not quote and char == " ":
+    pos = 0
+    for match in (*_split_pattern.finditer(string), None):
+        words = string[pos : match.start() if match else None].replace("\\", "").split(" ")
+        cache.append(words[0])
+        if len(words) > 1:
             result.append("".join(cache))
-            cache = []
-        elif char != "\\":
-            cache.append(char)
-    if cache:
-        result.append("".join(cache))
+            result.extend(words[1:-1])
+            cache = [words[-1]]
+        if match is None:
+            break
+        pos = match.end()
+        index: int = match.lastindex  # type: ignore
+        body = match[index - 1].replace("\\", "")  # 引号内的反斜杠仅用于防止引号闭合
+        cache.append(f"{match[0][0]}{body}{match[index]}" if keep_quote else body)
+    if last := "".join(cache):
+        result.append(last)
     return result
 
 
@@ -0,0 +1,118 @@
+"""消息链的派生视图
+
+同一事件会被多个解析器处理, 它们需要的纯文本, 映射字符串与分割结果都只依赖于消息链.
+`MessageEvent.view` 与 `ActiveMessage.view` 为每个事件保存一个 `MessageView`,
+这些派生数据在首次访问时计算, 随事件一同释放.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..context import event_ctx
+from .chain import MessageChain
+from .element import Element
+
+if TYPE_CHECKING:
+    from .commander.util import ChainContentList
+
+
+class MessageView:
+    """消息链的派生视图, 派生数据在首次访问时计算并缓存
+
+    Note:
+        视图不会感知消息链的原地修改.
+    """
+
+    __slots__ = ("chain", "_text", "_display", "_mappings", "_arguments", "_tokens")
+
+    def __init__(self, chain: MessageChain) -> None:
+        """
+        Args:
+            chain (MessageChain): 消息链
+        """
+        self.chain: MessageChain = chain
+        self._text: Optional[str] = None
+        self._display: Optional[str] = None
+        self._mappings: Dict[Tuple[bool, bool, bool], Tuple[str, Dict[str, Element]]] = {}
+        self._arguments: Dict[Tuple[Tuple[str, bool], ...], Tuple[List[str], Dict[str, Element]]] = {}
+        self._tokens: Optional[ChainContentList] = None
+
+    @property
+    def text(self) -> str:
+        """纯文本形式, 即 `str(chain)`"""
+        if self._text is None:
+            self._text = str(self.chain)
+        return self._text
+
+    @property
+    def display(self) -> str:
+        """安全显示字符串, 即 `chain.safe_display`"""
+        if self._display is None:
+            self._display = repr(self.text)[1:-1]
+        return self._display
+
+    def mapping(
+        self,
+        *,
+        remove_source: bool = True,
+        remove_quote: bool = True,
+        remove_extra_space: bool = False,
+    ) -> Tuple[str, Dict[str, Element]]:
+        """映射字符串与映射字典, 参数与 `MessageChain._to_mapping_str` 相同
+
+        Returns:
+            Tuple[str, Dict[str, Element]]: 映射字符串与映射字典
+        """
+        key = (remove_source, remove_quote, remove_extra_space)
+        if key not in self._mappings:
+            self._mappings[key] = self.chain._to_mapping_str(
+                remove_source=remove_source, remove_quote=remove_quote, remove_extra_space=remove_extra_space
+            )
+        return self._mappings[key]
+
+    def arguments(self, map_param: Dict[str, bool]) -> Tuple[List[str], Dict[str, Element]]:
+        """Twilight 的参数分割结果
+
+        Args:
+            map_param (Dict[str, bool]): 控制 MessageChain 转化的参数
+
+        Returns:
+            Tuple[List[str], Dict[str, Element]]: 参数列表与映射字典, 参数列表为副本
+        """
+        from .parser.twilight import split_chain
+
+        key = tuple(sorted(map_param.items()))
+        if key not in self._arguments:
+            self._arguments[key] = split_chain(self.chain, map_param)
+        arguments, elem_mapping = self._arguments[key]
+        return list(arguments), elem_mapping
+
+    @property
+    def tokens(self) -> "ChainContentList":
+        """Commander 的分割结果"""
+        if self._tokens is None:
+            from .commander.util import split
+
+            self._tokens = split(self.chain)
+        return self._tokens
+
+    def __repr__(self) -> str:
+        return f"<MessageView {self.display!r}>"
+
+
+def get_view(chain: MessageChain, event: Any = None) -> MessageView:
+    """获取消息链的视图
+
+    若消息链即为事件的消息链, 返回事件上缓存的视图, 否则创建一个新的视图.
+
+    Args:
+        chain (MessageChain): 消息链
+        event (Any, optional): 事件, 默认为当前上下文中的事件.
+
+    Returns:
+        MessageView: 消息链的视图
+    """
+    if event is None:
+        event = event_ctx.get(None)
+    view = getattr(event, "view", None)
+    if isinstance(view, MessageView) and view.chain is chain:
+        return view
+    return MessageView(chain)
@@ -1,7 +1,10 @@
 """Ariadne 各种 model 存放的位置"""
+import asyncio
 import functools
+import re
+import string
 from datetime import datetime
-from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Literal, Optional, Type, Union
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Type, Union
 
 from loguru import logger
 from pydantic import Field, validator
@@ -22,12 +25,47 @@ from .relationship import MemberPerm as MemberPerm
 from .relationship import Stranger as Stranger
 from .util import AriadneBaseModel as AriadneBaseModel
 
+_FIELD_PATTERN = re.compile(r"(?:event|ariadne)(?:\.[A-Za-z_]\w*)*")
+
+_CONVERSIONS = {"r": "repr", "s": "str", "a": "ascii"}
+
+LogRenderer = Callable[["MiraiEvent", "Ariadne"], str]
+
+
+def compile_log_format(fmt: str) -> LogRenderer:
+    """将日志格式编译为渲染函数, 结果与 `fmt.format(event=event, ariadne=app)` 一致
+
+    仅由 `event` 与 `ariadne` 的属性访问组成的字段会被编译, 其他格式回退到 `str.format`.
+
+    Args:
+        fmt (str): 日志格式
+
+    Returns:
+        LogRenderer: 接收事件与 Ariadne 实例, 返回日志文本的函数
+    """
+    parts: List[str] = ["''"]
+    for literal, field, spec, conversion in string.Formatter().parse(fmt):
+        if literal:
+            parts.append(repr(literal))
+        if field is None:
+            continue
+        if not _FIELD_PATTERN.fullmatch(field) or "{" in (spec or ""):
+            return lambda event, ariadne: fmt.format(event=event, ariadne=ariadne)
+        if conversion:
+            field = f"{_CONVERSIONS[conversion]}({field})"
+        parts.append(f"format({field}, {spec!r})")
+    return eval(
+        f"lambda event, ariadne: ''.join(({', '.join(parts)},))",
+        {"__builtins__": {}, "format": format, "repr": repr, "str": str, "ascii": ascii},
+    )
+
 
 class LogConfig(Dict[Type["MiraiEvent"], Optional[str]]):
     def __init__(
         self,
         log_level: Union[str, Callable[["MiraiEvent"], Optional[str]]] = "INFO",
         extra: Optional[Dict[Union[Type["MiraiEvent"], str], Optional[str]]] = None,
+        queue_size: int = 1024,
     ):
         """
         Args:
@@ -35,7 +73,13 @@ class LogConfig(Dict[Type["MiraiEvent"], Optional[str]]):
             可以是字符串或者一个函数, 函数的参数是 MiraiEvent 对象, 返回字符串
             extra (Optional[Dict[Type["MiraiEvent"], str], Optional[str]]]): \
             额外的事件日志格式, 键为事件类型或事件名, 值为日志格式, None 则禁用该事件日志
+            queue_size (int, optional): 后台日志队列的容量, 队列满时退回同步记录, \
+            为 0 时总是同步记录. 默认为 1024.
         """
+        self.queue_size = queue_size
+        self._renderers: Dict[str, LogRenderer] = {}
+        self._queue: Optional[asyncio.Queue[Tuple[str, str]]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
         from ..event import MiraiEvent
         from ..event.message import (
             ActiveMessage,
@@ -53,7 +97,7 @@ class LogConfig(Dict[Type["MiraiEvent"], Optional[str]]):
         )
 
         account_seg = "{ariadne.account}"
-        msg_chain_seg = "{event.message_chain.safe_display}"
+        msg_chain_seg = "{event.view.display}"
         sender_seg = "{event.sender.name}({event.sender.id})"
         user_seg = "{event.sender.nickname}({event.sender.id})"
         group_seg = "{event.sender.group.name}({event.sender.group.id})"
@@ -76,10 +120,58 @@ class LogConfig(Dict[Type["MiraiEvent"], Optional[str]]):
         return functools.partial(self.log, app)
 
     async def log(self, app: "Ariadne", event: "MiraiEvent") -> None:
-        log_level: Optional[str] = self.log_level(event)
+        """记录事件日志
+
+        日志在记录时立即渲染, 输出在后台任务中进行, 被日志级别过滤的事件不会被渲染.
+
+        Args:
+            app (Ariadne): Ariadne 实例
+            event (MiraiEvent): 事件
+        """
         fmt: Optional[str] = self.get(type(event))
-        if log_level and fmt:
-            logger.log(log_level, fmt.format(event=event, ariadne=app))
+        if not fmt:
+            return
+        log_level: Optional[str] = self.log_level(event)
+        if not log_level:
+            return
+        # no loguru handler accepts this level: skip rendering, keep deferred fields unparsed
+        if logger.level(log_level).no < getattr(logger._core, "min_level", 0):
+            return
+        renderer = self._renderers.get(fmt)
+        if renderer is None:
+            renderer = self._renderers[fmt] = compile_log_format(fmt)
+        # render now: handlers may change the event before the queue is drained
+        message = renderer(event, app)
+        if self.queue_size > 0:
+            if self._queue is None or self._worker is None or self._worker.done():
+                self._queue = self._queue or asyncio.Queue(self.queue_size)
+                self._worker = asyncio.create_task(self._consume(self._queue))
+            if not self._queue.full():
+                self._queue.put_nowait((log_level, message))
+                return
+        logger.log(log_level, message)
+
+    async def _consume(self, queue: "asyncio.Queue[Tuple[str, str]]") -> None:
+        while True:
+            log_level, message = await queue.get()
+            try:
+                logger.log(log_level, message)
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                queue.task_done()
+
+    async def flush(self) -> None:
+        """等待后台队列中的日志全部输出"""
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """输出后台队列中的日志并停止后台任务, 之后记录日志时会重新启动"""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = self._queue = None
 
 
 @internal_cls()
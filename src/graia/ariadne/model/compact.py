@@ -0,0 +1,375 @@
+"""Ariadne 关系模型的紧凑表示
+
+适用于长期驻留在内存中的大量缓存对象:
+使用 `__slots__` 实例, 不携带 `__dict__` 与 `__fields_set__`, 字符串经过驻留 (intern),
+`CompactGroup` 不可变, 字段完全相同的群组共享同一个实例.
+
+公开属性与相等性判断与 `model.relationship` 中的对应模型保持一致,
+需要完整模型时可以调用 `to_model()` 换回.
+"""
+import sys
+from typing import Any, Dict, Optional, Tuple, Union
+from weakref import WeakValueDictionary
+
+from .relationship import Friend, Group, Member, MemberPerm, Stranger
+
+
+def _intern(string: Optional[str]) -> Optional[str]:
+    return sys.intern(string) if string is not None else None
+
+
+_PERM_MAP: Dict[str, MemberPerm] = {perm.value: perm for perm in MemberPerm}
+
+
+def _perm(value: Union[str, MemberPerm]) -> MemberPerm:
+    return value if isinstance(value, MemberPerm) else _PERM_MAP[value]
+
+
+class CompactGroup:
+    """`Group` 的紧凑表示, 不可变, 字段相同的群组在存活期间仅对应一个实例.
+
+    `account_perm` 因账号而异, 不同账号看到的同一群组是不同的实例.
+    """
+
+    __slots__ = ("id", "name", "account_perm", "__weakref__")
+
+    id: int
+    """群号"""
+
+    name: str
+    """群名"""
+
+    account_perm: MemberPerm
+    """你在群中的权限"""
+
+    _registry: "WeakValueDictionary[Tuple[int, str, MemberPerm], CompactGroup]" = WeakValueDictionary()
+
+    def __new__(cls, id: int, name: str, account_perm: Union[str, MemberPerm]) -> "CompactGroup":
+        key = (id, _intern(name), _perm(account_perm))
+        obj = cls._registry.get(key)  # type: ignore
+        if obj is None:
+            obj = super().__new__(cls)
+            for attr, value in zip(("id", "name", "account_perm"), key):
+                object.__setattr__(obj, attr, value)
+            cls._registry[key] = obj  # type: ignore
+        return obj
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    @classmethod
+    def parse_obj(cls, data: Dict[str, Any]) -> "CompactGroup":
+        """从 mirai-api-http 返回的原始数据构造
+
+        Args:
+            data (Dict[str, Any]): 原始数据
+
+        Returns:
+            CompactGroup: 紧凑群组对象
+        """
+        return cls(data["id"], data["name"], data["permission"])
+
+    @classmethod
+    def from_model(cls, group: Group) -> "CompactGroup":
+        """从 `Group` 构造
+
+        Args:
+            group (Group): 群组
+
+        Returns:
+            CompactGroup: 紧凑群组对象
+        """
+        return cls(group.id, group.name, group.account_perm)
+
+    def to_model(self) -> Group:
+        """转换为完整的 `Group` 模型"""
+        return Group.parse_obj(self.dict())
+
+    def dict(self) -> Dict[str, Any]:
+        """转化为与 `Group.dict()` 相同结构的字典"""
+        return {"id": self.id, "name": self.name, "permission": self.account_perm}
+
+    def __int__(self) -> int:
+        return self.id
+
+    def __str__(self) -> str:
+        return f"{self.name}({self.id})"
+
+    def __repr__(self) -> str:
+        return f"CompactGroup(id={self.id!r}, name={self.name!r}, account_perm={self.account_perm!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Group, CompactGroup)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __reduce__(self):
+        return CompactGroup, (self.id, self.name, self.account_perm)
+
+
+class CompactMember:
+    """`Member` 的紧凑表示."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "permission",
+        "special_title",
+        "join_timestamp",
+        "last_speak_timestamp",
+        "mute_time",
+        "group",
+    )
+
+    id: int
+    """QQ 号"""
+
+    name: str
+    """显示名称"""
+
+    permission: MemberPerm
+    """群权限"""
+
+    special_title: Optional[str]
+    """特殊头衔"""
+
+    join_timestamp: Optional[int]
+    """加入的时间"""
+
+    last_speak_timestamp: Optional[int]
+    """最后发言时间"""
+
+    mute_time: Optional[int]
+    """禁言剩余时间"""
+
+    group: CompactGroup
+    """所在群组"""
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        permission: Union[str, MemberPerm],
+        group: Union[CompactGroup, Group],
+        special_title: Optional[str] = None,
+        join_timestamp: Optional[int] = None,
+        last_speak_timestamp: Optional[int] = None,
+        mute_time: Optional[int] = None,
+    ) -> None:
+        self.id = id
+        self.name = _intern(name)  # type: ignore
+        self.permission = _perm(permission)
+        self.group = group if isinstance(group, CompactGroup) else CompactGroup.from_model(group)
+        self.special_title = _intern(special_title)
+        self.join_timestamp = join_timestamp
+        self.last_speak_timestamp = last_speak_timestamp
+        self.mute_time = mute_time
+
+    @classmethod
+    def parse_obj(cls, data: Dict[str, Any]) -> "CompactMember":
+        """从 mirai-api-http 返回的原始数据构造
+
+        Args:
+            data (Dict[str, Any]): 原始数据
+
+        Returns:
+            CompactMember: 紧凑群成员对象
+        """
+        return cls(
+            data["id"],
+            data["memberName"],
+            data["permission"],
+            CompactGroup.parse_obj(data["group"]),
+            data.get("specialTitle"),
+            data.get("joinTimestamp"),
+            data.get("lastSpeakTimestamp"),
+            data.get("mutetimeRemaining"),
+        )
+
+    @classmethod
+    def from_model(cls, member: Member) -> "CompactMember":
+        """从 `Member` 构造
+
+        Args:
+            member (Member): 群成员
+
+        Returns:
+            CompactMember: 紧凑群成员对象
+        """
+        return cls(
+            member.id,
+            member.name,
+            member.permission,
+            CompactGroup.from_model(member.group),
+            member.special_title,
+            member.join_timestamp,
+            member.last_speak_timestamp,
+            member.mute_time,
+        )
+
+    def to_model(self) -> Member:
+        """转换为完整的 `Member` 模型"""
+        return Member.parse_obj(self.dict())
+
+    def dict(self) -> Dict[str, Any]:
+        """转化为与 `Member.dict()` 相同结构的字典"""
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "memberName": self.name,
+            "permission": self.permission,
+            "specialTitle": self.special_title,
+            "joinTimestamp": self.join_timestamp,
+            "lastSpeakTimestamp": self.last_speak_timestamp,
+            "mutetimeRemaining": self.mute_time,
+            "group": self.group.dict(),
+        }
+        return {k: v for k, v in data.items() if v is not None}
+
+    def __int__(self) -> int:
+        return self.id
+
+    def __str__(self) -> str:
+        return f"{self.name}({self.id} @ {self.group})"
+
+    def __repr__(self) -> str:
+        return f"CompactMember(id={self.id!r}, name={self.name!r}, group={self.group!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Friend, Member, Stranger, CompactFriend, CompactMember, CompactStranger)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __reduce__(self):
+        return CompactMember.parse_obj, (self.dict(),)
+
+
+class CompactFriend:
+    """`Friend` 的紧凑表示."""
+
+    __slots__ = ("id", "nickname", "remark")
+
+    id: int
+    """QQ 号"""
+
+    nickname: str
+    """昵称"""
+
+    remark: str
+    """自行设置的代称"""
+
+    def __init__(self, id: int, nickname: str, remark: str) -> None:
+        self.id = id
+        self.nickname = _intern(nickname)  # type: ignore
+        self.remark = _intern(remark)  # type: ignore
+
+    @classmethod
+    def parse_obj(cls, data: Dict[str, Any]) -> "CompactFriend":
+        """从 mirai-api-http 返回的原始数据构造
+
+        Args:
+            data (Dict[str, Any]): 原始数据
+
+        Returns:
+            CompactFriend: 紧凑好友对象
+        """
+        return cls(data["id"], data["nickname"], data["remark"])
+
+    @classmethod
+    def from_model(cls, friend: Friend) -> "CompactFriend":
+        """从 `Friend` 构造
+
+        Args:
+            friend (Friend): 好友
+
+        Returns:
+            CompactFriend: 紧凑好友对象
+        """
+        return cls(friend.id, friend.nickname, friend.remark)
+
+    def to_model(self) -> Friend:
+        """转换为完整的 `Friend` 模型"""
+        return Friend.parse_obj(self.dict())
+
+    def dict(self) -> Dict[str, Any]:
+        """转化为与 `Friend.dict()` 相同结构的字典"""
+        return {"id": self.id, "nickname": self.nickname, "remark": self.remark}
+
+    def __int__(self) -> int:
+        return self.id
+
+    def __str__(self) -> str:
+        return f"{self.remark}({self.id})"
+
+    def __repr__(self) -> str:
+        return f"CompactFriend(id={self.id!r}, nickname={self.nickname!r}, remark={self.remark!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Friend, Member, Stranger, CompactFriend, CompactMember, CompactStranger)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __reduce__(self):
+        return CompactFriend, (self.id, self.nickname, self.remark)
+
+
+class CompactStranger(CompactFriend):
+    """`Stranger` 的紧凑表示."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_model(cls, stranger: Stranger) -> "CompactStranger":  # type: ignore
+        """从 `Stranger` 构造
+
+        Args:
+            stranger (Stranger): 陌生人
+
+        Returns:
+            CompactStranger: 紧凑陌生人对象
+        """
+        return cls(stranger.id, stranger.nickname, stranger.remark)
+
+    def to_model(self) -> Stranger:  # type: ignore
+        """转换为完整的 `Stranger` 模型"""
+        return Stranger.parse_obj(self.dict())
+
+    def __str__(self) -> str:
+        return f"Stranger({self.id}, {self.nickname})"
+
+    def __repr__(self) -> str:
+        return f"CompactStranger(id={self.id!r}, nickname={self.nickname!r}, remark={self.remark!r})"
+
+    def __reduce__(self):
+        return CompactStranger, (self.id, self.nickname, self.remark)
+
+
+_COMPACT_MAP = {
+    Group: CompactGroup,
+    Member: CompactMember,
+    Friend: CompactFriend,
+    Stranger: CompactStranger,
+}
+
+
+CompactType = Union[CompactGroup, CompactMember, CompactFriend, CompactStranger]
+
+
+def compact(model: Union[Group, Member, Friend, Stranger]) -> CompactType:
+    """将关系模型转换为对应的紧凑表示
+
+    Args:
+        model (Union[Group, Member, Friend, Stranger]): 关系模型
+
+    Returns:
+        CompactType: 对应的紧凑表示
+    """
+    return _COMPACT_MAP[type(model)].from_model(model)  # type: ignore
@@ -61,7 +61,9 @@ class Group(AriadneBaseModel):
         return f"{self.name}({self.id})"
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Group) and self.id == other.id
+        if isinstance(other, Group):
+            return self.id == other.id
+        return NotImplemented
 
     async def get_config(self) -> "GroupConfig":
         """获取该群组的 Config
@@ -134,7 +136,9 @@ class Member(AriadneBaseModel):
         return self.id
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, (Friend, Member, Stranger)) and self.id == other.id
+        if isinstance(other, (Friend, Member, Stranger)):
+            return self.id == other.id
+        return NotImplemented
 
     async def get_profile(self) -> "Profile":
         """获取该群成员的 Profile
@@ -220,7 +224,9 @@ class Friend(AriadneBaseModel):
         return f"{self.remark}({self.id})"
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, (Friend, Member, Stranger)) and self.id == other.id
+        if isinstance(other, (Friend, Member, Stranger)):
+            return self.id == other.id
+        return NotImplemented
 
     async def get_profile(self) -> "Profile":
         """获取该好友的 Profile
@@ -270,7 +276,9 @@ class Stranger(AriadneBaseModel):
         return f"Stranger({self.id}, {self.nickname})"
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, (Friend, Member, Stranger)) and self.id == other.id
+        if isinstance(other, (Friend, Member, Stranger)):
+            return self.id == other.id
+        return NotImplemented
 
     async def get_avatar(self, size: Literal[640, 140] = 640) -> bytes:
         """获取该陌生人的头像
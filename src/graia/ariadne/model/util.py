@@ -1,6 +1,6 @@
 """用于 Ariadne 数据模型的工具类."""
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Literal, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Type, Union
 from typing_extensions import NotRequired, TypedDict
 
 from pydantic import BaseConfig, BaseModel, Extra
@@ -55,6 +55,69 @@ class AriadneBaseModel(BaseModel):
         }
 
 
+class Deferred:
+    """尚未解析的字段值, 保存原始数据与解析函数"""
+
+    __slots__ = ("loader", "raw")
+
+    def __init__(self, loader: Callable[[Any], Any], raw: Any) -> None:
+        self.loader = loader
+        self.raw = raw
+
+    def load(self) -> Any:
+        """解析原始数据"""
+        return self.loader(self.raw)
+
+    def __repr__(self) -> str:
+        return f"<Deferred {self.raw!r}>"
+
+
+class DeferredField:
+    """模型字段的描述符, 字段值为 `Deferred` 时在首次访问时解析并替换"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Optional[BaseModel], objtype: Optional[Type[BaseModel]] = None) -> Any:
+        if obj is None:  # 与 pydantic 一致, 字段不作为类属性暴露
+            raise AttributeError(self.name)
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if isinstance(value, Deferred):
+            value = obj.__dict__[self.name] = value.load()
+        return value
+
+    def __set__(self, obj: BaseModel, value: Any) -> None:
+        obj.__dict__[self.name] = value
+
+
+def is_deferred(model: BaseModel, name: str) -> bool:
+    """判断模型的字段是否尚未解析
+
+    Args:
+        model (BaseModel): 模型
+        name (str): 字段名
+
+    Returns:
+        bool: 是否尚未解析
+    """
+    return isinstance(model.__dict__.get(name), Deferred)
+
+
+def load_deferred(model: BaseModel) -> None:
+    """解析模型中所有尚未解析的字段
+
+    Args:
+        model (BaseModel): 模型
+    """
+    values = model.__dict__
+    for name, value in values.items():
+        if isinstance(value, Deferred):
+            values[name] = value.load()
+
+
 class AriadneOptions(TypedDict):
     """Ariadne 内部的选项存储"""
 
@@ -13,8 +13,14 @@ from packaging.version import Version
 from graia.amnesia.builtins.aiohttp import AiohttpClientInterface
 from graia.broadcast import Broadcast
 
-from .connection import CONFIG_MAP, ConnectionInterface, ConnectionMixin, HttpClientConnection
-from .connection._info import HttpClientInfo, U_Info
+from .connection import (
+    CONFIG_MAP,
+    ConnectionGroup,
+    ConnectionInterface,
+    ConnectionMixin,
+    HttpClientConnection,
+)
+from .connection._info import HttpClientInfo, U_Info, WebsocketClientInfo, WebsocketServerInfo
 from .dispatcher import ContextDispatcher, LaunartInterfaceDispatcher, NoneDispatcher
 from .exception import AriadneConfigurationError
 
@@ -132,7 +138,7 @@ class ElizabethService(Service):
             logger.opt(colors=True).success("All dependencies up to date!", style="green")
 
     def add_infos(self, infos: Iterable[U_Info]) -> Tuple[List[ConnectionMixin], int]:
-        """通过传入的 Info 对象创建 Connection"""
+        """通过传入的 Info 对象创建 Connection, 多个 Websocket 连接会被组合为 `ConnectionGroup`"""
         infos = list(infos)
         if not infos:
             raise AriadneConfigurationError("No configs provided")
@@ -145,7 +151,13 @@ class ElizabethService(Service):
 
         infos.sort(key=lambda x: isinstance(x, HttpClientInfo))
         # make sure the http client is the last one
-        conns: List[ConnectionMixin] = [self.add_info(conf) for conf in infos]
+        websockets = [i for i in infos if isinstance(i, (WebsocketClientInfo, WebsocketServerInfo))]
+        conns: List[ConnectionMixin] = []
+        if len(websockets) > 1:
+            conns = [CONFIG_MAP[conf.__class__](conf) for conf in websockets]
+            self.connections[account] = ConnectionGroup(conns)  # type: ignore
+            infos = [i for i in infos if not isinstance(i, (WebsocketClientInfo, WebsocketServerInfo))]
+        conns.extend(self.add_info(conf) for conf in infos)
         return conns, account
 
     def add_info(self, config: U_Info) -> ConnectionMixin:
@@ -170,6 +182,7 @@ class ElizabethService(Service):
         from .app import Ariadne
         from .context import enter_context
         from .event.lifecycle import AccountLaunch, AccountShutdown, ApplicationLaunch, ApplicationShutdown
+        from .util.async_exec import ParallelExecutor
 
         self.base_telemetry()
         async with self.stage("preparing"):
@@ -178,6 +191,9 @@ class ElizabethService(Service):
                 app = Ariadne.current()
                 with enter_context(app=app):
                     self.broadcast.postEvent(ApplicationLaunch(app))
+            executor = ParallelExecutor.loop_ref_dict.get(asyncio.get_running_loop())
+            if executor is not None:
+                await executor.warm_up()
             for conn in self.connections.values():
                 app = Ariadne.current(conn.info.account)
 
@@ -188,6 +204,10 @@ class ElizabethService(Service):
 
                 conn._connection_fail = _disconnect_cb
 
+                if app.entity_store:
+                    await app.entity_store.load(app.account)
+                    app.entity_store.start_reconcile(app)
+
                 with enter_context(app=app):
                     self.broadcast.postEvent(AccountLaunch(app))
 
@@ -203,6 +223,16 @@ class ElizabethService(Service):
                     app = Ariadne.current(conn.info.account)
                     with enter_context(app=app):
                         await self.broadcast.postEvent(AccountShutdown(app))
+            for conn in self.connections.values():
+                for http_conn in (conn, conn.fallback):
+                    if isinstance(http_conn, HttpClientConnection):
+                        await http_conn.close()
+            for app in Ariadne.instances.values():
+                await app.log_config.close()
+                if app.entity_store:
+                    await app.entity_store.close()
+                if app.message_store:
+                    await app.message_store.close()
 
             for task in asyncio.all_tasks():
                 if task.done():
@@ -0,0 +1,3 @@
+"""Ariadne 的持久化存储"""
+from .entity import EntityStore as EntityStore
+from .message import MessageStore as MessageStore
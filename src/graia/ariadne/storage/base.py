@@ -0,0 +1,164 @@
+"""基于 SQLite 的存储基础设施"""
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
+
+R = TypeVar("R")
+
+Statement = Tuple[str, Tuple[Any, ...]]
+
+
+class SQLiteStore:
+    """SQLite 存储基类
+
+    所有存储的数据库操作都在同一个后台线程中串行执行, 不会阻塞事件循环.
+    写入先在内存中暂存, 相同键的写入会被合并, 之后按批次在一个事务内提交.
+    """
+
+    schema: ClassVar[str] = ""
+
+    _shared_executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    _shared_users: ClassVar[int] = 0
+
+    def __init__(
+        self,
+        path: Union[str, "PathLike[str]"],
+        *,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            path (Union[str, PathLike[str]]): 数据库文件路径, 可为 `:memory:`
+            batch_size (int, optional): 暂存的写入达到此数量时立即提交. 默认为 512.
+            flush_interval (float, optional): 暂存写入的最长等待时间, 单位为秒. 默认为 1.0.
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Hashable, List[Statement]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self._opening: Optional[asyncio.Future[None]] = None
+
+    @staticmethod
+    def _acquire_executor() -> ThreadPoolExecutor:
+        if SQLiteStore._shared_executor is None:
+            SQLiteStore._shared_executor = ThreadPoolExecutor(1, thread_name_prefix="ariadne-storage")
+        SQLiteStore._shared_users += 1
+        return SQLiteStore._shared_executor
+
+    @staticmethod
+    def _release_executor() -> None:
+        SQLiteStore._shared_users -= 1
+        if not SQLiteStore._shared_users and SQLiteStore._shared_executor is not None:
+            SQLiteStore._shared_executor.shutdown(wait=False)
+            SQLiteStore._shared_executor = None
+
+    @property
+    def opened(self) -> bool:
+        """数据库是否已打开"""
+        return self._conn is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.schema)
+        conn.commit()
+        return conn
+
+    async def open(self) -> None:
+        """打开数据库, 可重复调用"""
+        if self._conn is not None:
+            return
+        if self._opening is None:
+            self._opening = asyncio.get_running_loop().create_future()
+            self._executor = self._acquire_executor()
+            try:
+                self._conn = await self._run(self._connect)
+            except BaseException as e:
+                self._release_executor()
+                self._executor = None
+                self._opening.set_exception(e)
+                self._opening = None
+                raise
+            self._opening.set_result(None)
+        else:
+            await asyncio.shield(self._opening)
+
+    async def close(self) -> None:
+        """提交所有暂存的写入并关闭数据库"""
+        if self._pending:
+            await self.flush()
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        await self._run(conn.close)
+        if self._executor:
+            self._release_executor()
+        self._executor = None
+        self._opening = None
+
+    def _run(self, func: Callable[..., R], *args: Any) -> "asyncio.Future[R]":
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        await self.open()
+        conn = self._conn
+        assert conn is not None
+        return await self._run(lambda: conn.execute(sql, params).fetchall())
+
+    def _stage(self, key: Hashable, *statements: Statement) -> None:
+        """暂存写入, 以相同的键再次暂存会覆盖之前未提交的写入
+
+        Args:
+            key (Hashable): 写入的键
+            *statements (Statement): SQL 语句与参数
+        """
+        self._pending.pop(key, None)
+        self._pending[key] = list(statements)
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._schedule_flush
+            )
+
+    def _discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        """丢弃符合条件的暂存写入"""
+        for key in [k for k in self._pending if predicate(k)]:
+            del self._pending[key]
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[List[Statement]]) -> None:
+        with conn:
+            for statements in batch:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+
+    async def flush(self) -> None:
+        """立即提交所有暂存的写入"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.open()
+        while self._pending:
+            batch = list(self._pending.values())
+            self._pending.clear()
+            conn = self._conn
+            assert conn is not None
+            await self._run(self._commit, conn, batch)
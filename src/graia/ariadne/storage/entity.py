@@ -0,0 +1,352 @@
+"""好友, 群组与群成员的持久化存储"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+from os import PathLike
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from loguru import logger
+
+from ..model.compact import CompactFriend, CompactGroup, CompactMember
+from ..model.relationship import Friend, Group, Member
+from .base import SQLiteStore
+
+if TYPE_CHECKING:
+    from ..app import Ariadne
+
+T = TypeVar("T")
+
+Entry = Tuple[T, float]
+
+
+def _dump(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class EntityStore(SQLiteStore):
+    """跨重启保存的关系图存储
+
+    以账号为单位保存好友, 群组与群成员, 在 `AccountLaunch` 时载入内存,
+    并在后台与远端对账. `Ariadne` 的 `get_friend`, `get_group`, `get_member` 与 `get_member_list`
+    在使用缓存时会优先从此处读取未过期的数据.
+
+    内存中的数据以 `model.compact` 中的紧凑形式保存.
+    """
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS friend (
+        account INTEGER, id INTEGER, data TEXT, updated REAL, PRIMARY KEY (account, id)
+    );
+    CREATE TABLE IF NOT EXISTS "group" (
+        account INTEGER, id INTEGER, data TEXT, updated REAL, PRIMARY KEY (account, id)
+    );
+    CREATE TABLE IF NOT EXISTS member (
+        account INTEGER, group_id INTEGER, id INTEGER, data TEXT, updated REAL,
+        PRIMARY KEY (account, group_id, id)
+    );
+    CREATE TABLE IF NOT EXISTS sync (
+        account INTEGER, scope TEXT, updated REAL, PRIMARY KEY (account, scope)
+    );
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "PathLike[str]"],
+        *,
+        max_age: timedelta = timedelta(hours=6),
+        reconcile_interval: Optional[timedelta] = timedelta(hours=1),
+        reconcile_delay: float = 0.5,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            path (Union[str, PathLike[str]]): 数据库文件路径
+            max_age (timedelta, optional): 数据的最长有效期, 超出后获取时将回源. 默认为 6 小时.
+            reconcile_interval (Optional[timedelta], optional): 后台对账间隔, 为 None 则仅在启动时对账. \
+                默认为 1 小时.
+            reconcile_delay (float, optional): 对账时逐个拉取群成员列表的间隔, 单位为秒. 默认为 0.5.
+        """
+        super().__init__(path, **kwargs)
+        self.max_age: float = max_age.total_seconds()
+        self.reconcile_interval: Optional[float] = (
+            reconcile_interval.total_seconds() if reconcile_interval else None
+        )
+        self.reconcile_delay = reconcile_delay
+        self._friends: Dict[int, Dict[int, Entry[CompactFriend]]] = {}
+        self._groups: Dict[int, Dict[int, Entry[CompactGroup]]] = {}
+        self._members: Dict[Tuple[int, int], Dict[int, Entry[CompactMember]]] = {}
+        self._synced: Dict[Tuple[int, str], float] = {}
+        self._tasks: Dict[int, asyncio.Task[None]] = {}
+
+    def _fresh(self, updated: Optional[float]) -> bool:
+        return updated is not None and time.time() - updated <= self.max_age
+
+    async def load(self, account: int) -> None:
+        """将指定账号的数据载入内存
+
+        Args:
+            account (int): 账号
+        """
+        friends = await self._query("SELECT id, data, updated FROM friend WHERE account = ?", (account,))
+        groups = await self._query('SELECT id, data, updated FROM "group" WHERE account = ?', (account,))
+        members = await self._query(
+            "SELECT group_id, id, data, updated FROM member WHERE account = ?", (account,)
+        )
+        synced = await self._query("SELECT scope, updated FROM sync WHERE account = ?", (account,))
+
+        self._friends[account] = {
+            id: (CompactFriend.parse_obj(json.loads(data)), updated) for id, data, updated in friends
+        }
+        group_map = self._groups[account] = {
+            id: (CompactGroup.parse_obj(json.loads(data)), updated) for id, data, updated in groups
+        }
+        for group_id, id, data, updated in members:
+            raw = json.loads(data)
+            group = group_map.get(group_id)
+            member = CompactMember(
+                id,
+                raw["memberName"],
+                raw["permission"],
+                group[0] if group else CompactGroup.parse_obj(raw["group"]),
+                raw.get("specialTitle"),
+                raw.get("joinTimestamp"),
+                raw.get("lastSpeakTimestamp"),
+                raw.get("mutetimeRemaining"),
+            )
+            self._members.setdefault((account, group_id), {})[id] = (member, updated)
+        for scope, updated in synced:
+            self._synced[account, scope] = updated
+        logger.info(
+            f"Loaded {len(friends)} friends, {len(groups)} groups, {len(members)} members for {account}",
+            style="dark_orange",
+        )
+
+    def get_friend(self, account: int, friend_id: int) -> Optional[Friend]:
+        """获取未过期的好友
+
+        Args:
+            account (int): 账号
+            friend_id (int): 好友 QQ 号
+
+        Returns:
+            Optional[Friend]: 好友, 不存在或已过期时为 None
+        """
+        entry = self._friends.get(account, {}).get(friend_id)
+        if entry and self._fresh(entry[1]):
+            return entry[0].to_model()
+
+    def get_group(self, account: int, group_id: int) -> Optional[Group]:
+        """获取未过期的群组
+
+        Args:
+            account (int): 账号
+            group_id (int): 群号
+
+        Returns:
+            Optional[Group]: 群组, 不存在或已过期时为 None
+        """
+        entry = self._groups.get(account, {}).get(group_id)
+        if entry and self._fresh(entry[1]):
+            return entry[0].to_model()
+
+    def get_member(self, account: int, group_id: int, member_id: int) -> Optional[Member]:
+        """获取未过期的群成员
+
+        Args:
+            account (int): 账号
+            group_id (int): 群号
+            member_id (int): 群成员 QQ 号
+
+        Returns:
+            Optional[Member]: 群成员, 不存在或已过期时为 None
+        """
+        entry = self._members.get((account, group_id), {}).get(member_id)
+        if entry and self._fresh(entry[1]):
+            return entry[0].to_model()
+
+    def get_member_list(self, account: int, group_id: int) -> Optional[List[Member]]:
+        """获取未过期的完整群成员列表
+
+        Args:
+            account (int): 账号
+            group_id (int): 群号
+
+        Returns:
+            Optional[List[Member]]: 群成员列表, 未完整同步过或已过期时为 None
+        """
+        if not self._fresh(self._synced.get((account, f"member.{group_id}"))):
+            return None
+        return [member.to_model() for member, _ in self._members.get((account, group_id), {}).values()]
+
+    def _mark_synced(self, account: int, scope: str, now: float) -> None:
+        self._synced[account, scope] = now
+        self._stage(
+            ("sync", account, scope),
+            ("INSERT OR REPLACE INTO sync VALUES (?, ?, ?)", (account, scope, now)),
+        )
+
+    def _put(
+        self,
+        table: str,
+        store: Dict[int, Entry[Any]],
+        key: Tuple[Any, ...],
+        compact: Any,
+        now: float,
+    ) -> None:
+        entry = store.get(compact.id)
+        data = compact.dict()
+        # entries are never mutated in place, so entry[0] is what was staged last time
+        if entry and entry[0].dict() == data and now - entry[1] < self.max_age / 2:
+            return
+        store[compact.id] = (compact, now)
+        self._stage(
+            (table,) + key,
+            (
+                f'INSERT OR REPLACE INTO "{table}" VALUES ({", ".join("?" * (len(key) + 2))})',
+                key + (_dump(data), now),
+            ),
+        )
+
+    def put_friend(self, account: int, friend: Friend) -> None:
+        """更新好友
+
+        Args:
+            account (int): 账号
+            friend (Friend): 好友
+        """
+        store = self._friends.setdefault(account, {})
+        self._put("friend", store, (account, friend.id), CompactFriend.from_model(friend), time.time())
+
+    def put_group(self, account: int, group: Group) -> None:
+        """更新群组
+
+        Args:
+            account (int): 账号
+            group (Group): 群组
+        """
+        store = self._groups.setdefault(account, {})
+        self._put("group", store, (account, group.id), CompactGroup.from_model(group), time.time())
+
+    def put_member(self, account: int, member: Member) -> None:
+        """更新群成员, 同时更新其所在群组
+
+        Args:
+            account (int): 账号
+            member (Member): 群成员
+        """
+        self.put_group(account, member.group)
+        store = self._members.setdefault((account, member.group.id), {})
+        key = (account, member.group.id, member.id)
+        self._put("member", store, key, CompactMember.from_model(member), time.time())
+
+    def replace_friends(self, account: int, friends: Iterable[Friend]) -> None:
+        """以完整的好友列表替换已有数据
+
+        Args:
+            account (int): 账号
+            friends (Iterable[Friend]): 好友列表
+        """
+        now = time.time()
+        self._friends[account] = {}
+        self._discard(lambda k: k[:2] == ("friend", account))  # type: ignore
+        self._stage(("friend", account), ("DELETE FROM friend WHERE account = ?", (account,)))
+        for friend in friends:
+            self._put(
+                "friend", self._friends[account], (account, friend.id), CompactFriend.from_model(friend), now
+            )
+        self._mark_synced(account, "friend", now)
+
+    def replace_groups(self, account: int, groups: Iterable[Group]) -> None:
+        """以完整的群组列表替换已有数据
+
+        Args:
+            account (int): 账号
+            groups (Iterable[Group]): 群组列表
+        """
+        now = time.time()
+        groups = list(groups)
+        self._groups[account] = {}
+        self._discard(lambda k: k[:2] == ("group", account))  # type: ignore
+        self._stage(("group", account), ('DELETE FROM "group" WHERE account = ?', (account,)))
+        for group in groups:
+            self._put(
+                "group", self._groups[account], (account, group.id), CompactGroup.from_model(group), now
+            )
+        alive = {group.id for group in groups}
+        for account_, group_id in [k for k in self._members if k[0] == account and k[1] not in alive]:
+            del self._members[account_, group_id]
+            self._synced.pop((account, f"member.{group_id}"), None)
+        self._stage(
+            ("member", account, "orphan"),
+            (
+                "DELETE FROM member WHERE account = ? "
+                'AND group_id NOT IN (SELECT id FROM "group" WHERE account = ?)',
+                (account, account),
+            ),
+        )
+        self._mark_synced(account, "group", now)
+
+    def replace_members(self, account: int, group_id: int, members: Iterable[Member]) -> None:
+        """以完整的群成员列表替换已有数据
+
+        Args:
+            account (int): 账号
+            group_id (int): 群号
+            members (Iterable[Member]): 群成员列表
+        """
+        now = time.time()
+        store = self._members[account, group_id] = {}
+        self._discard(lambda k: k[:3] == ("member", account, group_id))  # type: ignore
+        self._stage(
+            ("member", account, group_id),
+            ("DELETE FROM member WHERE account = ? AND group_id = ?", (account, group_id)),
+        )
+        for member in members:
+            self._put("member", store, (account, group_id, member.id), CompactMember.from_model(member), now)
+        self._mark_synced(account, f"member.{group_id}", now)
+
+    async def reconcile(self, app: "Ariadne") -> None:
+        """与远端对账一次, 仅刷新已过期的部分
+
+        Args:
+            app (Ariadne): Ariadne 实例
+        """
+        account = app.account
+        if not self._fresh(self._synced.get((account, "friend"))):
+            await app.get_friend_list()
+        if not self._fresh(self._synced.get((account, "group"))):
+            await app.get_group_list()
+        for group_id in list(self._groups.get(account, {})):
+            if not self._fresh(self._synced.get((account, f"member.{group_id}"))):
+                await app.get_member_list(group_id)
+                await asyncio.sleep(self.reconcile_delay)
+
+    async def _reconcile_loop(self, app: "Ariadne") -> None:
+        while True:
+            await app.connection.status.wait_for_available()
+            try:
+                await self.reconcile(app)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to reconcile entity store for {app.account}: {e!r}")
+            if self.reconcile_interval is None:
+                return
+            await asyncio.sleep(self.reconcile_interval)
+
+    def start_reconcile(self, app: "Ariadne") -> None:
+        """在后台启动对账任务
+
+        Args:
+            app (Ariadne): Ariadne 实例
+        """
+        task = self._tasks.get(app.account)
+        if task is None or task.done():
+            self._tasks[app.account] = asyncio.get_running_loop().create_task(self._reconcile_loop(app))
+
+    async def close(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        await super().close()
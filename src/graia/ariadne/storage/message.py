@@ -0,0 +1,163 @@
+"""消息历史的持久化存储"""
+import json
+import time
+from datetime import timedelta
+from os import PathLike
+from typing import Any, List, Optional, Union
+
+from ..connection.util import build_event
+from ..event.message import ActiveMessage, GroupMessage, MessageEvent, OtherClientMessage
+from .base import SQLiteStore
+
+U_MessageEvent = Union[MessageEvent, ActiveMessage]
+
+
+def get_target(account: int, event: U_MessageEvent) -> int:
+    """获取消息事件对应的 `messageFromId` target
+
+    Args:
+        account (int): 账号
+        event (Union[MessageEvent, ActiveMessage]): 消息事件
+
+    Returns:
+        int: 群号, 好友或临时会话对象的 QQ 号, 其他客户端消息则为账号本身
+    """
+    if isinstance(event, ActiveMessage):
+        return event.subject.id
+    if isinstance(event, GroupMessage):
+        return event.sender.group.id
+    if isinstance(event, OtherClientMessage):
+        return account
+    return event.sender.id
+
+
+class MessageStore(SQLiteStore):
+    """只追加的消息历史存储
+
+    以账号为单位记录收到与发出的消息事件, 按消息 ID, 会话对象与时间建立索引,
+    并按保留期限定期清理. `Ariadne` 的 `get_message_from_id`, `recall_message` 与 `set_essence`
+    在缓存未命中时会查询此处.
+    """
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS message (
+        account INTEGER, target INTEGER, id INTEGER, time REAL, type TEXT, data TEXT,
+        PRIMARY KEY (account, target, id)
+    );
+    CREATE INDEX IF NOT EXISTS message_id ON message (account, id);
+    CREATE INDEX IF NOT EXISTS message_time ON message (account, target, time);
+    CREATE INDEX IF NOT EXISTS message_expire ON message (time);
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "PathLike[str]"],
+        *,
+        retention: Optional[timedelta] = timedelta(days=7),
+        prune_interval: timedelta = timedelta(minutes=10),
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            path (Union[str, PathLike[str]]): 数据库文件路径
+            retention (Optional[timedelta], optional): 消息保留期限, 为 None 则永久保留. 默认为 7 天.
+            prune_interval (timedelta, optional): 清理过期消息的最短间隔. 默认为 10 分钟.
+        """
+        super().__init__(path, **kwargs)
+        self.retention: Optional[float] = retention.total_seconds() if retention else None
+        self.prune_interval: float = prune_interval.total_seconds()
+        self._last_prune: float = 0.0
+
+    def put(self, account: int, event: U_MessageEvent) -> None:
+        """记录消息事件, 写入会在后台批量提交
+
+        Args:
+            account (int): 账号
+            event (Union[MessageEvent, ActiveMessage]): 消息事件
+        """
+        target = get_target(account, event)
+        self._stage(
+            ("message", account, target, event.id),
+            (
+                "INSERT OR REPLACE INTO message VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    account,
+                    target,
+                    event.id,
+                    event.source.time.timestamp(),
+                    event.type,
+                    event.json(by_alias=True, exclude_none=True),
+                ),
+            ),
+        )
+        now = time.time()
+        if self.retention is not None and now - self._last_prune >= self.prune_interval:
+            self._last_prune = now
+            self._stage(("prune",), ("DELETE FROM message WHERE time < ?", (now - self.retention,)))
+
+    def _pending_data(self, account: int, message_id: int, target: Optional[int]) -> Optional[str]:
+        if target is not None:
+            statements = self._pending.get(("message", account, target, message_id))
+            return statements[0][1][-1] if statements else None
+        for key in reversed(list(self._pending)):
+            if key[:2] == ("message", account) and key[3] == message_id:  # type: ignore
+                return self._pending[key][0][1][-1]
+
+    async def get(
+        self, account: int, message_id: int, target: Optional[int] = None
+    ) -> Optional[U_MessageEvent]:
+        """通过消息 ID 获取消息事件
+
+        Args:
+            account (int): 账号
+            message_id (int): 消息 ID
+            target (Optional[int], optional): 会话对象, 未指定时返回最近的同 ID 消息
+
+        Returns:
+            Optional[Union[MessageEvent, ActiveMessage]]: 消息事件, 不存在时为 None
+        """
+        data = self._pending_data(account, message_id, target)
+        if data is None:
+            if target is not None:
+                rows = await self._query(
+                    "SELECT data FROM message WHERE account = ? AND target = ? AND id = ?",
+                    (account, target, message_id),
+                )
+            else:
+                rows = await self._query(
+                    "SELECT data FROM message WHERE account = ? AND id = ? ORDER BY time DESC LIMIT 1",
+                    (account, message_id),
+                )
+            if not rows:
+                return None
+            data = rows[0][0]
+        return build_event(json.loads(data))  # type: ignore
+
+    async def history(
+        self,
+        account: int,
+        target: int,
+        *,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[U_MessageEvent]:
+        """获取与指定会话对象的消息历史, 按时间倒序排列
+
+        Args:
+            account (int): 账号
+            target (int): 会话对象
+            start (Optional[float], optional): 起始时间戳
+            end (Optional[float], optional): 结束时间戳
+            limit (int, optional): 最大数量. 默认为 100.
+
+        Returns:
+            List[Union[MessageEvent, ActiveMessage]]: 消息事件列表
+        """
+        await self.flush()
+        rows = await self._query(
+            "SELECT data FROM message WHERE account = ? AND target = ? AND time >= ? AND time <= ? "
+            "ORDER BY time DESC LIMIT ?",
+            (account, target, start or 0.0, end or float("inf"), limit),
+        )
+        return [build_event(json.loads(data)) for data, in rows]  # type: ignore
@@ -0,0 +1,10 @@
+"""Ariadne 的测试与压测工具
+
+提供本地运行的 mirai-api-http 替身, 事件录制与回放, 以及端到端延迟测量, 无需真实后端.
+"""
+from .replay import EventRecorder as EventRecorder
+from .replay import EventReplayer as EventReplayer
+from .replay import LatencyProbe as LatencyProbe
+from .replay import ReplayReport as ReplayReport
+from .replay import load_events as load_events
+from .server import MockMiraiServer as MockMiraiServer
@@ -0,0 +1,289 @@
+"""事件录制, 回放与端到端延迟测量"""
+import asyncio
+import functools
+import json
+import time
+from os import PathLike
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from graia.broadcast import Broadcast
+
+from ..event import MiraiEvent
+from .server import MockMiraiServer
+
+if TYPE_CHECKING:
+    from ..app import Ariadne
+
+REPLAY_ID = "replayId"
+"""回放时附加在原始事件上的字段, 用于关联推送与处理完毕的时间"""
+
+RecordedEvent = Tuple[float, Dict[str, Any]]
+
+
+def load_events(path: Union[str, "PathLike[str]"]) -> List[RecordedEvent]:
+    """读取录制的事件, 每行为一个原始事件, 或 `EventRecorder` 写入的 `{"time": ..., "event": ...}`
+
+    Args:
+        path (Union[str, PathLike[str]]): JSONL 文件路径
+
+    Returns:
+        List[RecordedEvent]: (相对时间, 原始事件) 列表
+    """
+    events: List[RecordedEvent] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if "event" in data and "type" not in data:
+                events.append((float(data.get("time", 0.0)), data["event"]))
+            else:
+                events.append((0.0, data))
+    return events
+
+
+class EventRecorder:
+    """将 Ariadne 收到的事件录制为 JSONL, 供 `EventReplayer` 回放"""
+
+    def __init__(self, path: Union[str, "PathLike[str]"]) -> None:
+        """
+        Args:
+            path (Union[str, PathLike[str]]): JSONL 文件路径, 以追加方式写入
+        """
+        self.path = path
+        self._file: Optional[IO[str]] = None
+        self._start: float = 0.0
+
+    def attach(self, app: "Ariadne") -> None:
+        """开始录制指定账号收到的事件
+
+        Args:
+            app (Ariadne): Ariadne 实例
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._start = time.monotonic()
+        app.connection.add_callback(self.record)
+
+    async def record(self, event: MiraiEvent) -> None:
+        """写入一个事件
+
+        Args:
+            event (MiraiEvent): 事件
+        """
+        if self._file is None:
+            return
+        data = {"time": time.monotonic() - self._start, "event": json.loads(event.json(by_alias=True))}
+        self._file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        """结束录制"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _percentile(data: List[float], percent: float) -> float:
+    if not data:
+        return 0.0
+    data = sorted(data)
+    return data[min(len(data) - 1, max(0, round(percent / 100 * len(data) + 0.5) - 1))]
+
+
+class ReplayReport(NamedTuple):
+    """回放结果"""
+
+    sent: int
+    """推送的事件数"""
+
+    completed: Optional[int]
+    """所有监听器执行完毕的事件数, 未使用延迟探针时为 None"""
+
+    elapsed: float
+    """从第一次推送到最后一个事件处理完毕的时间, 单位为秒"""
+
+    p50: float
+    """端到端延迟的中位数, 单位为秒"""
+
+    p99: float
+    """端到端延迟的 99 分位数, 单位为秒"""
+
+    max: float
+    """端到端延迟的最大值, 单位为秒"""
+
+    dropped: int = 0
+    """因服务器的事件队列已满而丢弃的事件数"""
+
+    @property
+    def events_per_second(self) -> float:
+        """端到端吞吐量, 未使用延迟探针时为推送速率"""
+        count = self.sent if self.completed is None else self.completed
+        return count / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        completed = "?" if self.completed is None else self.completed
+        return (
+            f"{completed}/{self.sent} events in {self.elapsed:.2f}s, {self.dropped} dropped, "
+            f"{self.events_per_second:.2f}events/s, "
+            f"p50={self.p50 * 1000:.2f}ms p99={self.p99 * 1000:.2f}ms max={self.max * 1000:.2f}ms"
+        )
+
+
+class LatencyProbe:
+    """测量事件从推送到所有监听器执行完毕的延迟
+
+    通过包装 `Broadcast.postEvent` 实现, 仅统计带有 `REPLAY_ID` 字段的事件.
+    """
+
+    def __init__(self, broadcast: Broadcast) -> None:
+        """
+        Args:
+            broadcast (Broadcast): Ariadne 使用的 Broadcast 实例
+        """
+        self.broadcast = broadcast
+        self.started: Dict[int, float] = {}
+        self.latencies: List[float] = []
+        self.last_completed: float = 0.0
+
+    def attach(self) -> None:
+        """开始测量"""
+        if "postEvent" not in self.broadcast.__dict__:
+            self.broadcast.postEvent = self._post_event  # type: ignore
+
+    def detach(self) -> None:
+        """停止测量"""
+        self.broadcast.__dict__.pop("postEvent", None)
+
+    def start(self, replay_id: int) -> None:
+        """记录事件的推送时间
+
+        Args:
+            replay_id (int): 回放 ID
+        """
+        self.started[replay_id] = time.perf_counter()
+
+    def reset(self) -> None:
+        """清除所有记录"""
+        self.started.clear()
+        self.latencies.clear()
+        self.last_completed = 0.0
+
+    def _post_event(self, event: Any, upper_event: Any = None) -> "asyncio.Task[Any]":
+        task = Broadcast.postEvent(self.broadcast, event, upper_event)
+        replay_id = getattr(event, REPLAY_ID, None)
+        if replay_id in self.started:
+            task.add_done_callback(functools.partial(self._finish, replay_id))
+        return task
+
+    def _finish(self, replay_id: int, _: Any) -> None:
+        self.last_completed = time.perf_counter()
+        self.latencies.append(self.last_completed - self.started.pop(replay_id))
+
+    async def wait(self, timeout: float) -> bool:
+        """等待所有已推送的事件处理完毕
+
+        Args:
+            timeout (float): 超时时间, 单位为秒
+
+        Returns:
+            bool: 是否全部处理完毕
+        """
+        deadline = time.perf_counter() + timeout
+        while self.started and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        return not self.started
+
+    def report(self, sent: int, start: float, dropped: int = 0) -> ReplayReport:
+        """生成回放结果
+
+        Args:
+            sent (int): 推送的事件数
+            start (float): 第一次推送的 `time.perf_counter()`
+            dropped (int, optional): 服务器丢弃的事件数
+
+        Returns:
+            ReplayReport: 回放结果
+        """
+        end = self.last_completed if self.latencies else time.perf_counter()
+        return ReplayReport(
+            sent,
+            len(self.latencies),
+            max(end - start, 0.0),
+            _percentile(self.latencies, 50),
+            _percentile(self.latencies, 99),
+            max(self.latencies, default=0.0),
+            dropped,
+        )
+
+
+class EventReplayer:
+    """以指定速率将录制的事件经由 `MockMiraiServer` 回放给 Ariadne"""
+
+    def __init__(
+        self,
+        server: MockMiraiServer,
+        events: Iterable[Union[RecordedEvent, Dict[str, Any]]],
+        *,
+        account: Optional[int] = None,
+        rate: Optional[float] = None,
+        speed: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            server (MockMiraiServer): 推送事件的服务器
+            events (Iterable[Union[RecordedEvent, Dict[str, Any]]]): `load_events` 的结果或原始事件
+            account (Optional[int], optional): 目标账号, 为 None 时推送至所有账号
+            rate (Optional[float], optional): 固定的推送速率, 单位为事件每秒
+            speed (Optional[float], optional): 按录制时间回放时的倍速, 与 `rate` 均未指定时将尽快推送
+        """
+        self.server = server
+        self.events: List[RecordedEvent] = [e if isinstance(e, tuple) else (0.0, e) for e in events]
+        if not self.events:
+            raise ValueError("No event to replay")
+        self.account = account
+        self.rate = rate
+        self.speed = speed
+
+    def _schedule(self, count: int) -> Iterable[Tuple[float, Dict[str, Any]]]:
+        length = len(self.events)
+        first = self.events[0][0]
+        span = self.events[-1][0] - first
+        period = span + span / length
+        for index in range(count):
+            offset, event = self.events[index % length]
+            if self.rate:
+                yield index / self.rate, event
+            elif self.speed:
+                yield ((index // length) * period + offset - first) / self.speed, event
+            else:
+                yield 0.0, event
+
+    async def run(
+        self, probe: Optional[LatencyProbe] = None, *, count: Optional[int] = None, timeout: float = 30.0
+    ) -> ReplayReport:
+        """回放事件并等待处理完毕
+
+        Args:
+            probe (Optional[LatencyProbe], optional): 延迟探针, 为 None 时仅统计推送速率
+            count (Optional[int], optional): 推送的事件数, 超出录制数量时循环回放. 默认为录制数量.
+            timeout (float, optional): 推送结束后等待处理完毕的最长时间, 单位为秒. 默认为 30.
+
+        Returns:
+            ReplayReport: 回放结果
+        """
+        count = len(self.events) if count is None else count
+        if probe:
+            probe.reset()
+        dropped = self.server.dropped
+        start = time.perf_counter()
+        for replay_id, (delay, event) in enumerate(self._schedule(count)):
+            if (wait := start + delay - time.perf_counter()) > 0:
+                await asyncio.sleep(wait)
+            if probe:
+                probe.start(replay_id)
+            await self.server.push({**event, REPLAY_ID: replay_id}, self.account)
+        if probe is None:
+            elapsed = time.perf_counter() - start
+            return ReplayReport(count, None, elapsed, 0.0, 0.0, 0.0, self.server.dropped - dropped)
+        await probe.wait(timeout)
+        return probe.report(count, start, self.server.dropped - dropped)
@@ -0,0 +1,300 @@
+"""本地运行的 mirai-api-http 替身"""
+import asyncio
+import itertools
+import json
+import secrets
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from aiohttp import ClientSession, ClientWebSocketResponse, WSMsgType, web
+from loguru import logger
+
+Command = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+WebSocket = Union[web.WebSocketResponse, ClientWebSocketResponse]
+
+
+class MockMiraiServer:
+    """基于 aiohttp 的 mirai-api-http 替身, 用于在没有真实后端时进行测试与压测
+
+    同时支持 Ariadne 的四种连接方式:
+
+    - `HttpClientConnection`: 提供 `verify`, `bind` 与 `fetchMessage` 等 HTTP 接口.
+    - `WebsocketClientConnection`: 提供 `/all` Websocket 接口.
+    - `HttpServerConnection`: 通过 `add_http_target` 将事件以 POST 推送至 Ariadne.
+    - `WebsocketServerConnection`: 通过 `connect_websocket` 主动连接 Ariadne.
+
+    内置 `about`, `verify`, `bind`, `fetchMessage`, `sendGroupMessage`, `memberList`
+    与 `uploadImage` 命令, 可通过 `register` 添加或覆盖其他命令. 所有调用都会记录在 `calls` 中.
+    """
+
+    def __init__(
+        self,
+        verify_key: str = "ServiceVerifyKey",
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        version: str = "2.6.2",
+        members: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+        latency: float = 0.0,
+        queue_size: int = 4096,
+    ) -> None:
+        """
+        Args:
+            verify_key (str, optional): 验证密钥
+            host (str, optional): 监听地址. 默认为 127.0.0.1.
+            port (int, optional): 监听端口, 为 0 时自动分配. 默认为 0.
+            version (str, optional): `about` 返回的版本号. 默认为 2.6.2.
+            members (Optional[Dict[int, List[Dict[str, Any]]]], optional): 群号 -> 原始群成员数据列表
+            latency (float, optional): 为每次调用附加的延迟, 单位为秒. 默认为 0.
+            queue_size (int, optional): 每个 HTTP 会话最多暂存的未拉取事件数, 超出时丢弃最早的事件. \
+                默认为 4096.
+        """
+        self.verify_key = verify_key
+        self.host = host
+        self.port = port
+        self.version = version
+        self.members: Dict[int, List[Dict[str, Any]]] = members or {}
+        self.latency = latency
+        self.queue_size = queue_size
+        self.dropped: int = 0
+        """因 HTTP 会话的事件队列已满而丢弃的事件数"""
+        self.sessions: Dict[str, Optional[int]] = {}
+        self.queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.websockets: Dict[WebSocket, Optional[str]] = {}
+        self.http_targets: List[Tuple[str, int, Dict[str, str]]] = []
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.commands: Dict[str, Tuple[Command, bool]] = {}
+        self._message_id = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[ClientSession] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self.register("about", self._about, in_session=False)
+        self.register("verify", self._verify, in_session=False)
+        self.register("bind", self._bind, in_session=False)
+        self.register("fetchMessage", self._fetch_message)
+        self.register("sendGroupMessage", self._send_message)
+        self.register("sendFriendMessage", self._send_message)
+        self.register("sendTempMessage", self._send_message)
+        self.register("memberList", self._member_list)
+        self.register("uploadImage", self._upload_image)
+
+    @property
+    def url(self) -> str:
+        """供 `HttpClientConfig` 与 `WebsocketClientConfig` 使用的地址"""
+        return f"http://{self.host}:{self.port}"
+
+    def register(self, command: str, handler: Command, *, in_session: bool = True) -> None:
+        """注册命令处理器
+
+        Args:
+            command (str): 命令名, 如 `sendGroupMessage`
+            handler (Command): 接收调用参数并返回完整响应的异步函数
+            in_session (bool, optional): 是否需要有效的 sessionKey. 默认为 True.
+        """
+        self.commands[command] = (handler, in_session)
+
+    async def start(self) -> None:
+        """启动服务器"""
+        app = web.Application()
+        app.router.add_get("/all", self._handle_websocket)
+        app.router.add_route("*", "/{command:.+}", self._handle_http)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self._session = ClientSession()
+        logger.info(f"Mock mirai-api-http listening on {self.url}", style="dark_orange")
+
+    async def stop(self) -> None:
+        """关闭服务器与所有连接"""
+        for task in self._tasks:
+            task.cancel()
+        for ws in list(self.websockets):
+            await ws.close()
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
+        self._runner = self._session = None
+
+    async def __aenter__(self) -> "MockMiraiServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    def add_http_target(self, url: str, account: int, headers: Optional[Dict[str, str]] = None) -> None:
+        """添加 `HttpServerConnection` 推送目标
+
+        Args:
+            url (str): Ariadne HTTP 服务器的完整地址
+            account (int): 账号
+            headers (Optional[Dict[str, str]], optional): 额外的请求头
+        """
+        self.http_targets.append((url, account, headers or {}))
+
+    async def connect_websocket(
+        self,
+        url: str,
+        account: int,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """主动连接 `WebsocketServerConnection`
+
+        Args:
+            url (str): Ariadne Websocket 服务器的完整地址
+            account (int): 账号
+            headers (Optional[Dict[str, str]], optional): 额外的请求头
+            params (Optional[Dict[str, str]], optional): 额外的查询参数
+        """
+        assert self._session, "Server is not started"
+        ws = await self._session.ws_connect(
+            url, headers={"qq": str(account), **(headers or {})}, params=params
+        )
+        self.websockets[ws] = None
+        task = asyncio.create_task(self._serve_websocket(ws))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _create_session(self, account: Optional[int] = None, *, polling: bool = True) -> str:
+        session_key = secrets.token_urlsafe(12)
+        self.sessions[session_key] = account
+        if polling:
+            self.queues[session_key] = deque(maxlen=self.queue_size)
+        return session_key
+
+    async def push(self, event: Dict[str, Any], account: Optional[int] = None) -> None:
+        """向已连接的 Ariadne 推送事件
+
+        Args:
+            event (Dict[str, Any]): 原始事件数据
+            account (Optional[int], optional): 目标账号, 为 None 时推送至所有账号
+        """
+        for session_key, bound in self.sessions.items():
+            if bound is not None and (account is None or bound == account) and session_key in self.queues:
+                queue = self.queues[session_key]
+                if len(queue) == queue.maxlen:
+                    self.dropped += 1
+                queue.append(event)
+        if self.websockets:
+            text = json.dumps({"syncId": "-1", "data": event})
+            for ws, session_key in list(self.websockets.items()):
+                bound = self.sessions.get(session_key) if session_key else None
+                if bound is not None and (account is None or bound == account):
+                    await ws.send_str(text)
+        for url, target, headers in self.http_targets:
+            if account is None or target == account:
+                assert self._session, "Server is not started"
+                async with self._session.post(url, json=event, headers={"qq": str(target), **headers}):
+                    pass
+
+    async def call(
+        self, command: str, params: Dict[str, Any], session_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """执行一次调用, 返回完整响应
+
+        Args:
+            command (str): 命令名
+            params (Dict[str, Any]): 调用参数
+            session_key (Optional[str], optional): 调用所在的 sessionKey
+
+        Returns:
+            Dict[str, Any]: 响应数据
+        """
+        self.calls.append((command, params))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if command not in self.commands:
+            return {"code": 400, "msg": f"Unknown command: {command}"}
+        handler, in_session = self.commands[command]
+        if in_session:
+            if session_key is None or self.sessions.get(session_key) is None:
+                return {"code": 3, "msg": "Session失效或不存在"}
+            params = {**params, "sessionKey": session_key}
+        return await handler(params)
+
+    async def _handle_http(self, request: web.Request) -> web.Response:
+        command = request.match_info["command"]
+        if request.method == "GET":
+            params: Dict[str, Any] = dict(request.query)
+        elif request.content_type.startswith("multipart/"):
+            params = dict(await request.post())
+        else:
+            params = await request.json()
+        return web.json_response(await self.call(command, params, params.get("sessionKey")))
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if request.query.get("verifyKey") != self.verify_key:
+            await ws.send_json({"syncId": "", "data": {"code": 1, "msg": "错误的verify key"}})
+            await ws.close()
+            return ws
+        session_key = request.query.get("sessionKey")
+        if session_key is None:
+            session_key = self._create_session(int(request.query["qq"]), polling=False)
+        elif self.sessions.get(session_key) != int(request.query["qq"]):
+            await ws.send_json({"syncId": "", "data": {"code": 3, "msg": "Session失效或不存在"}})
+            await ws.close()
+            return ws
+        self.websockets[ws] = session_key
+        await ws.send_json({"syncId": "", "data": {"code": 0, "session": session_key}})
+        await self._serve_websocket(ws)
+        return ws
+
+    async def _serve_websocket(self, ws: WebSocket) -> None:
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                raw = json.loads(msg.data)
+                sync_id = raw.get("syncId", "")
+                params: Dict[str, Any] = raw.get("content") or {}
+                if raw.get("command") == "verify":
+                    self.calls.append(("verify", params))
+                    if params.get("verifyKey") != self.verify_key:
+                        data: Dict[str, Any] = {"code": 1, "msg": "错误的verify key"}
+                    else:
+                        session_key = self._create_session(int(params["qq"]), polling=False)
+                        self.websockets[ws] = session_key
+                        data = {"code": 0, "session": session_key}
+                else:
+                    data = await self.call(raw.get("command", ""), params, self.websockets.get(ws))
+                await ws.send_str(json.dumps({"syncId": sync_id, "data": data}))
+        finally:
+            self.websockets.pop(ws, None)
+
+    async def _about(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        return {"code": 0, "msg": "", "data": {"version": self.version}}
+
+    async def _verify(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("verifyKey") != self.verify_key:
+            return {"code": 1, "msg": "错误的verify key"}
+        return {"code": 0, "session": self._create_session()}
+
+    async def _bind(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("sessionKey") not in self.sessions:
+            return {"code": 3, "msg": "Session失效或不存在"}
+        self.sessions[params["sessionKey"]] = int(params["qq"])
+        return {"code": 0, "msg": "success"}
+
+    async def _fetch_message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        queue = self.queues.get(params["sessionKey"], deque())
+        count = int(params.get("count", 10))
+        return {"code": 0, "msg": "", "data": [queue.popleft() for _ in range(min(count, len(queue)))]}
+
+    async def _send_message(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        return {"code": 0, "msg": "success", "messageId": next(self._message_id)}
+
+    async def _member_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"code": 0, "msg": "", "data": self.members.get(int(params["target"]), [])}
+
+    async def _upload_image(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        image_id = f"{{{secrets.token_hex(16).upper()}}}.jpg"
+        return {"imageId": image_id, "url": f"{self.url}/image/{image_id}", "path": ""}
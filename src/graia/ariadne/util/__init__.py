@@ -37,6 +37,7 @@ from graia.broadcast.typing import T_Dispatcher
 from graia.broadcast.utilles import dispatcher_mixin_handler
 
 from ..typing import ExceptionHook, P, R, T, Wrapper
+from .observer import observers
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -192,11 +193,22 @@ def ariadne_api(func: Callable[P, R]) -> Callable[P, R]:
         Callable[P, R]: 包装后的函数
     """
 
+    if inspect.iscoroutinefunction(func):
+        # 协程函数被调用时不会执行函数体, 进入上下文没有效果
+        @functools.wraps(func)
+        def async_wrapper(*args: P.args, **kwargs: P.kwargs):
+            if observers.api_active:
+                observers.emit_api(func.__name__, args, kwargs)
+            return func(*args, **kwargs)
+
+        return async_wrapper  # type: ignore
+
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs):
         from ..context import enter_context
 
-        sys.audit("CallAriadneAPI", func.__name__, args, kwargs)
+        if observers.api_active:
+            observers.emit_api(func.__name__, args, kwargs)
 
         with enter_context(app=args[0]):  # type: ignore
             return func(*args, **kwargs)
@@ -334,7 +346,10 @@ def internal_cls(alt: Optional[Callable] = None) -> Callable[[_T_cls], _T_cls]:
 
         @functools.wraps(origin_init)
         def _wrapped_init_(self: object, *args, **kwargs):
-            frame = inspect.stack()[1].frame  # outer frame
+            # Only the caller's module is needed. inspect.stack() builds FrameInfo
+            # for the whole stack and reads source lines for each of them, which
+            # dominated the cost of loading deferred chains (Source, Quote).
+            frame = sys._getframe(1)
             module_name: str = frame.f_globals["__name__"]
             if not module_name.startswith(SAFE_MODULES):
                 raise NameError(
@@ -6,12 +6,19 @@ import asyncio
 import functools
 import importlib
 import multiprocessing
+import os
+import sys
+import time
 from asyncio.events import AbstractEventLoop
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from typing import Any, Awaitable, Callable, ClassVar, Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Awaitable, Callable, ClassVar, Deque, Dict, Iterable, List, Optional, Tuple, Union
 
 from ..typing import P, R
 
+Buffer = Union[bytes, bytearray, memoryview]
+
 
 def IS_MAIN_PROCESS() -> bool:
     """返回是否为主进程
@@ -30,11 +37,322 @@ def _reg_sigint():
     signal.signal(signal.SIGINT, lambda *_, **__: sys.exit())
 
 
+class SharedBuffer:
+    """共享内存段的句柄, 跨进程传递时只序列化段名与长度"""
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+
+    @classmethod
+    def create(cls, data: Buffer) -> Tuple["SharedBuffer", SharedMemory]:
+        """将数据复制到新的共享内存段中
+
+        Args:
+            data (Buffer): 数据
+
+        Returns:
+            Tuple[SharedBuffer, SharedMemory]: 句柄与共享内存段, 段需要由调用方关闭
+        """
+        with memoryview(data) as view, view.cast("B") as raw:
+            shm = SharedMemory(create=True, size=max(raw.nbytes, 1))
+            shm.buf[: raw.nbytes] = raw
+            return cls(shm.name, raw.nbytes), shm
+
+    def read(self) -> bytes:
+        """读取共享内存段中的数据
+
+        Returns:
+            bytes: 数据的副本
+        """
+        shm = SharedMemory(self.name)
+        try:
+            with shm.buf[: self.size] as view:
+                return bytes(view)
+        finally:
+            shm.close()
+
+    def unlink(self) -> None:
+        """释放共享内存段"""
+        shm = SharedMemory(self.name)
+        shm.close()
+        shm.unlink()
+
+    def take(self) -> bytes:
+        """读取数据后释放共享内存段
+
+        Returns:
+            bytes: 数据的副本
+        """
+        try:
+            return self.read()
+        finally:
+            self.unlink()
+
+    def __reduce__(self):
+        return SharedBuffer, (self.name, self.size)
+
+    def __repr__(self) -> str:
+        return f"<SharedBuffer {self.name} size={self.size}>"
+
+
+def _share(value: Any, threshold: int, segments: List[SharedMemory]) -> Any:
+    if isinstance(value, (bytes, bytearray, memoryview)) and memoryview(value).nbytes >= threshold:
+        handle, shm = SharedBuffer.create(value)
+        segments.append(shm)
+        return handle
+    return value
+
+
+def _release(segments: List[SharedMemory], _: Any) -> None:
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+def _discard(fut: "asyncio.Future[Any]") -> None:
+    if not fut.cancelled() and fut.exception() is None and isinstance(fut.result(), SharedBuffer):
+        fut.result().unlink()
+
+
+def _run_shared(runner: Callable[..., Any], head: tuple, args: tuple, kwargs: dict, threshold: int) -> Any:
+    """在子进程中读取共享内存中的参数, 调用函数, 并将较大的返回值放入共享内存"""
+    args = tuple(arg.read() if isinstance(arg, SharedBuffer) else arg for arg in args)
+    kwargs = {k: v.read() if isinstance(v, SharedBuffer) else v for k, v in kwargs.items()}
+    result = runner(*head, args, kwargs)
+    # on Windows a segment is destroyed once its last handle is closed, so it can't outlive this call
+    if sys.platform != "win32" and isinstance(result, (bytes, bytearray, memoryview)):
+        if memoryview(result).nbytes >= threshold:
+            handle, shm = SharedBuffer.create(result)
+            shm.close()
+            return handle
+    return result
+
+
+def _func_key(func: Callable) -> Tuple[str, str]:
+    mod = func.__module__
+    return "__main__" if mod == "__mp_main__" else mod, func.__qualname__
+
+
+def _timed(fn: Callable[..., R], *args: Any) -> Tuple[float, float, R]:
+    """在工作者中调用函数, 返回开始的时间戳, 运行时长与返回值"""
+    start, counter = time.time(), time.perf_counter()
+    result = fn(*args)
+    return start, time.perf_counter() - counter, result
+
+
+def _ready() -> None:
+    """预热执行池时提交的空任务"""
+
+
+def _run_chunk(func: Callable[..., R], chunk: List[tuple]) -> List[R]:
+    return [ParallelExecutor.run_func_static(func, args, {}) for args in chunk]
+
+
+class PoolMetrics:
+    """执行池的指标, 时间单位均为秒"""
+
+    __slots__ = ("submitted", "completed", "failed", "pending", "queue_wait", "max_queue_wait", "run_time")
+
+    submitted: int
+    """已提交的任务数"""
+    completed: int
+    """已结束的任务数, 包括失败的任务"""
+    failed: int
+    """抛出异常或被取消的任务数"""
+    pending: int
+    """正在排队或运行的任务数"""
+    queue_wait: float
+    """成功的任务从提交到开始运行的累计等待时间"""
+    max_queue_wait: float
+    """单个任务的最长等待时间"""
+    run_time: float
+    """成功的任务的累计运行时间"""
+
+    def __init__(self) -> None:
+        self.submitted = self.completed = self.failed = self.pending = 0
+        self.queue_wait = self.max_queue_wait = self.run_time = 0.0
+
+    @property
+    def avg_queue_wait(self) -> float:
+        """成功的任务的平均等待时间"""
+        succeeded = self.completed - self.failed
+        return self.queue_wait / succeeded if succeeded else 0.0
+
+    @property
+    def avg_run_time(self) -> float:
+        """成功的任务的平均运行时间"""
+        succeeded = self.completed - self.failed
+        return self.run_time / succeeded if succeeded else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<PoolMetrics submitted={self.submitted} pending={self.pending} failed={self.failed} "
+            f"avg_queue_wait={self.avg_queue_wait:.4f} avg_run_time={self.avg_run_time:.4f}>"
+        )
+
+
+class WorkerPool:
+    """记录排队与运行时间的线程池或进程池, 工作者数随排队深度调整
+
+    底层执行池以 `max_workers` 创建, 同时运行的任务数受 `workers` 限制, 多出的任务在事件循环中排队.
+    `workers` 从 `min_workers` (至少为 1) 开始, 提交任务时若已没有空闲的名额则翻倍, 直到 `max_workers`;
+    设置了 `idle_timeout` 时, 执行池空闲这么久后收缩回 `min_workers`, 并以新的执行池释放空闲的工作者.
+    """
+
+    executor: Executor
+    metrics: PoolMetrics
+
+    def __init__(
+        self,
+        process: bool,
+        max_workers: Optional[int] = None,
+        min_workers: int = 0,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            process (bool): 是否为进程池
+            max_workers (int, optional): 最大工作者数, 默认值请参阅 `concurrent.futures`.
+            min_workers (int, optional): 初始, 预热与收缩后的工作者数. Defaults to 0.
+            idle_timeout (float, optional): 空闲多久后收缩, 单位为秒. Defaults to None, 即不收缩.
+        """
+        cpu_count = os.cpu_count() or 1
+        self.process = process
+        self.max_workers: int = max_workers or (cpu_count if process else min(32, cpu_count + 4))
+        self.min_workers: int = min(min_workers, self.max_workers)
+        self.idle_timeout = idle_timeout
+        self.metrics = PoolMetrics()
+        self.workers: int = max(self.min_workers, 1)
+        """同时运行的任务数上限"""
+        self.executor = self._create()
+        self._running: int = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+
+    def _create(self) -> Executor:
+        if self.process:
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_reg_sigint)  # see issue #50
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    @property
+    def queue_depth(self) -> int:
+        """等待空闲名额的任务数"""
+        return len(self._waiters)
+
+    def resize(self, workers: int) -> None:
+        """调整同时运行的任务数上限, 超出新上限的任务会继续运行至完成
+
+        Args:
+            workers (int): 新的上限, 会被限制在 1 与 `max_workers` 之间
+        """
+        self.workers = max(1, min(workers, self.max_workers))
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._running < self.workers:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._running += 1
+                waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        if self._running >= self.workers and self.workers < self.max_workers:
+            self.resize(self.workers * 2)
+        if self._running < self.workers and not self._waiters:
+            self._running += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.cancelled():
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            else:  # woken up but cancelled before running, hand the slot on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._wake()
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        """在执行池中调用 `fn(*args)`, 并记录指标
+
+        Args:
+            fn (Callable[..., R]): 要调用的函数, 在进程池中运行时需要可被序列化
+            *args (Any): 位置参数
+
+        Returns:
+            R: 函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        metrics = self.metrics
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        metrics.submitted += 1
+        metrics.pending += 1
+        submitted = time.time()
+        try:
+            await self._acquire()
+            try:
+                start, elapsed, result = await loop.run_in_executor(self.executor, _timed, fn, *args)
+            finally:
+                self._release()
+        except BaseException:
+            metrics.failed += 1
+            raise
+        finally:
+            metrics.pending -= 1
+            metrics.completed += 1
+            if not metrics.pending and self.idle_timeout is not None:
+                self._idle_handle = loop.call_later(self.idle_timeout, self.shrink)
+        wait = max(0.0, start - submitted)
+        metrics.queue_wait += wait
+        metrics.max_queue_wait = max(metrics.max_queue_wait, wait)
+        metrics.run_time += elapsed
+        return result
+
+    async def warm_up(self) -> None:
+        """预先创建 `min_workers` 个工作者"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _ready) for _ in range(self.min_workers)))
+
+    def shrink(self) -> None:
+        """空闲时收缩回 `min_workers` 个工作者"""
+        self._idle_handle = None
+        if self.metrics.pending or self.workers <= max(self.min_workers, 1):
+            return
+        self.resize(self.min_workers)
+        old, self.executor = self.executor, self._create()
+        old.shutdown(wait=False)
+        if self.min_workers:
+            asyncio.ensure_future(self.warm_up())
+
+    def close(self) -> None:
+        """关闭执行池"""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self.executor.shutdown()
+
+    def __repr__(self) -> str:
+        kind = "process" if self.process else "thread"
+        return f"<WorkerPool {kind} workers={self.workers}/{self.max_workers} {self.metrics!r}>"
+
+
 class ParallelExecutor:
     """并行执行器."""
 
-    thread_exec: ThreadPoolExecutor
-    proc_exec: ProcessPoolExecutor
+    thread_pool: WorkerPool
+    process_pool: WorkerPool
+    dedicated: Dict[Tuple[str, str], WorkerPool]
+    """(模块名, 函数名) -> 函数独占的执行池"""
     loop_ref_dict: ClassVar[Dict[AbstractEventLoop, "ParallelExecutor"]] = {}
     func_mapping: ClassVar[Dict[Tuple[str, str], Callable]] = {}
 
@@ -43,6 +361,11 @@ class ParallelExecutor:
         loop: Optional[AbstractEventLoop] = None,
         max_thread: Optional[int] = None,
         max_process: Optional[int] = None,
+        shared_threshold: Optional[int] = None,
+        *,
+        min_thread: int = 0,
+        min_process: int = 0,
+        idle_timeout: Optional[float] = None,
     ):
         """初始化并行执行器.
 
@@ -50,15 +373,49 @@ class ParallelExecutor:
             loop (AbstractEventLoop, optional): 要绑定的事件循环, 会自动获取当前事件循环. Defaults to None.
             max_thread (int, optional): 最大线程数. Defaults to None.
             max_process (int, optional): 最大进程数. Defaults to None.
+            shared_threshold (int, optional): 在进程中运行时, 不小于该字节数的 `bytes`, `bytearray` \
+                与 `memoryview` 参数与返回值通过共享内存传递, 而不是序列化. Defaults to None, 即不启用.
+            min_thread (int, optional): 初始, 预热与收缩后的线程数. Defaults to 0.
+            min_process (int, optional): 初始, 预热与收缩后的进程数. Defaults to 0.
+            idle_timeout (float, optional): 执行池空闲多久后收缩, 单位为秒. Defaults to None, 即不收缩.
+
+        `max_thread` 与 `max_process` 参数默认值请参阅 `concurrent.futures`,
+        工作者数随排队深度在最小值与最大值之间调整, 详见 `WorkerPool`.
 
-        `max_thread` 与 `max_process` 参数默认值请参阅 `concurrent.futures`.
+        通过共享内存传递时, 只检查顶层的参数与返回值, 函数收到与返回的均为 `bytes`; \
+        共享内存段在调用结束后自动释放.
+
+        绑定的事件循环上的执行器会在 `ApplicationLaunch` 时预热.
         """
-        self.thread_exec = ThreadPoolExecutor(max_workers=max_thread)
-        self.proc_exec = ProcessPoolExecutor(
-            max_workers=max_process, initializer=_reg_sigint
-        )  # see issue #50
+        self.shared_threshold = shared_threshold
+        if shared_threshold is not None and sys.platform != "win32":
+            from multiprocessing import resource_tracker
+
+            # forked workers have to share the tracker, or segments passed between processes are tracked twice
+            resource_tracker.ensure_running()
+        self.idle_timeout = idle_timeout
+        self.thread_pool = WorkerPool(False, max_thread, min_thread, idle_timeout)
+        self.process_pool = WorkerPool(True, max_process, min_process, idle_timeout)
+        self.dedicated = {}
         self.bind_loop(loop or asyncio.get_running_loop())
 
+    @property
+    def thread_exec(self) -> ThreadPoolExecutor:
+        """底层的线程池"""
+        return self.thread_pool.executor  # type: ignore
+
+    @property
+    def proc_exec(self) -> ProcessPoolExecutor:
+        """底层的进程池"""
+        return self.process_pool.executor  # type: ignore
+
+    @property
+    def pools(self) -> Dict[str, WorkerPool]:
+        """所有执行池, 独占的执行池以 `模块名.函数名` 为键"""
+        pools = {"thread": self.thread_pool, "process": self.process_pool}
+        pools.update((f"{mod}.{name}", pool) for (mod, name), pool in self.dedicated.items())
+        return pools
+
     @classmethod
     def get(cls, loop: Optional[AbstractEventLoop] = None) -> "ParallelExecutor":
         """获取 ParallelExecutor 实例
@@ -90,8 +447,45 @@ class ParallelExecutor:
 
     def close(self):
         """关闭实例的所有底层 Executor."""
-        self.thread_exec.shutdown()
-        self.proc_exec.shutdown()
+        for pool in self.pools.values():
+            pool.close()
+
+    async def warm_up(self) -> None:
+        """预热所有执行池"""
+        await asyncio.gather(*(pool.warm_up() for pool in self.pools.values()))
+
+    def dedicate(
+        self, func: Callable, max_workers: int = 1, *, process: bool = True, min_workers: int = 0
+    ) -> WorkerPool:
+        """为函数分配独占的执行池, 使其不与其他函数争抢工作者
+
+        Args:
+            func (Callable): 函数, 也可以是 `io_bound` / `cpu_bound` 包装后的函数
+            max_workers (int, optional): 最大工作者数. Defaults to 1.
+            process (bool, optional): 是否为进程池, 需与函数的运行方式一致. Defaults to True.
+            min_workers (int, optional): 初始, 预热与收缩后的工作者数. Defaults to 0.
+
+        Returns:
+            WorkerPool: 分配的执行池
+        """
+        pool = WorkerPool(process, max_workers, min_workers, self.idle_timeout)
+        self.dedicated[_func_key(func)] = pool
+        return pool
+
+    def pool_for(self, func: Callable, process: bool) -> WorkerPool:
+        """获取运行函数的执行池
+
+        Args:
+            func (Callable): 函数
+            process (bool): 是否在进程中运行
+
+        Returns:
+            WorkerPool: 函数独占的执行池, 没有时为共用的执行池
+        """
+        pool = self.dedicated.get(_func_key(func))
+        if pool is not None and pool.process == process:
+            return pool
+        return self.process_pool if process else self.thread_pool
 
     @classmethod
     def run_func(cls, name: str, module: str, args: tuple, kwargs: dict) -> Any:
@@ -106,8 +500,11 @@ class ParallelExecutor:
         Returns:
             Any: 底层函数的返回值
         """
-        importlib.import_module(module)
-        return cls.func_mapping[module, name](*args, **kwargs)
+        func = cls.func_mapping.get((module, name))
+        if func is None:
+            importlib.import_module(module)
+            func = cls.func_mapping[module, name]
+        return func(*args, **kwargs)
 
     @classmethod
     def run_func_static(cls, func: Callable[..., R], args: tuple, kwargs: dict) -> R:
@@ -136,13 +533,7 @@ class ParallelExecutor:
         Returns:
             Future[R]: 返回结果. 需要被异步等待.
         """
-        return asyncio.get_running_loop().run_in_executor(  # type: ignore
-            self.thread_exec,
-            ParallelExecutor.run_func_static,
-            func,
-            args,
-            kwargs,
-        )
+        return self.pool_for(func, False).run(ParallelExecutor.run_func_static, func, args, kwargs)
 
     def to_process(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> Awaitable[R]:
         """在进程中异步运行 func 函数. 需要先注册过才行.
@@ -155,13 +546,95 @@ class ParallelExecutor:
         Returns:
             Future[R]: 返回结果. 需要被异步等待.
         """
-        return asyncio.get_running_loop().run_in_executor(  # type: ignore
-            self.proc_exec,
-            ParallelExecutor.run_func_static,
-            func,
-            args,
-            kwargs,
+        return self.submit(ParallelExecutor.run_func_static, (func,), args, kwargs, self.pool_for(func, True))
+
+    def map(
+        self, func: Callable[..., R], *iterables: Iterable[Any], chunksize: int = 1, process: bool = True
+    ) -> Awaitable[List[R]]:
+        """对各个可迭代对象的元素批量调用 func 函数, 与内置的 `map` 相同, 元素按 `chunksize` 分批提交
+
+        Args:
+            func (Callable[..., R]): 要调用的函数.
+            *iterables (Iterable[Any]): 参数的可迭代对象.
+            chunksize (int, optional): 每批的调用数. Defaults to 1.
+            process (bool, optional): 是否在进程中运行. Defaults to True.
+
+        Returns:
+            Future[List[R]]: 按顺序排列的返回值. 需要被异步等待.
+        """
+        return self.starmap(func, zip(*iterables), chunksize=chunksize, process=process)
+
+    async def starmap(
+        self, func: Callable[..., R], iterable: Iterable[tuple], *, chunksize: int = 1, process: bool = True
+    ) -> List[R]:
+        """以可迭代对象的各个元素为参数批量调用 func 函数, 与 `itertools.starmap` 相同
+
+        Args:
+            func (Callable[..., R]): 要调用的函数.
+            iterable (Iterable[tuple]): 参数元组的可迭代对象.
+            chunksize (int, optional): 每批的调用数. Defaults to 1.
+            process (bool, optional): 是否在进程中运行. Defaults to True.
+
+        Returns:
+            List[R]: 按顺序排列的返回值.
+        """
+        items = list(iterable)
+        pool = self.pool_for(func, process)
+        chunksize = max(1, chunksize)
+        results = await asyncio.gather(
+            *(pool.run(_run_chunk, func, items[i : i + chunksize]) for i in range(0, len(items), chunksize))
         )
+        return [result for chunk in results for result in chunk]
+
+    def submit(
+        self,
+        runner: Callable[..., R],
+        head: tuple,
+        args: tuple,
+        kwargs: dict,
+        pool: Optional[WorkerPool] = None,
+    ) -> Awaitable[R]:
+        """在进程中调用 `runner(*head, args, kwargs)`, 启用时通过共享内存传递较大的缓冲区
+
+        Args:
+            runner (Callable[..., R]): 在子进程中调用的函数
+            head (tuple): 位于 args 与 kwargs 之前的参数
+            args (tuple): 位置参数
+            kwargs (dict): 关键字参数
+            pool (WorkerPool, optional): 使用的执行池, 默认为共用的进程池
+
+        Returns:
+            Future[R]: 返回结果. 需要被异步等待.
+        """
+        pool = pool or self.process_pool
+        if self.shared_threshold is None:
+            return pool.run(runner, *head, args, kwargs)
+        return self._submit_shared(pool, runner, head, args, kwargs, self.shared_threshold)
+
+    async def _submit_shared(
+        self,
+        pool: WorkerPool,
+        runner: Callable[..., Any],
+        head: tuple,
+        args: tuple,
+        kwargs: dict,
+        threshold: int,
+    ) -> Any:
+        segments: List[SharedMemory] = []
+        try:
+            args = tuple(_share(arg, threshold, segments) for arg in args)
+            kwargs = {k: _share(v, threshold, segments) for k, v in kwargs.items()}
+            fut = asyncio.ensure_future(pool.run(_run_shared, runner, head, args, kwargs, threshold))
+        except BaseException:
+            _release(segments, None)
+            raise
+        fut.add_done_callback(functools.partial(_release, segments))
+        try:
+            result = await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            fut.add_done_callback(_discard)
+            raise
+        return result.take() if isinstance(result, SharedBuffer) else result
 
 
 def io_bound(func: Callable[P, R]) -> Callable[P, Awaitable[R]]:
@@ -177,10 +650,8 @@ def io_bound(func: Callable[P, R]) -> Callable[P, Awaitable[R]]:
 
     @functools.wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-        loop = asyncio.get_running_loop()
-        executor = ParallelExecutor.get(loop)
-        return await loop.run_in_executor(
-            executor.thread_exec,
+        executor = ParallelExecutor.get(asyncio.get_running_loop())
+        return await executor.pool_for(func, False).run(
             ParallelExecutor.run_func,
             func.__qualname__,
             func.__module__,
@@ -206,15 +677,13 @@ def cpu_bound(func: Callable[P, R]) -> Callable[P, Awaitable[R]]:
     @functools.wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
         mod = func.__module__
-        loop = asyncio.get_running_loop()
-        executor = ParallelExecutor.get(loop)
-        return await loop.run_in_executor(
-            executor.proc_exec,
+        executor = ParallelExecutor.get(asyncio.get_running_loop())
+        return await executor.submit(
             ParallelExecutor.run_func,
-            func.__qualname__,
-            "__main__" if mod == "__mp_main__" else mod,
+            (func.__qualname__, "__main__" if mod == "__mp_main__" else mod),
             args,
             kwargs,
+            executor.pool_for(func, True),
         )
 
     return wrapper
@@ -0,0 +1,147 @@
+"""批量调用 API 的辅助工具: 令牌桶限速与结构化的批量结果"""
+import asyncio
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+class TokenBucket:
+    """令牌桶限速器, 可在多次批量调用间共享"""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Args:
+            rate (float): 每秒产生的令牌数, 即长期的调用速率上限
+            burst (int, optional): 令牌桶容量, 即允许的突发调用数. 默认为 1.
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens: float = self.burst
+        self.updated: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """取得一个令牌, 令牌不足时等待"""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+            self.tokens = 0
+            self.updated = now + wait
+
+    def __repr__(self) -> str:
+        return f"<TokenBucket rate={self.rate}/s burst={self.burst}>"
+
+
+class BulkResult(Generic[K, R]):
+    """批量调用的结果, 按目标记录返回值或异常, 迭代顺序与提交顺序一致"""
+
+    targets: List[K]
+    """所有目标, 按提交顺序排列"""
+
+    results: Dict[K, R]
+    """调用成功的目标与返回值"""
+
+    errors: Dict[K, Exception]
+    """调用失败的目标与异常"""
+
+    def __init__(self, targets: Iterable[K] = ()) -> None:
+        self.targets = list(targets)
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def ok(self) -> bool:
+        """是否全部成功"""
+        return not self.errors
+
+    @property
+    def succeeded(self) -> List[K]:
+        """调用成功的目标, 按提交顺序排列"""
+        return [target for target in self.targets if target in self.results]
+
+    @property
+    def failed(self) -> List[K]:
+        """调用失败的目标, 按提交顺序排列"""
+        return [target for target in self.targets if target in self.errors]
+
+    def raise_for_errors(self) -> None:
+        """存在失败的目标时, 抛出第一个失败目标的异常"""
+        for target in self.targets:
+            if target in self.errors:
+                raise self.errors[target]
+
+    def __getitem__(self, target: K) -> R:
+        if target in self.errors:
+            raise self.errors[target]
+        return self.results[target]
+
+    def __iter__(self) -> Iterator[Tuple[K, Union[R, Exception]]]:
+        for target in self.targets:
+            yield target, self.errors[target] if target in self.errors else self.results[target]
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __repr__(self) -> str:
+        return f"<BulkResult succeeded={len(self.results)} failed={len(self.errors)}>"
+
+
+async def run_bulk(
+    func: Callable[[T], Awaitable[R]],
+    targets: Iterable[T],
+    key: Callable[[T], K],
+    *,
+    concurrency: int = 8,
+    rate: Union[float, TokenBucket, None] = None,
+) -> BulkResult[K, R]:
+    """以有界的并发对每个目标调用 `func`, 单个目标的异常不会中断其他目标
+
+    Args:
+        func (Callable[[T], Awaitable[R]]): 对单个目标的调用
+        targets (Iterable[T]): 目标
+        key (Callable[[T], K]): 生成结果中目标的键, 如 `int`
+        concurrency (int, optional): 同时进行的调用数上限, 为 0 时不限制. 默认为 8.
+        rate (Union[float, TokenBucket, None], optional): 每秒调用数上限或共享的 `TokenBucket`, \
+            为 None 时不限速. 默认为 None.
+
+    Returns:
+        BulkResult[K, R]: 批量调用的结果
+    """
+    items: List[Tuple[K, T]] = list({key(target): target for target in targets}.items())
+    result: BulkResult[K, R] = BulkResult(k for k, _ in items)
+    limiter = TokenBucket(rate, max(concurrency, 1)) if isinstance(rate, (int, float)) else rate
+    pending = iter(items)
+
+    async def worker() -> None:
+        for k, target in pending:
+            if limiter:
+                await limiter.acquire()
+            try:
+                result.results[k] = await func(target)
+            except Exception as e:
+                result.errors[k] = e
+
+    workers = min(concurrency, len(items)) if concurrency > 0 else len(items)
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return result
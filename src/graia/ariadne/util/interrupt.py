@@ -1,13 +1,29 @@
 """Broadcast Interrupt 相关的工具"""
 import asyncio
-from typing import Awaitable, Callable, Generic, List, Optional, Type, TypeVar, cast
+import math
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 from typing_extensions import overload
 
 from creart import it
 
+from graia.broadcast import Broadcast
 from graia.broadcast.entities.decorator import Decorator
 from graia.broadcast.entities.event import Dispatchable
-from graia.broadcast.exceptions import ExecutionStop
+from graia.broadcast.entities.listener import Listener
+from graia.broadcast.exceptions import ExecutionStop, PropagationCancelled
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
 from graia.broadcast.interrupt import InterruptControl, Waiter
 from graia.broadcast.typing import T_Dispatcher
@@ -155,3 +171,240 @@ class AnnotationWaiter(_ExtendedWaiter[T, T_E]):
         if self.extra_validator and not self.extra_validator(event):
             raise ExecutionStop
         return await dii.lookup_param("__AnnotationWaiter_annotation__", self.annotation, self.decorator)
+
+
+class TimingWheel(Generic[T]):
+    """哈希时间轮, 以固定精度批量取出到期的条目, 添加条目的开销为 O(1)
+
+    条目不会早于其到期时间被取出, 最多晚一个精度.
+    """
+
+    def __init__(
+        self, resolution: float = 0.1, size: int = 512, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Args:
+            resolution (float, optional): 精度, 即每格的时长, 单位为秒. 默认为 0.1.
+            size (int, optional): 格数, 超过一圈的条目会记录剩余圈数. 默认为 512.
+            clock (Callable[[], float], optional): 时钟. 默认为 `time.monotonic`.
+        """
+        self.resolution = resolution
+        self.clock = clock
+        self.slots: List[List[Tuple[int, T]]] = [[] for _ in range(size)]
+        self.cursor: int = 0
+        self.time: float = clock()
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, delay: float, item: T) -> None:
+        """添加条目
+
+        Args:
+            delay (float): 距离到期的时长, 单位为秒
+            item (T): 条目
+        """
+        if not self._count:
+            self.time = self.clock()
+        size = len(self.slots)
+        ticks = max(1, math.ceil((self.clock() + delay - self.time) / self.resolution))
+        self.slots[(self.cursor + ticks) % size].append(((ticks - 1) // size, item))
+        self._count += 1
+
+    def advance(self) -> List[T]:
+        """将时间轮推进到当前时间
+
+        Returns:
+            List[T]: 到期的条目
+        """
+        now = self.clock()
+        expired: List[T] = []
+        while self._count and self.time + self.resolution <= now:
+            self.time += self.resolution
+            self.cursor = (self.cursor + 1) % len(self.slots)
+            slot = self.slots[self.cursor]
+            if not slot:
+                continue
+            remaining = [(rounds - 1, item) for rounds, item in slot if rounds]
+            expired.extend(item for rounds, item in slot if not rounds)
+            self._count -= len(slot) - len(remaining)
+            self.slots[self.cursor] = remaining
+        return expired
+
+
+def session_key(event: Dispatchable) -> Hashable:
+    """默认的等待键: 带有发送者的事件为 (群号, 发送者 QQ 号), 好友等与群无关的事件群号为 None
+
+    Args:
+        event (Dispatchable): 事件
+
+    Returns:
+        Hashable: 等待键
+    """
+    sender = getattr(event, "sender", None)
+    group = getattr(sender, "group", None)
+    return getattr(group, "id", None), getattr(sender, "id", None)
+
+
+_Pending = Tuple["asyncio.Future[T_E]", Optional[Callable[[T_E], bool]]]
+
+_TIMEOUT = object()
+
+
+class KeyedWaiter(Generic[T_E]):
+    """按键路由事件的等待器
+
+    所有等待共用一个监听器, 事件只会交给键相同的等待, 超时的等待由时间轮批量处理.
+    适合大量同时进行的会话, 如 "回复 是/否 确认" 这样的场景.
+
+    Example:
+        ```py
+        confirm = KeyedWaiter([GroupMessage])
+
+        @listen(GroupMessage)
+        async def handler(group: Group, member: Member):
+            event = await confirm.wait((group.id, member.id), timeout=30)
+        ```
+    """
+
+    pending: Dict[Hashable, List[_Pending]]
+    """等待键 -> 该键上的等待"""
+
+    def __init__(
+        self,
+        events: List[Type[T_E]],
+        key: Callable[[T_E], Hashable] = session_key,
+        *,
+        priority: int = 15,
+        block_propagation: bool = False,
+        resolution: float = 0.1,
+    ) -> None:
+        """
+        Args:
+            events (List[Type[T_E]]): 事件类型
+            key (Callable[[T_E], Hashable], optional): 从事件中提取等待键的函数. 默认为 `session_key`.
+            priority (int, optional): 监听器的优先级, 越小越靠前
+            block_propagation (bool, optional): 事件被等待接收后是否阻止其往下传播
+            resolution (float, optional): 超时的精度, 单位为秒. 默认为 0.1.
+        """
+        self.events = events
+        self.key = key
+        self.priority = priority
+        self.block_propagation = block_propagation
+        self.pending = {}
+        self.wheel: TimingWheel[_Pending] = TimingWheel(resolution)
+        self.broadcast: Optional[Broadcast] = None
+        self.listener: Optional[Listener] = None
+        self._ticker: Optional[asyncio.Task] = None
+
+    def install(self, broadcast: Optional[Broadcast] = None) -> None:
+        """注册监听器, 首次等待时会自动调用
+
+        Args:
+            broadcast (Broadcast, optional): 事件系统, 默认为 `it(Broadcast)`
+        """
+        if self.listener is not None:
+            return
+        self.broadcast = broadcast or it(Broadcast)
+
+        async def dispatch(event: Dispatchable) -> None:
+            await self.dispatch(event)
+
+        self.listener = Listener(
+            callable=dispatch,
+            namespace=self.broadcast.getDefaultNamespace(),
+            inline_dispatchers=[],
+            priority=self.priority,
+            listening_events=list(self.events),
+            decorators=[],
+        )
+        self.broadcast.listeners.append(self.listener)
+
+    def uninstall(self) -> None:
+        """移除监听器, 不影响正在进行的等待"""
+        if self.broadcast is not None and self.listener in self.broadcast.listeners:
+            self.broadcast.removeListener(self.listener)
+        self.listener = None
+
+    async def dispatch(self, event: Dispatchable) -> None:
+        """将事件交给键相同的等待
+
+        Args:
+            event (Dispatchable): 事件
+        """
+        waiters = self.pending.get(self.key(cast(T_E, event)))
+        if not waiters:
+            return
+        for fut, validator in list(waiters):
+            if fut.done() or (validator is not None and not validator(cast(T_E, event))):
+                continue
+            fut.set_result(cast(T_E, event))
+            if self.block_propagation:
+                raise PropagationCancelled
+
+    async def _tick(self) -> None:
+        while self.wheel:
+            await asyncio.sleep(self.wheel.resolution)
+            for fut, _ in self.wheel.advance():
+                if not fut.done():
+                    fut.set_result(_TIMEOUT)  # type: ignore
+        self._ticker = None
+
+    @overload
+    async def wait(
+        self,
+        key: Hashable,
+        timeout: float,
+        default: T,
+        validator: Optional[Callable[[T_E], bool]] = None,
+    ) -> "T_E | T":
+        ...
+
+    @overload
+    async def wait(
+        self,
+        key: Hashable,
+        timeout: Optional[float] = None,
+        default: None = None,
+        validator: Optional[Callable[[T_E], bool]] = None,
+    ) -> Optional[T_E]:
+        ...
+
+    async def wait(
+        self,
+        key: Hashable,
+        timeout: Optional[float] = None,
+        default: Optional[T] = None,
+        validator: Optional[Callable[[T_E], bool]] = None,
+    ):
+        """等待键相同的事件, 如果超时则返回默认值
+
+        Args:
+            key (Hashable): 等待键, 与 `key` 函数从事件中提取的值比较
+            timeout (float, optional): 超时时间, 单位为秒
+            default (T, optional): 默认值
+            validator (Callable[[T_E], bool], optional): 额外的验证器, 只对键相同的事件调用
+
+        Returns:
+            T_E: 接收到的事件
+        """
+        self.install()
+        entry: _Pending = (asyncio.get_running_loop().create_future(), validator)
+        waiters = self.pending.setdefault(key, [])
+        waiters.append(entry)
+        if timeout:
+            self.wheel.add(timeout, entry)
+            if self._ticker is None:
+                self._ticker = asyncio.create_task(self._tick())
+        try:
+            result = await entry[0]
+        finally:
+            waiters.remove(entry)
+            if not waiters and self.pending.get(key) is waiters:
+                del self.pending[key]
+            if not self.pending and self._ticker is not None:  # only stale entries are left in the wheel
+                self._ticker.cancel()
+                self._ticker = None
+                self.wheel = TimingWheel(self.wheel.resolution)
+        return default if result is _TIMEOUT else result
@@ -0,0 +1,153 @@
+"""API 调用与事件的观察者
+
+`ariadne_api` 与 `Ariadne` 的事件钩子会通知 `observers` 中注册的观察者.
+没有观察者且未启用 `sys.audit` 时, 通知只是一次属性判断.
+
+Example:
+    ```py
+    from graia.ariadne.util.observer import observers
+
+    @observers.observe_api
+    def on_api(name: str, args: tuple, kwargs: dict) -> None:
+        ...
+
+    observers.disable("api")  # 暂停通知 API 调用
+    observers.use_sys_audit(True)  # 同时引发 CallAriadneAPI 与 AriadnePostRemoteEvent 审计事件
+    ```
+"""
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Tuple
+
+if TYPE_CHECKING:
+    from ..event import MiraiEvent
+
+Category = Literal["api", "event"]
+
+APIObserver = Callable[[str, Tuple[Any, ...], Dict[str, Any]], Any]
+"""API 调用的观察者, 接收 API 名称, 位置参数与关键字参数"""
+
+EventObserver = Callable[["MiraiEvent"], Any]
+"""事件的观察者, 接收从远端收到的事件"""
+
+
+class ObserverRegistry:
+    """观察者注册表, 可按类别在运行时开关
+
+    观察者同步调用, 其抛出的异常会传播给调用方, 与审计钩子一样可用于拒绝一次调用.
+    """
+
+    api_active: bool
+    """是否需要通知 API 调用"""
+
+    event_active: bool
+    """是否需要通知事件"""
+
+    def __init__(self) -> None:
+        self.api: List[APIObserver] = []
+        self.event: List[EventObserver] = []
+        self.enabled: Dict[Category, bool] = {"api": True, "event": True}
+        self.sys_audit: bool = False
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self.api_active = self.enabled["api"] and bool(self.api or self.sys_audit)
+        self.event_active = self.enabled["event"] and bool(self.event or self.sys_audit)
+
+    def observe_api(self, observer: APIObserver) -> APIObserver:
+        """注册 API 调用的观察者, 可作为装饰器使用
+
+        Args:
+            observer (APIObserver): 观察者
+
+        Returns:
+            APIObserver: 原观察者
+        """
+        self.api.append(observer)
+        self._refresh()
+        return observer
+
+    def observe_event(self, observer: EventObserver) -> EventObserver:
+        """注册事件的观察者, 可作为装饰器使用
+
+        Args:
+            observer (EventObserver): 观察者
+
+        Returns:
+            EventObserver: 原观察者
+        """
+        self.event.append(observer)
+        self._refresh()
+        return observer
+
+    def remove(self, observer: Callable[..., Any]) -> None:
+        """移除观察者
+
+        Args:
+            observer (Callable[..., Any]): 已注册的观察者
+        """
+        for observers in (self.api, self.event):
+            if observer in observers:
+                observers.remove(observer)
+        self._refresh()
+
+    def enable(self, category: Category) -> None:
+        """开启某一类通知
+
+        Args:
+            category (Category): "api" 或 "event"
+        """
+        self.enabled[category] = True
+        self._refresh()
+
+    def disable(self, category: Category) -> None:
+        """关闭某一类通知, 已注册的观察者会被保留
+
+        Args:
+            category (Category): "api" 或 "event"
+        """
+        self.enabled[category] = False
+        self._refresh()
+
+    def use_sys_audit(self, enabled: bool = True) -> None:
+        """设置是否同时引发 `CallAriadneAPI` 与 `AriadnePostRemoteEvent` 审计事件
+
+        Args:
+            enabled (bool, optional): 是否启用. 默认为 True.
+        """
+        self.sys_audit = enabled
+        self._refresh()
+
+    def emit_api(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        """通知一次 API 调用, 应当先检查 `api_active`
+
+        Args:
+            name (str): API 名称
+            args (Tuple[Any, ...]): 位置参数
+            kwargs (Dict[str, Any]): 关键字参数
+        """
+        if self.sys_audit:
+            sys.audit("CallAriadneAPI", name, args, kwargs)
+        for observer in self.api:
+            observer(name, args, kwargs)
+
+    def emit_event(self, event: "MiraiEvent") -> None:
+        """通知一个从远端收到的事件, 应当先检查 `event_active`
+
+        Args:
+            event (MiraiEvent): 事件
+        """
+        if self.sys_audit:
+            sys.audit("AriadnePostRemoteEvent", event)
+        for observer in self.event:
+            observer(event)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ObserverRegistry api={len(self.api)}{'' if self.enabled['api'] else ' (disabled)'} "
+            f"event={len(self.event)}{'' if self.enabled['event'] else ' (disabled)'} "
+            f"sys_audit={self.sys_audit}>"
+        )
+
+
+observers = ObserverRegistry()
+"""全局的观察者注册表"""
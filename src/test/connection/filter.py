@@ -0,0 +1,69 @@
+import pytest
+from graia.broadcast import Broadcast
+
+from graia.ariadne.connection import HttpServerConnection
+from graia.ariadne.connection.config import HttpServerConfig, config
+from graia.ariadne.connection.filter import EventFilter, raw_group, raw_user
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.event.mirai import NudgeEvent
+
+
+def group_message(group: int, member: int) -> dict:
+    return {
+        "type": "GroupMessage",
+        "sender": {
+            "id": member,
+            "memberName": "member",
+            "permission": "MEMBER",
+            "group": {"id": group, "name": "group", "permission": "MEMBER"},
+        },
+        "messageChain": [{"type": "Source", "id": 1, "time": 0}],
+    }
+
+
+nudge = {"type": "NudgeEvent", "fromId": 5, "target": 1, "subject": {"id": 3, "kind": "Group"}}
+
+
+def test_raw_fields():
+    assert (raw_group(group_message(3, 4)), raw_user(group_message(3, 4))) == (3, 4)
+    assert (raw_group(nudge), raw_user(nudge)) == (3, 5)
+    assert (raw_group({"type": "BotOnlineEvent"}), raw_user({"type": "BotOnlineEvent"})) == (None, None)
+
+
+def test_event_filter():
+    event_filter = EventFilter(block_types={"NudgeEvent"}, allow_groups={3}, block_users={6})
+    assert event_filter.accept(group_message(3, 4))
+    assert not event_filter.accept(group_message(7, 4))
+    assert not event_filter.accept(group_message(3, 6))
+    assert not event_filter.accept(nudge)
+    assert event_filter.accept({"type": "BotOnlineEvent", "qq": 1})
+    assert event_filter.dropped == {"GroupMessage": 2, "NudgeEvent": 1}
+
+
+@pytest.mark.asyncio
+async def test_listened_only():
+    broadcast = Broadcast()
+    event_filter = EventFilter(listened_only=True)
+    event_filter.bind(broadcast)
+    assert not event_filter.accept(group_message(3, 4))
+
+    @broadcast.receiver(GroupMessage)
+    async def _():
+        ...
+
+    assert event_filter.accept(group_message(3, 4))
+    assert not event_filter.accept(nudge)
+    broadcast.receiver(NudgeEvent)(_)
+    assert event_filter.accept(nudge)
+    assert event_filter.listened == {"GroupMessage", "NudgeEvent"}
+    broadcast.listeners[-1].listening_events.remove(NudgeEvent)
+    assert not event_filter.accept(nudge)
+    broadcast.listeners[-1].listening_events.append(NudgeEvent)
+
+    connection = HttpServerConnection(config(1, "", HttpServerConfig())[0])  # type: ignore
+    received = []
+    connection.event_callbacks.append(lambda event: received.append(event) or _())
+    connection.event_filter = event_filter
+    await connection._handle_event({"type": "FriendMessage", "broken": True})
+    await connection._handle_event(group_message(3, 4))
+    assert [type(event) for event in received] == [GroupMessage]
@@ -0,0 +1,148 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from graia.ariadne.connection.gate import (
+    DispatchGate,
+    OrderedDispatchGate,
+    OverflowPolicy,
+    conversation_key,
+)
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event import MiraiEvent
+from graia.ariadne.event.mirai import NudgeEvent
+
+
+def nudge(index: int) -> MiraiEvent:
+    return build_event(
+        {
+            "type": "NudgeEvent",
+            "fromId": index,
+            "target": 1,
+            "subject": {"id": 1, "kind": "Friend"},
+            "action": "戳了戳",
+            "suffix": "",
+        }
+    )
+
+
+def offline() -> MiraiEvent:
+    return build_event({"type": "BotOfflineEventActive", "qq": 1})
+
+
+def group_message(group: int, index: int) -> MiraiEvent:
+    return build_event(
+        {
+            "type": "GroupMessage",
+            "sender": {
+                "id": 2,
+                "memberName": "member",
+                "permission": "MEMBER",
+                "group": {"id": group, "name": "group", "permission": "MEMBER"},
+            },
+            "messageChain": [
+                {"type": "Source", "id": index, "time": 0},
+                {"type": "Plain", "text": str(index)},
+            ],
+        }
+    )
+
+
+def group_recall(index: int) -> MiraiEvent:
+    return build_event(
+        {
+            "type": "GroupRecallEvent",
+            "authorId": 1,
+            "messageId": index,
+            "time": 0,
+            "group": {"id": 1, "name": "group", "permission": "MEMBER"},
+            "operator": None,
+        }
+    )
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.started: List[MiraiEvent] = []
+        self.release = asyncio.Event()
+
+    def dispatch(self, event: MiraiEvent) -> "asyncio.Task[None]":
+        self.started.append(event)
+        return asyncio.create_task(self.release.wait())  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_and_critical_lane():
+    recorder = Recorder()
+    gate = DispatchGate(1, 2, OverflowPolicy.DROP_OLDEST)
+    for i in range(4):
+        await gate.submit(nudge(i), recorder.dispatch)
+    await gate.submit(offline(), recorder.dispatch)
+    assert [getattr(e, "supplicant", None) for e in recorder.started] == [0, None]
+    assert gate.stats["queued"] == 2
+    assert gate.dropped["NudgeEvent"] == 1
+    recorder.release.set()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert [getattr(e, "supplicant", None) for e in recorder.started] == [0, None, 2, 3]
+    assert gate.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_types_and_block():
+    recorder = Recorder()
+    gate = DispatchGate(1, 1, OverflowPolicy.DROP_TYPES, drop_types=[NudgeEvent], block_timeout=0.05)
+    await gate.submit(group_recall(0), recorder.dispatch)
+    await gate.submit(group_recall(1), recorder.dispatch)
+    await gate.submit(nudge(2), recorder.dispatch)
+    assert gate.dropped["NudgeEvent"] == 1
+    blocked = asyncio.create_task(gate.submit(group_recall(3), recorder.dispatch))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    recorder.release.set()
+    await blocked
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert [e.message_id for e in recorder.started] == [0, 1, 3]  # type: ignore
+    assert not gate.dropped["GroupRecallEvent"]
+
+
+@pytest.mark.asyncio
+async def test_ordered_gate():
+    assert conversation_key(group_message(1, 0)) == conversation_key(group_recall(0)) == ("group", 1)
+    assert conversation_key(nudge(0)) is None
+
+    processed = []
+    active = set()
+
+    async def handle(event) -> None:
+        key = event.sender.group.id
+        assert key not in active
+        active.add(key)
+        await asyncio.sleep(0.001 * (key % 3))
+        processed.append((key, int(str(event.message_chain))))
+        active.discard(key)
+
+    single = OrderedDispatchGate(max_workers=4)
+    await single.submit(group_message(1, 0), lambda e: asyncio.create_task(asyncio.sleep(0)))
+    assert single.stats["workers"] == 1
+
+    gate = OrderedDispatchGate(max_workers=2, quantum=2)
+    for i in range(10):
+        for group in range(4):
+            await gate.submit(group_message(group, i), lambda e: asyncio.create_task(handle(e)))
+    assert gate.stats["workers"] == 2
+    while gate.stats["workers"]:
+        await asyncio.sleep(0.01)
+    for group in range(4):
+        assert [i for key, i in processed if key == group] == list(range(10))
+    assert {key for key, _ in processed[:8]} == {0, 1, 2, 3}
+
+    release = asyncio.Event()
+    stuck = OrderedDispatchGate(hold_timeout=0.01)
+    await stuck.submit(group_message(1, 0), lambda _: asyncio.create_task(release.wait()))
+    await stuck.submit(group_message(1, 1), lambda _: asyncio.create_task(asyncio.sleep(0)))
+    await asyncio.sleep(0.05)
+    assert stuck.stats == {"workers": 0, "queues": 0, "pending": 0}
+    release.set()
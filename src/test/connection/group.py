@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from graia.ariadne.connection import ConnectionGroup, WebsocketClientConnection
+from graia.ariadne.connection.config import WebsocketClientConfig, config
+from graia.ariadne.connection.util import CallMethod
+from graia.ariadne.service import ElizabethService
+
+
+class WebsocketIO:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+def link(account: int, host: str) -> WebsocketClientConnection:
+    (info,) = config(account, "", WebsocketClientConfig(host))
+    connection = WebsocketClientConnection(info)  # type: ignore
+    connection.ws_io = WebsocketIO()  # type: ignore
+    connection.status.session_key = host
+    connection.status.alive = True
+    return connection
+
+
+def message(source: int) -> dict:
+    return {
+        "type": "FriendMessage",
+        "sender": {"id": 2, "nickname": "", "remark": ""},
+        "messageChain": [{"type": "Source", "id": source, "time": 0}, {"type": "Plain", "text": "hi"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_connection_group():
+    members = [link(1, "a"), link(1, "b")]
+    group = ConnectionGroup(members)
+    group._connection_fail = lambda: None
+    assert group.status.available and len({member.id for member in members}) == 2
+
+    calls = [asyncio.create_task(group.call("about", CallMethod.GET, {})) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert group.inflight == [2, 2]
+    for member in members:
+        for sent in member.ws_io.sent:  # type: ignore
+            member.futures[sent["syncId"]].set_result(sent["command"])
+    assert await asyncio.gather(*calls) == ["about"] * 4 and group.inflight == [0, 0]
+
+    call = asyncio.create_task(group.call("about", CallMethod.GET, {}))
+    await asyncio.sleep(0)
+    lost = next(member for member, count in zip(members, group.inflight) if count)
+    other = next(member for member in members if member is not lost)
+    for fut in lost.futures.values():
+        fut.set_exception(ConnectionResetError())
+    lost.status.session_key = None
+    await asyncio.sleep(0)
+    (sent,) = other.ws_io.sent[-1:]  # type: ignore
+    other.futures[sent["syncId"]].set_result("ok")
+    assert await call == "ok"
+
+    received = []
+
+    async def callback(event):
+        received.append(event.id)
+
+    group.event_callbacks.append(callback)
+    for member in members:
+        await member._handle_event(message(10))
+        await member._handle_event(message(11))
+    assert received == [10, 11] and group.duplicates == 2
+
+    nudge = {"type": "NudgeEvent", "fromId": 5, "target": 1, "subject": {"id": 3, "kind": "Group"}}
+    assert not group.is_duplicate(nudge, 0) and not group.is_duplicate(nudge, 0)
+    assert group.is_duplicate(nudge, 1) and group.is_duplicate(nudge, 1)
+    assert not group.is_duplicate(nudge, 1)
+
+
+def test_service_group():
+    service = ElizabethService()
+    conns, account = service.add_infos(
+        config(2, "", WebsocketClientConfig("http://a"), WebsocketClientConfig("http://b"))
+    )
+    assert account == 2 and len(conns) == 2
+    assert isinstance(service.connections[2], ConnectionGroup)
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from graia.ariadne.connection import HttpClientConnection
+from graia.ariadne.connection._info import HttpClientInfo, HttpPoolConfig
+from graia.ariadne.testing import MockMiraiServer
+
+
+def test_pool_concurrency():
+    assert HttpPoolConfig().concurrency == 32
+    assert HttpPoolConfig(limit=8).concurrency == 8
+    assert HttpPoolConfig(limit=0, limit_per_host=0).concurrency == 0
+
+
+@pytest.mark.asyncio
+async def test_pooled_requests():
+    async with MockMiraiServer("key") as server:
+        connection = HttpClientConnection(HttpClientInfo(1, "key", server.url, pool=HttpPoolConfig(limit=4)))
+        assert connection.get_url("file_upload") == f"{server.url}/file/upload"
+        assert connection.get_url("file_upload") is connection.get_url("file_upload")
+        results = await asyncio.gather(
+            *(connection.request("GET", connection.get_url("about")) for _ in range(20))
+        )
+        assert all(result["version"] == server.version for result in results)
+        session = connection.get_session()
+        assert session.connector and session.connector.limit == 4
+        assert session.timeout.total == 300 and session.timeout.sock_connect == 30
+        await connection.close()
+        assert connection.session is None
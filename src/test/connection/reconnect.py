@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+
+from graia.ariadne.connection import ConnectionStatus
+from graia.ariadne.connection.reconnect import CircuitState, Reconnector, ReconnectPolicy
+from graia.ariadne.testing import MockMiraiServer
+
+
+def test_backoff():
+    policy = ReconnectPolicy(initial_delay=1, max_delay=10, jitter=0)
+    assert [policy.delay(i) for i in range(1, 7)] == [1, 2, 4, 8, 10, 10]
+    jittered = ReconnectPolicy(jitter=0.5)
+    assert all(0.5 <= jittered.delay(1) <= 1.5 for _ in range(100))
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker():
+    status = ConnectionStatus()
+    policy = ReconnectPolicy(initial_delay=0.001, failure_threshold=3, cooldown=0.001, jitter=0)
+    reconnector = Reconnector(policy, status)
+    for _ in range(2):
+        reconnector.failure()
+        assert await reconnector.wait()
+        assert status.circuit == CircuitState.CLOSED
+    reconnector.failure()
+    assert status.circuit == CircuitState.OPEN
+    assert status.failures == 3 and status.outage_count == 1 and status.outage_since
+
+    probes = []
+
+    async def probe() -> None:
+        probes.append(None)
+        if len(probes) < 3:
+            raise ConnectionError
+
+    assert await reconnector.wait(probe)
+    assert len(probes) == 3 and status.circuit == CircuitState.HALF_OPEN
+    reconnector.failure()
+    assert status.circuit == CircuitState.OPEN
+
+    reconnector.success()
+    assert status.circuit == CircuitState.CLOSED and status.failures == 0
+    assert status.outage_since is None and status.outage_total > 0
+
+    reconnector.exit_signal = asyncio.get_running_loop().create_future()
+    reconnector.exit_signal.set_result(None)
+    reconnector.failure()
+    assert not await reconnector.wait()
+    assert status.outage_count == 2
+
+
+@pytest.mark.asyncio
+async def test_websocket_resume():
+    async with MockMiraiServer("key") as server, ClientSession(server.url) as session:
+        params = {"verifyKey": "key", "qq": "123"}
+        async with session.ws_connect("/all", params=params) as ws:
+            session_key = (await ws.receive_json())["data"]["session"]
+        async with session.ws_connect("/all", params={**params, "sessionKey": session_key}) as ws:
+            assert (await ws.receive_json())["data"]["session"] == session_key
+        async with session.ws_connect("/all", params={**params, "sessionKey": "invalid"}) as ws:
+            assert (await ws.receive_json())["data"]["code"] == 3
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+from graia.amnesia.transport.common.http.extra import HttpRequest
+from yarl import URL
+
+from graia.ariadne.connection import HttpServerConnection
+from graia.ariadne.connection.config import HttpServerConfig, WebhookQueueConfig, config
+
+
+class RequestIO:
+    def __init__(self, data: dict) -> None:
+        self.data = data
+
+    async def extra(self, _):
+        return HttpRequest({"qq": "1"}, {}, {}, URL("http://localhost/"), "localhost", "POST", "", 0)
+
+    async def read(self) -> bytes:
+        return json.dumps(self.data).encode()
+
+
+def nudge(index: int) -> dict:
+    return {
+        "type": "NudgeEvent",
+        "fromId": index,
+        "target": 1,
+        "subject": {"id": 1, "kind": "Friend"},
+        "action": "",
+        "suffix": "",
+    }
+
+
+@pytest.mark.asyncio
+async def test_ack_then_process():
+    (info,) = config(1, "", HttpServerConfig(queue=WebhookQueueConfig(size=2, workers=1)))
+    connection = HttpServerConnection(info)  # type: ignore
+    assert connection.stages == {"blocking"}
+    release = asyncio.Event()
+    received = []
+
+    async def callback(event):
+        await release.wait()
+        received.append(event.supplicant)
+
+    connection.event_callbacks.append(callback)
+    queue = connection.queue = asyncio.Queue(info.queue.size)
+    worker = asyncio.create_task(connection._consume(queue))
+    try:
+        for index in range(4):
+            response = await connection.handle_request(RequestIO(nudge(index)))  # type: ignore
+            assert response == (
+                {"command": "", "data": {}} if index < 3 else ("Event queue is full", {"status": 503})
+            )
+            await asyncio.sleep(0)
+        assert connection.queue_depth == 2 and connection.rejected == 1
+        release.set()
+        await queue.join()
+        assert received == [0, 1, 2] and not connection._overflowing
+    finally:
+        worker.cancel()
@@ -0,0 +1,24 @@
+import pytest
+from graia.amnesia.transport.exceptions import ConnectionClosed
+
+from graia.ariadne.connection import WebsocketClientConnection
+from graia.ariadne.connection.config import WebsocketClientConfig, WebsocketTransportConfig, config
+from graia.ariadne.connection.util import CallMethod
+
+
+class WebsocketIO:
+    async def send(self, data: str) -> None:
+        raise ConnectionClosed("websocket closed")
+
+
+@pytest.mark.asyncio
+async def test_send_closed():
+    (info,) = config(1, "", WebsocketClientConfig(transport=WebsocketTransportConfig(compress=15)))
+    assert info.transport.compress == 15  # type: ignore
+    connection = WebsocketClientConnection(info)  # type: ignore
+    connection.ws_io = WebsocketIO()  # type: ignore
+    connection.status.session_key = "key"
+    connection.status.alive = True
+    with pytest.raises(ConnectionResetError):
+        await connection.call("about", CallMethod.GET, {})
+    assert not connection.futures
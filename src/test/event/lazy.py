@@ -0,0 +1,84 @@
+import pickle
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from graia.ariadne.app import Ariadne
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.element import At
+from graia.ariadne.model import LogConfig
+from graia.ariadne.model.util import is_deferred
+
+data = {
+    "type": "GroupMessage",
+    "sender": {
+        "id": 2,
+        "memberName": "member",
+        "permission": "MEMBER",
+        "group": {"id": 3, "name": "group", "permission": "MEMBER"},
+    },
+    "messageChain": [
+        {"type": "Source", "id": 1, "time": 0},
+        {"type": "Quote", "id": 5, "groupId": 3, "senderId": 2, "targetId": 3, "origin": []},
+        {"type": "Plain", "text": "hello"},
+        {"type": "At", "target": 4},
+    ],
+}
+
+
+def test_lazy_event():
+    event = build_event(data)
+    eager = GroupMessage.parse_obj({k: v for k, v in data.items() if k != "type"})
+    assert isinstance(event, GroupMessage)
+    assert event.id == 1 and event.sender.group.id == 3
+    assert is_deferred(event, "message_chain") and is_deferred(event, "quote")
+
+    assert event.message_chain == MessageChain(["hello", At(4)])
+    assert not is_deferred(event, "message_chain") and is_deferred(event, "quote")
+    assert event.quote and event.quote.id == 5
+
+    assert build_event(data) == eager
+    assert pickle.loads(pickle.dumps(build_event(data))).json() == eager.json()
+    empty = build_event({**data, "messageChain": data["messageChain"][:1]})
+    assert isinstance(empty, GroupMessage) and empty.message_chain.display == "<! 不支持的消息类型 !>"
+
+
+def test_malformed_chain():
+    for chain in (
+        [{"type": "Plain"}],
+        [{"type": "At", "target": "4"}, {"type": "Plain", "text": 1}],
+        [{"type": "Quote", "id": 5, "groupId": 3, "senderId": 2, "targetId": 3, "origin": [{"type": "At"}]}],
+    ):
+        malformed = {**data, "messageChain": [data["messageChain"][0], *chain]}
+        with pytest.raises(Exception) as eager:
+            GroupMessage.parse_obj(malformed)
+        with pytest.raises(eager.type):
+            build_event(malformed)
+
+
+@pytest.mark.asyncio
+async def test_default_callbacks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(logger._core, "min_level", logger.level("WARNING").no)
+    posted = []
+
+    async def cache_set(*_) -> None:
+        pass
+
+    app = SimpleNamespace(
+        account=1,
+        service=SimpleNamespace(loop=None, broadcast=SimpleNamespace(postEvent=posted.append)),
+        launch_manager=SimpleNamespace(get_interface=lambda _: SimpleNamespace(set=cache_set)),
+        entity_store=None,
+        message_store=None,
+        dispatch_gate=None,
+    )
+    config = LogConfig()
+    event = build_event(data)
+    for callback in (config.event_hook(app), Ariadne._event_hook.__get__(app)):  # type: ignore
+        await callback(event)
+    assert posted == [event]
+    assert is_deferred(event, "message_chain") and is_deferred(event, "quote")
+    await config.close()
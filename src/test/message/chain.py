@@ -74,6 +74,23 @@ def test_prefix_suffix():
     assert not MessageChain([At(12345), "hello"]).startswith("hello")
 
 
+def test_fingerprint():
+    chain = MessageChain("Hello ", At(12345))
+    assert chain.fingerprint == MessageChain("Hello ", At(12345)).fingerprint
+    assert chain.fingerprint != MessageChain("Hello ", At(54321)).fingerprint
+    assert MessageChain("ab").fingerprint != MessageChain("a", "b").fingerprint
+    fingerprint = chain.fingerprint
+    chain.append("world")
+    assert chain.fingerprint != fingerprint
+    assert chain.copy().fingerprint == chain.fingerprint
+    chain.removeprefix("Hello", copy=False)
+    assert chain.fingerprint != fingerprint
+    chain.content[0] = Plain("Hello ")
+    chain.content.pop()
+    chain.invalidate_fingerprint()
+    assert chain.fingerprint == fingerprint
+
+
 def test_has():
     msg_chain = MessageChain("Hello", At(target=12345))
     assert msg_chain.has(MessageChain([Plain(text="Hello")]))
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.codec import ChainCodec, DirectoryBlobStore, MemoryBlobStore
+from graia.ariadne.message.element import At, Face, Image, Plain
+
+
+def test_codec(tmp_path):
+    chain = MessageChain(["a[b]%5D", At(12345), Face(name="[]%"), Image(data_bytes=b"\x00binary"), "[mirai:"])
+    for codec in (ChainCodec(), ChainCodec(MemoryBlobStore()), ChainCodec(DirectoryBlobStore(tmp_path))):
+        encoded = codec.encode(chain)
+        assert encoded.startswith("[ariadne:1]")
+        assert codec.decode(encoded) == chain
+        assert codec.decode(encoded).content[3].base64 == chain.content[3].base64
+
+    encoded = codec.encode(chain)
+    assert "base64" not in encoded and codec.blobs.key(b"\x00binary") in encoded
+    with pytest.raises(ValueError):
+        ChainCodec().decode(encoded)
+    with pytest.raises(ValueError):
+        ChainCodec().decode("[ariadne:99]")
+    assert MessageChain.from_persistent_string(ChainCodec().encode(chain)) == chain
+    assert "base64" not in ChainCodec(binary=False).encode(chain)
+
+    legacy = 'hello![_[mirai:At:{"target":12345}][mirai:Face:{"name":"\\u005b"}]'
+    assert ChainCodec().decode(legacy) == MessageChain.from_persistent_string(legacy)
+
+
+def test_archive():
+    codec = ChainCodec(MemoryBlobStore())
+    chains = [MessageChain([Plain(f"line\n{i}"), At(i)]) for i in range(5)]
+    fp = io.StringIO()
+    assert codec.dump(iter(chains), fp) == 5
+    fp.seek(0)
+    assert list(codec.load(fp)) == chains
@@ -0,0 +1,17 @@
+import pytest
+
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.message.element import Source
+
+
+def test_internal_cls():
+    with pytest.raises(NameError):
+        Source.parse_obj({"id": 1, "time": 0})
+    event = build_event(
+        {
+            "type": "FriendMessage",
+            "sender": {"id": 2, "nickname": "", "remark": ""},
+            "messageChain": [{"type": "Source", "id": 1, "time": 0}],
+        }
+    )
+    assert isinstance(event.source, Source) and event.source.id == 1
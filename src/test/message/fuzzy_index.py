@@ -0,0 +1,50 @@
+import difflib
+import gc
+import random
+import string
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.parser.fuzzy import EventResultCache, FuzzyIndex
+
+
+def linear_match(scope_map, text):
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(text)
+    rate_calc = {}
+    for scope, templates in scope_map.items():
+        max_match = 0.0
+        for template in templates:
+            matcher.set_seq1(template)
+            if matcher.real_quick_ratio() < max_match:
+                continue
+            if matcher.quick_ratio() < max_match:
+                continue
+            if matcher.ratio() < max_match:
+                continue
+            rate_calc[scope] = (template, matcher.ratio())
+            max_match = matcher.ratio()
+    return rate_calc
+
+
+def test_fuzzy_index_matches_linear_scan():
+    rand = random.Random(0)
+    words = ["".join(rand.choices(string.ascii_lowercase[:8], k=rand.randint(2, 6))) for _ in range(50)]
+    scope_map = {}
+    index = FuzzyIndex()
+    for i in range(300):
+        template = " ".join(rand.choices(words, k=rand.randint(1, 3)))
+        scope_map.setdefault(f"scope_{i % 4}", []).append(template)
+        index.add(template, f"scope_{i % 4}")
+    texts = [rand.choice(words) + rand.choice(string.ascii_lowercase) for _ in range(100)] + ["", "zzz"]
+    for text in texts:
+        assert index.match(text) == linear_match(scope_map, text), text
+
+
+def test_event_result_cache_weak():
+    cache = EventResultCache(size=2)
+    event = MessageChain("a")
+    cache.set(event, {"": ("a", 1.0)})
+    assert cache.get(event) == {"": ("a", 1.0)}
+    del event
+    gc.collect()
+    assert all(ref() is None for ref, _ in cache.data.values())
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+from graia.broadcast.exceptions import ExecutionStop
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.element import At, Face, Plain
+from graia.ariadne.message.parser.base import (
+    ContainKeyword,
+    DetectPrefix,
+    DetectSuffix,
+    MatchContent,
+    Mention,
+)
+from graia.ariadne.message.parser.keywords import KeywordIndex
+
+
+def test_keyword_index():
+    rand = random.Random(0)
+    words = ["".join(rand.choices("abc", k=rand.randint(1, 4))) for _ in range(40)]
+    index = KeywordIndex(cache_size=0)
+    index.add_prefix(*words[:10])
+    index.add_suffix(*words[10:20])
+    index.add_keyword(*words[20:])
+    index.add_content(*words)
+    for _ in range(300):
+        chain = MessageChain(
+            [
+                rand.choice([Plain("".join(rand.choices("abc", k=rand.randint(0, 6)))), At(1), Face(1)])
+                for _ in range(rand.randint(1, 4))
+            ]
+        )
+        scan = index.scan(chain)
+        assert scan.prefixes == {w for w in words[:10] if chain.startswith(w)}
+        assert scan.suffixes == {w for w in words[10:20] if chain.endswith(w)}
+        assert scan.keywords == {w for w in words[20:] if w in chain}
+        assert scan.contents == {w for w in words if str(chain) == w}
+
+
+@pytest.mark.asyncio
+async def test_decorators():
+    chain = MessageChain(["hello world", At(123), "bye"])
+    assert await DetectPrefix(["hi", "hello"])(chain, None) == MessageChain(["world", At(123), "bye"])
+    assert await DetectSuffix("ye")(chain, None) == MessageChain(["hello world", At(123), "b"])
+    assert await ContainKeyword("lo w")(chain, None) is chain
+    assert await Mention("hello")(chain, None) == MessageChain(["world", At(123), "bye"])
+    assert await MatchContent("hello world@123bye")(chain, None) is chain
+    for decorator in (DetectPrefix("world"), DetectSuffix("hello"), ContainKeyword("dby"), Mention("bye")):
+        with pytest.raises(ExecutionStop):
+            await decorator(chain, None)
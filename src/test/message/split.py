@@ -0,0 +1,109 @@
+import random
+from typing import List
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.commander.util import ChainContentList, quote_pairs
+from graia.ariadne.message.commander.util import split as commander_split
+from graia.ariadne.message.commander.util import split_cache
+from graia.ariadne.message.element import At, Face, Plain, Quote, Source
+from graia.ariadne.message.parser.util import split as parser_split
+
+__name__ = "graia.test.message.split"  # monkey patch to pass internal class check
+
+ALPHABET = "ab c  \\\\'\"‘’“”\n"
+
+
+def legacy_commander_split(chain: MessageChain) -> ChainContentList:
+    result: ChainContentList = []
+    quote: str = ""
+    buffer = []
+    for elem in chain.__root__:
+        if elem.__class__ in (Quote, Source):
+            continue
+        if not isinstance(elem, Plain):
+            buffer.append(elem)
+            continue
+        cache: List[str] = []
+        skipping: bool = False
+        for char in elem.text:
+            if char == "\\" or skipping:
+                skipping = not skipping
+                continue
+            if char in quote_pairs and not quote:
+                quote = quote_pairs[char]
+                continue
+            elif char == quote:
+                quote = ""
+                continue
+            if char == " " and (cache or buffer) and not quote:
+                if cache:
+                    buffer.append("".join(cache))
+                    cache.clear()
+                if buffer:
+                    result.append(buffer)
+                    buffer = []
+            elif quote or char != " ":
+                cache.append(char)
+        if cache:
+            buffer.append("".join(cache))
+    if buffer:
+        result.append(buffer)
+    return result
+
+
+def legacy_parser_split(string: str, keep_quote: bool = False) -> List[str]:
+    result: List[str] = []
+    quote = ""
+    cache: List[str] = []
+    for index, char in enumerate(string):
+        if char in {"'", '"'}:
+            if not quote:
+                quote = char
+            elif char == quote and index and string[index - 1] != "\\":
+                quote = ""
+            else:
+                cache.append(char)
+                continue
+            if keep_quote:
+                cache.append(char)
+        elif not quote and char == " ":
+            result.append("".join(cache))
+            cache = []
+        elif char != "\\":
+            cache.append(char)
+    if cache:
+        result.append("".join(cache))
+    return result
+
+
+def random_text(rand: random.Random) -> str:
+    return "".join(rand.choice(ALPHABET) for _ in range(rand.randint(0, 24)))
+
+
+def test_parser_split():
+    rand = random.Random(0)
+    for _ in range(5000):
+        text = random_text(rand)
+        assert parser_split(text) == legacy_parser_split(text), text
+        assert parser_split(text, keep_quote=True) == legacy_parser_split(text, keep_quote=True), text
+
+
+def test_commander_split():
+    rand = random.Random(0)
+    for _ in range(5000):
+        elements = []
+        for _ in range(rand.randint(0, 4)):
+            elements.append(rand.choice([Plain(random_text(rand)), Plain(random_text(rand)), At(1), Face(1)]))
+        chain = MessageChain(elements)
+        split_cache.clear()
+        assert commander_split(chain) == legacy_commander_split(chain), chain
+
+
+def test_commander_split_cache_isolated():
+    first, second = MessageChain(["a b", At(1)]), MessageChain(["a b", At(1)])
+    split_cache.clear()
+    result = commander_split(first)
+    result[0].append("poisoned")
+    cached = commander_split(second)
+    assert cached == [["a"], ["b", At(1)]]
+    assert cached[1][1] is second.__root__[1]
@@ -0,0 +1,48 @@
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.context import event_ctx
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.element import At
+from graia.ariadne.message.parser.twilight import RegexMatch, Twilight
+from graia.ariadne.message.view import MessageView, get_view
+
+
+def test_view():
+    event = build_event(
+        {
+            "type": "GroupMessage",
+            "sender": {
+                "id": 2,
+                "memberName": "member",
+                "permission": "MEMBER",
+                "group": {"id": 3, "name": "group", "permission": "MEMBER"},
+            },
+            "messageChain": [
+                {"type": "Source", "id": 1, "time": 0},
+                {"type": "Plain", "text": "echo 'a b'\n"},
+                {"type": "At", "target": 4},
+            ],
+        }
+    )
+    assert isinstance(event, GroupMessage)
+    view = event.view
+    assert view is event.view and view.chain is event.message_chain
+    assert view.text == str(event.message_chain) and view.display == event.message_chain.safe_display
+    assert view.mapping() is view.mapping()
+    assert view.tokens == [["echo"], ["a b\n", At(4)]]
+    arguments, _ = view.arguments({})
+    arguments.clear()
+    assert view.arguments({})[0]
+
+    token = event_ctx.set(event)
+    try:
+        assert get_view(event.message_chain) is view
+        assert get_view(MessageChain("echo")) is not view
+        Twilight(RegexMatch("echo"), RegexMatch(r"[\s\S]+")).generate(event.message_chain)
+        assert view._arguments
+    finally:
+        event_ctx.reset(token)
+
+    event.message_chain = MessageChain("new")
+    assert event.view is not view and event.view.text == "new"
+    assert isinstance(get_view(event.message_chain, event), MessageView)
@@ -0,0 +1,42 @@
+import pickle
+
+from graia.ariadne.message.compact import CompactAt, CompactPlain
+from graia.ariadne.message.element import At, Plain
+from graia.ariadne.model.compact import CompactGroup, CompactMember
+from graia.ariadne.model.relationship import Group, Member, MemberPerm
+
+
+def test_compact_element():
+    assert CompactPlain("a") == Plain("a") and hash(CompactPlain("a")) == hash(Plain("a"))
+    assert len({Plain("a"), CompactPlain("a")}) == 1
+    assert CompactAt(1) == At(1) and hash(CompactAt(1)) == hash(At(1))
+    assert hash(CompactAt(1, "x")) == hash(At(1, display="x"))
+    assert CompactPlain.from_element(Plain("a")).to_element() == Plain("a")
+    at = CompactAt.from_element(At(1, display="x")).to_element()
+    assert at.target == 1 and at.representation == "x"
+    assert pickle.loads(pickle.dumps(CompactAt(1, "x"))).representation == "x"
+
+
+def test_compact_group_per_account():
+    owner = CompactGroup(1, "group", "OWNER")
+    member = CompactGroup(1, "group", MemberPerm.Member)
+    assert owner.account_perm == MemberPerm.Owner and member.account_perm == MemberPerm.Member
+    assert owner is CompactGroup(1, "group", MemberPerm.Owner) and owner == member
+    renamed = CompactGroup(1, "renamed", "OWNER")
+    assert owner.name == "group" and renamed.name == "renamed"
+
+
+def test_compact_member_round_trip():
+    data = {
+        "id": 2,
+        "memberName": "member",
+        "permission": "ADMINISTRATOR",
+        "specialTitle": "title",
+        "group": {"id": 1, "name": "group", "permission": "OWNER"},
+    }
+    member = CompactMember.parse_obj(data)
+    model = member.to_model()
+    assert isinstance(model, Member) and model.special_title == "title"
+    assert isinstance(model.group, Group) and model.group.account_perm == MemberPerm.Owner
+    assert CompactMember.from_model(model).dict() == member.dict()
+    assert pickle.loads(pickle.dumps(member)).group is member.group
@@ -0,0 +1,101 @@
+import pytest
+from loguru import logger
+
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import ActiveGroupMessage, GroupMessage
+from graia.ariadne.model import LogConfig, compile_log_format
+from graia.ariadne.model.util import is_deferred
+
+event = build_event(
+    {
+        "type": "GroupMessage",
+        "sender": {
+            "id": 2,
+            "memberName": "member",
+            "permission": "MEMBER",
+            "group": {"id": 3, "name": "group", "permission": "MEMBER"},
+        },
+        "messageChain": [{"type": "Source", "id": 1, "time": 0}, {"type": "Plain", "text": "hello\n"}],
+    }
+)
+
+
+active = ActiveGroupMessage.parse_obj(
+    {
+        "messageChain": [{"type": "Plain", "text": "hi"}],
+        "source": {"type": "Source", "id": 1, "time": 0},
+        "subject": {"id": 3, "name": "group", "permission": "MEMBER"},
+    }
+)
+
+
+class App:
+    account = 1
+
+
+def test_active_message_format():
+    assert compile_log_format(LogConfig()[ActiveGroupMessage])(active, App) == "1: [SEND][group(3)] <- hi"
+
+
+def test_compile_log_format():
+    for fmt in [
+        LogConfig()[GroupMessage],
+        "{event.type!r:>20} {{escaped}}",
+        "{ariadne.account:05d}",
+        "{event.sender.name[0]}",
+        "",
+    ]:
+        assert compile_log_format(fmt or "")(event, App) == (fmt or "").format(event=event, ariadne=App)
+
+
+@pytest.mark.asyncio
+async def test_log():
+    records = []
+    handler = logger.add(records.append, level="INFO", format="{message}")
+    try:
+        config = LogConfig()
+        await config.log(App(), event)  # type: ignore
+        assert not records
+        await config.flush()
+        assert records == ["1: [RECV][group(3)] member(2) -> hello\\n\n"]
+
+        records.clear()
+        config[GroupMessage] = "{event.sender.name}"
+        changed = event.copy(deep=True)
+        await config.log(App(), changed)  # type: ignore
+        changed.sender.name = "changed"
+        await config.flush()
+        assert records == ["member\n"]
+
+        config.log_level = lambda _: None
+        await config.log(App(), event)  # type: ignore
+        await config.flush()
+        assert records == ["member\n"]
+        await config.close()
+    finally:
+        logger.remove(handler)
+
+
+@pytest.mark.asyncio
+async def test_log_filtered_level(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(logger._core, "min_level", logger.level("WARNING").no)
+    config = LogConfig()
+    lazy = build_event(
+        {
+            "type": "GroupMessage",
+            "sender": {
+                "id": 2,
+                "memberName": "member",
+                "permission": "MEMBER",
+                "group": {"id": 3, "name": "group", "permission": "MEMBER"},
+            },
+            "messageChain": [{"type": "Source", "id": 1, "time": 0}, {"type": "Plain", "text": "hello"}],
+        }
+    )
+    await config.log(App(), lazy)  # type: ignore
+    assert is_deferred(lazy, "message_chain")
+    assert config._queue is None
+    config.log_level = lambda _: "WARNING"
+    await config.log(App(), lazy)  # type: ignore
+    assert not is_deferred(lazy, "message_chain")
+    await config.close()
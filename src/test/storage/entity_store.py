@@ -0,0 +1,48 @@
+import pytest
+
+from graia.ariadne.model.relationship import Group, Member, MemberPerm
+from graia.ariadne.storage import EntityStore
+
+
+def group(name: str, perm: str) -> Group:
+    return Group.parse_obj({"id": 1, "name": name, "permission": perm})
+
+
+@pytest.mark.asyncio
+async def test_rename_persisted(tmp_path):
+    path = tmp_path / "entity.db"
+    store = EntityStore(path, reconcile_interval=None)
+    store.put_group(1, group("old", "OWNER"))
+    await store.flush()
+    store.put_group(1, group("new", "OWNER"))
+    assert store.get_group(1, 1).name == "new"
+    await store.close()
+
+    store = EntityStore(path, reconcile_interval=None)
+    await store.load(1)
+    assert store.get_group(1, 1).name == "new"
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_account_isolation(tmp_path):
+    store = EntityStore(tmp_path / "entity.db", reconcile_interval=None)
+    store.put_group(1, group("group", "OWNER"))
+    store.put_member(
+        2,
+        Member.parse_obj(
+            {"id": 3, "memberName": "m", "permission": "MEMBER", "group": group("group", "MEMBER").dict()}
+        ),
+    )
+    assert store.get_group(1, 1).account_perm == MemberPerm.Owner
+    assert store.get_group(2, 1).account_perm == MemberPerm.Member
+    assert store.get_member(2, 1, 3).group.account_perm == MemberPerm.Member
+    assert store.get_member(1, 1, 3) is None
+    await store.close()
+
+    store = EntityStore(tmp_path / "entity.db", reconcile_interval=None)
+    await store.load(1)
+    await store.load(2)
+    assert store.get_group(1, 1).account_perm == MemberPerm.Owner
+    assert store.get_member(2, 1, 3).group.account_perm == MemberPerm.Member
+    await store.close()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import FriendMessage
+from graia.ariadne.storage import EntityStore, MessageStore
+
+
+def friend_message(id: int, sender: int, timestamp: float) -> FriendMessage:
+    return build_event(
+        {
+            "type": "FriendMessage",
+            "sender": {"id": sender, "nickname": "friend", "remark": "friend"},
+            "messageChain": [
+                {"type": "Source", "id": id, "time": int(timestamp)},
+                {"type": "Plain", "text": "hi"},
+            ],
+        }
+    )  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_put_get(tmp_path):
+    store = MessageStore(tmp_path / "message.db", retention=None)
+    store.put(1, friend_message(10, 2, time.time()))
+    assert (await store.get(1, 10, 2)).sender.id == 2
+    assert str((await store.get(1, 10)).message_chain) == "hi"
+    await store.flush()
+    assert not store._pending
+    assert (await store.get(1, 10)).sender.id == 2
+    assert await store.get(1, 10, 3) is None and await store.get(2, 10) is None
+    assert [event.id for event in await store.history(1, 2)] == [10]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_prune(tmp_path):
+    store = MessageStore(tmp_path / "message.db")
+    now = time.time()
+    store.put(1, friend_message(10, 2, now - 8 * 86400))
+    store.put(1, friend_message(11, 2, now))
+    # expired messages are pruned once the batch is committed
+    assert await store.get(1, 10) is not None
+    await store.flush()
+    assert await store.get(1, 10) is None
+    assert (await store.get(1, 11)).id == 11
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_thread(tmp_path):
+    messages, entities = MessageStore(tmp_path / "message.db"), EntityStore(tmp_path / "entity.db")
+    await messages.open()
+    await entities.open()
+    assert messages._executor is entities._executor
+    await messages.close()
+    assert not entities._executor._shutdown  # type: ignore
+    await entities.close()
@@ -0,0 +1,53 @@
+import pytest
+from aiohttp import ClientSession
+
+from graia.ariadne.testing import EventReplayer, MockMiraiServer
+
+
+@pytest.mark.asyncio
+async def test_http_session():
+    async with MockMiraiServer("key") as server, ClientSession(server.url) as session:
+        async with session.post("/verify", json={"verifyKey": "wrong"}) as resp:
+            assert (await resp.json())["code"] == 1
+        async with session.post("/verify", json={"verifyKey": "key"}) as resp:
+            session_key = (await resp.json())["session"]
+        async with session.post("/bind", json={"sessionKey": session_key, "qq": 123}) as resp:
+            assert (await resp.json())["code"] == 0
+
+        await server.push({"type": "NudgeEvent"}, 123)
+        await server.push({"type": "NudgeEvent"}, 456)
+        async with session.get("/fetchMessage", params={"sessionKey": session_key, "count": 10}) as resp:
+            assert (await resp.json())["data"] == [{"type": "NudgeEvent"}]
+
+        async with session.post("/sendGroupMessage", json={"sessionKey": "invalid", "target": 1}) as resp:
+            assert (await resp.json())["code"] == 3
+        async with session.post("/sendGroupMessage", json={"sessionKey": session_key, "target": 1}) as resp:
+            assert (await resp.json())["messageId"] == 1
+        assert [command for command, _ in server.calls] == [
+            "verify",
+            "verify",
+            "bind",
+            "fetchMessage",
+            "sendGroupMessage",
+            "sendGroupMessage",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_websocket_session():
+    async with MockMiraiServer("key") as server, ClientSession(server.url) as session:
+        async with session.ws_connect("/all", params={"verifyKey": "key", "qq": "123"}) as ws:
+            assert "session" in (await ws.receive_json())["data"]
+            await server.push({"type": "NudgeEvent"})
+            assert await ws.receive_json() == {"syncId": "-1", "data": {"type": "NudgeEvent"}}
+            await ws.send_json({"syncId": "1", "command": "about", "content": {}})
+            assert (await ws.receive_json())["data"]["data"]["version"] == server.version
+
+
+@pytest.mark.asyncio
+async def test_queue_overflow_report():
+    async with MockMiraiServer("key", queue_size=2) as server:
+        server._create_session(123)
+        report = await EventReplayer(server, [{"type": "NudgeEvent"}] * 5, account=123).run()
+        assert report.sent == 5 and report.completed is None and report.dropped == 3
+        assert str(report).startswith("?/5 events") and server.dropped == 3
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from graia.ariadne.app import Ariadne
+from graia.ariadne.connection import HttpClientConnection
+from graia.ariadne.connection._info import HttpClientInfo, HttpPoolConfig
+from graia.ariadne.util.bulk import BulkResult, TokenBucket, run_bulk
+
+
+@pytest.mark.asyncio
+async def test_run_bulk():
+    running = 0
+    peak = 0
+
+    async def call(target: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if target % 3 == 0:
+            raise PermissionError(target)
+        return target * 2
+
+    result = await run_bulk(call, [5, 3, 1, 6, 1, 2] * 3, int, concurrency=3)
+    assert peak == 3
+    assert result.targets == [5, 3, 1, 6, 2]
+    assert result.succeeded == [5, 1, 2] and result.failed == [3, 6]
+    assert [(k, v if isinstance(v, int) else type(v)) for k, v in result] == [
+        (5, 10),
+        (3, PermissionError),
+        (1, 2),
+        (6, PermissionError),
+        (2, 4),
+    ]
+    assert result[5] == 10 and not result.ok
+    with pytest.raises(PermissionError):
+        result.raise_for_errors()
+    assert (await run_bulk(call, [], int)).ok
+    assert len(BulkResult([1, 2])) == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket():
+    bucket = TokenBucket(100, 5)
+    start = time.monotonic()
+    await run_bulk(lambda _: asyncio.sleep(0), range(15), int, concurrency=4, rate=bucket)
+    assert 0.08 <= time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_bulk_concurrency():
+    running = peak = 0
+
+    async def call(_) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+
+    await run_bulk(call, range(20), int, concurrency=0)
+    assert peak == 20
+
+    http = HttpClientConnection(HttpClientInfo(1, "key", "http://localhost", pool=HttpPoolConfig(limit=6)))
+    app = SimpleNamespace(connection=SimpleNamespace(connection=http))
+    assert Ariadne._bulk_concurrency(app, None, 8) == 6  # type: ignore
+    assert Ariadne._bulk_concurrency(app, 2, 8) == 2  # type: ignore
+    app.connection.connection = None
+    assert Ariadne._bulk_concurrency(app, None, 8) == 8  # type: ignore
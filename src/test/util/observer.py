@@ -0,0 +1,52 @@
+import sys
+
+import pytest
+
+from graia.ariadne.util import ariadne_api
+from graia.ariadne.util.observer import ObserverRegistry, observers
+
+
+def test_registry(monkeypatch: pytest.MonkeyPatch):
+    audited = []
+    monkeypatch.setattr(sys, "audit", lambda name, *args: audited.append((name, args)))
+    registry = ObserverRegistry()
+    assert not registry.api_active and not registry.event_active
+    calls = []
+    observer = registry.observe_api(lambda *args: calls.append(args))
+    assert registry.api_active and not registry.event_active
+    registry.disable("api")
+    assert not registry.api_active
+    registry.enable("api")
+    registry.emit_api("send", (1,), {"a": 2})
+    assert calls == [("send", (1,), {"a": 2})]
+    registry.remove(observer)
+    assert not registry.api_active
+
+    registry.use_sys_audit()
+    assert registry.api_active and registry.event_active
+    registry.emit_event("event")  # type: ignore
+    assert audited[-1] == ("AriadnePostRemoteEvent", ("event",))
+
+
+@pytest.mark.asyncio
+async def test_ariadne_api(monkeypatch: pytest.MonkeyPatch):
+    audited = []
+    monkeypatch.setattr(sys, "audit", lambda name, *args: audited.append((name, args)))
+
+    class App:
+        @ariadne_api
+        async def call(self, value: int) -> int:
+            return value
+
+    app = App()
+    calls = []
+    observer = observers.observe_api(lambda name, args, kwargs: calls.append((name, args[1:], kwargs)))
+    try:
+        assert await app.call(1) == 1
+        observers.disable("api")
+        assert await app.call(2) == 2
+        assert calls == [("call", (1,), {})]
+        assert not audited
+    finally:
+        observers.enable("api")
+        observers.remove(observer)
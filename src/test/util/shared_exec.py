@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from graia.ariadne.util.async_exec import ParallelExecutor, SharedBuffer, cpu_bound
+
+
+def reverse(data: bytes, *, tail: bytes = b"") -> bytes:
+    assert isinstance(data, bytes)
+    return data[::-1] + tail
+
+
+@cpu_bound
+def checksum(data: bytes) -> int:
+    return sum(data[::4096])
+
+
+def segments() -> set:
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+def test_shared_buffer():
+    handle, shm = SharedBuffer.create(bytearray(b"ariadne"))
+    try:
+        assert handle.size == 7 and handle.read() == b"ariadne"
+    finally:
+        shm.close()
+    assert handle.take() == b"ariadne"
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="requires POSIX shared memory")
+async def test_to_process_shared():
+    before = segments()
+    executor = ParallelExecutor(max_process=1, shared_threshold=1024)
+    try:
+        data = os.urandom(1 << 20)
+        assert await executor.to_process(reverse, data, tail=b"x") == data[::-1] + b"x"
+        assert await executor.to_process(reverse, b"small") == b"llams"
+        assert await checksum(memoryview(data)) == sum(data[::4096])
+    finally:
+        executor.close()
+    assert segments() == before
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from graia.broadcast import Broadcast
+
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.util.interrupt import KeyedWaiter, TimingWheel
+
+
+def group_message(group: int, sender: int, text: str) -> GroupMessage:
+    return build_event(
+        {
+            "type": "GroupMessage",
+            "sender": {
+                "id": sender,
+                "memberName": "member",
+                "permission": "MEMBER",
+                "group": {"id": group, "name": "group", "permission": "MEMBER"},
+            },
+            "messageChain": [{"type": "Source", "id": 1, "time": 0}, {"type": "Plain", "text": text}],
+        }
+    )  # type: ignore
+
+
+def test_timing_wheel():
+    now = [0.0]
+    wheel = TimingWheel(resolution=1.0, size=4, clock=lambda: now[0])
+    for delay in (0.5, 1.0, 3.5, 4.0, 9.0):
+        wheel.add(delay, delay)
+    assert len(wheel) == 5
+    expired = {}
+    for tick in range(1, 11):
+        now[0] = tick
+        for item in wheel.advance():
+            expired[item] = tick
+    assert expired == {0.5: 1, 1.0: 1, 3.5: 4, 4.0: 4, 9.0: 9} and not wheel
+
+
+@pytest.mark.asyncio
+async def test_keyed_waiter():
+    broadcast = Broadcast()
+    waiter = KeyedWaiter([GroupMessage], resolution=0.01)
+    waiter.install(broadcast)
+    answers = [
+        asyncio.create_task(waiter.wait((1, sender), validator=lambda ev: "yes" in ev.message_chain))
+        for sender in range(100)
+    ]
+    timeout = asyncio.create_task(waiter.wait((2, 1), timeout=0.05, default="timeout"))
+    await asyncio.sleep(0)
+    assert len(waiter.pending) == 101
+
+    await waiter.dispatch(group_message(1, 5, "no"))
+    await waiter.dispatch(group_message(1, 5, "yes"))
+    await waiter.dispatch(group_message(3, 6, "yes"))
+    await asyncio.sleep(0)
+    assert answers[5].done() and not answers[6].done()
+    assert str((await answers[5]).message_chain) == "yes"
+
+    await broadcast.layered_scheduler(
+        broadcast.default_listener_generator(GroupMessage), group_message(1, 7, "yes")
+    )
+    assert (await answers[7]).sender.id == 7
+
+    assert await timeout == "timeout"
+    for task in answers:
+        task.cancel()
+    await asyncio.gather(*answers, return_exceptions=True)
+    assert not waiter.pending and waiter._ticker is None
+    waiter.uninstall()
+    assert waiter.listener is None and not broadcast.listeners
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+from graia.ariadne.util.async_exec import ParallelExecutor, io_bound
+
+
+def power(base: int, exp: int) -> int:
+    return base**exp
+
+
+@io_bound
+def block(event: threading.Event) -> bool:
+    return event.wait(5)
+
+
+@pytest.mark.asyncio
+async def test_map_chunks():
+    executor = ParallelExecutor(max_thread=2, max_process=1)
+    try:
+        assert await executor.map(power, range(10), [2] * 10, chunksize=3) == [i**2 for i in range(10)]
+        assert await executor.starmap(power, [(2, i) for i in range(5)], process=False) == [1, 2, 4, 8, 16]
+        assert await executor.map(power, [], []) == []
+        metrics = executor.process_pool.metrics
+        assert metrics.submitted == metrics.completed == 4 and not metrics.pending
+        assert executor.thread_pool.metrics.completed == 5 and executor.thread_pool.metrics.run_time > 0
+        with pytest.raises(TypeError):
+            await executor.to_process(power, 1)
+        assert metrics.failed == 1 and metrics.completed == 5
+    finally:
+        executor.close()
+
+
+@pytest.mark.asyncio
+async def test_dedicated_pool():
+    executor = ParallelExecutor(max_thread=4, idle_timeout=0.01)
+    try:
+        pool = executor.dedicate(block, 1, process=False)
+        assert executor.pool_for(block, False) is pool and executor.pool_for(block, True) is not pool
+        event = threading.Event()
+        blocked = asyncio.create_task(block(event))
+        await asyncio.sleep(0.01)
+        # the shared thread pool is not occupied by the blocked call
+        assert await executor.to_thread(power, 3, 2) == 9
+        assert pool.metrics.pending == 1 and f"{__name__}.block" in executor.pools
+        event.set()
+        assert await blocked
+        assert executor.thread_pool.workers == 1
+        event.clear()
+        waiters = [asyncio.ensure_future(executor.to_thread(event.wait, 5)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        # queued calls double the worker count until none are left waiting
+        assert executor.thread_pool.workers == 4 and executor.thread_pool.queue_depth == 0
+        event.set()
+        assert all(await asyncio.gather(*waiters))
+        await asyncio.sleep(0.05)
+        assert executor.thread_pool.workers == 1
+    finally:
+        executor.close()
+
+
+@pytest.mark.asyncio
+async def test_burst_bounded():
+    executor = ParallelExecutor(max_thread=4, idle_timeout=0.01)
+    pool = executor.thread_pool
+    try:
+        event = threading.Event()
+        before = threading.active_count()
+        waiters = [asyncio.ensure_future(executor.to_thread(event.wait, 5)) for _ in range(16)]
+        await asyncio.sleep(0.05)
+        # the limit grows to max_thread, the rest of the burst queues instead of starting new executors
+        assert pool.workers == 4 and pool.queue_depth == 12 and pool.metrics.pending == 16
+        assert len(pool.executor._threads) == 4 and threading.active_count() - before == 4  # type: ignore
+        event.set()
+        assert all(await asyncio.gather(*waiters))
+        assert len(pool.executor._threads) == 4  # type: ignore
+        await asyncio.sleep(0.05)
+        assert pool.workers == 1 and not pool.executor._threads  # type: ignore
+    finally:
+        executor.close()
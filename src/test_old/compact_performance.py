@@ -0,0 +1,50 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.model import Member
+from graia.ariadne.model.compact import CompactMember
+
+RUN = 100000
+GROUPS = 100
+
+
+def gen_raw(index: int) -> dict:
+    group_id = 100000 + index % GROUPS
+    return {
+        "id": 1000000 + index,
+        "memberName": f"member_{index % 5000}",
+        "permission": "MEMBER",
+        "specialTitle": "",
+        "joinTimestamp": 1650000000 + index,
+        "lastSpeakTimestamp": 1660000000 + index,
+        "mutetimeRemaining": 0,
+        "group": {"id": group_id, "name": f"group_{group_id}", "permission": "ADMINISTRATOR"},
+    }
+
+
+def measure(name: str, factory) -> None:
+    raw = [gen_raw(i) for i in range(RUN)]
+    gc.collect()
+    tracemalloc.start()
+    st = time.time()
+    members = [factory(data) for data in raw]
+    ed = time.time()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {current / 1024 / 1024:.2f} MiB, {RUN / (ed - st):.2f} members/s")
+    del members
+
+
+if __name__ == "__main__":
+    measure("Member", Member.parse_obj)
+    measure("CompactMember", CompactMember.parse_obj)
+
+    raw = gen_raw(0)
+    assert CompactMember.parse_obj(raw) == Member.parse_obj(raw)
+    assert Member.parse_obj(raw) == CompactMember.parse_obj(raw)
+    assert CompactMember.parse_obj(raw).to_model().dict() == Member.parse_obj(raw).dict()
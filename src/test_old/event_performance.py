@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from loguru import logger
+
+from graia.ariadne.app import Ariadne
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.model import LogConfig
+from graia.ariadne.model.util import is_deferred
+
+RUN = 20000
+
+chain = [{"type": "Source", "id": 1, "time": 1660000000}]
+chain.append(
+    {
+        "type": "Quote",
+        "id": 2,
+        "groupId": 3,
+        "senderId": 4,
+        "targetId": 3,
+        "origin": [{"type": "Plain", "text": "quoted message"}, {"type": "Face", "faceId": 1}],
+    }
+)
+for i in range(10):
+    chain.extend([{"type": "Plain", "text": f"segment {i} "}, {"type": "At", "target": i}])
+data = {
+    "type": "GroupMessage",
+    "sender": {
+        "id": 4,
+        "memberName": "member",
+        "permission": "MEMBER",
+        "group": {"id": 3, "name": "group", "permission": "MEMBER"},
+    },
+    "messageChain": chain,
+}
+
+
+async def cache_set(*_) -> None:
+    pass
+
+
+app = SimpleNamespace(
+    account=1,
+    service=SimpleNamespace(loop=None, broadcast=SimpleNamespace(postEvent=lambda _: None)),
+    launch_manager=SimpleNamespace(get_interface=lambda _: SimpleNamespace(set=cache_set)),
+    entity_store=None,
+    message_store=None,
+    dispatch_gate=None,
+)
+
+
+async def default_callbacks() -> None:
+    callbacks = (LogConfig().event_hook(app), Ariadne._event_hook.__get__(app))  # type: ignore
+    for _ in range(RUN):
+        event = build_event(data)
+        for callback in callbacks:
+            await callback(event)
+        _ = event.sender.id
+    assert is_deferred(event, "message_chain") and is_deferred(event, "quote")
+
+
+if __name__ == "__main__":
+    raw = {k: v for k, v in data.items() if k != "type"}
+    assert build_event(data) == GroupMessage.parse_obj(raw)
+
+    st = time.time()
+    for _ in range(RUN):
+        event = GroupMessage.parse_obj(raw)
+        _ = event.sender.id
+    ed = time.time()
+    print(f"Eager parse_obj: {RUN / (ed - st):.2f} event/s")
+
+    st = time.time()
+    for _ in range(RUN):
+        event = build_event(data)
+        _ = event.sender.id
+    ed = time.time()
+    print(f"Lazy build_event, sender only: {RUN / (ed - st):.2f} event/s")
+
+    st = time.time()
+    for _ in range(RUN):
+        event = build_event(data)
+        _ = event.message_chain, event.quote
+    ed = time.time()
+    print(f"Lazy build_event, full access: {RUN / (ed - st):.2f} event/s")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    st = time.time()
+    asyncio.run(default_callbacks())
+    ed = time.time()
+    print(f"Lazy build_event, default callbacks, sender only: {RUN / (ed - st):.2f} event/s")
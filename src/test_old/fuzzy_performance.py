@@ -0,0 +1,74 @@
+import difflib
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.message.parser.fuzzy import FuzzyIndex
+
+RUN = 200
+TEMPLATES = 5000
+SCOPES = 10
+
+
+def legacy_match(scope_map, text):
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(text)
+    rate_calc = {}
+    for scope, templates in scope_map.items():
+        max_match: float = 0.0
+        for template in templates:
+            matcher.set_seq1(template)
+            if matcher.real_quick_ratio() < max_match:
+                continue
+            if matcher.quick_ratio() < max_match:
+                continue
+            if matcher.ratio() < max_match:
+                continue
+            rate_calc[scope] = (template, matcher.ratio())
+            max_match = matcher.ratio()
+    return rate_calc
+
+
+def gen_word(rand: random.Random) -> str:
+    return "".join(rand.choices(string.ascii_lowercase, k=rand.randint(3, 8)))
+
+
+def gen_typo(rand: random.Random, template: str) -> str:
+    chars = list(template)
+    for _ in range(rand.randint(0, 2)):
+        chars[rand.randrange(len(chars))] = rand.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+if __name__ == "__main__":
+    rand = random.Random(42)
+    vocabulary = [gen_word(rand) for _ in range(1000)]
+    scope_map = {}
+    index = FuzzyIndex(cache_size=0)
+    templates = []
+    for i in range(TEMPLATES):
+        template = " ".join(rand.choices(vocabulary, k=rand.randint(1, 3)))
+        scope = f"scope_{i % SCOPES}"
+        scope_map.setdefault(scope, []).append(template)
+        templates.append(template)
+        index.add(template, scope)
+    texts = [gen_typo(rand, rand.choice(templates)) for _ in range(RUN)]
+
+    for text in texts:
+        assert index.match(text) == legacy_match(scope_map, text), text
+
+    st = time.time()
+    for text in texts:
+        legacy_match(scope_map, text)
+    ed = time.time()
+    print(f"SequenceMatcher loop: {RUN / (ed - st):.2f} msg/s, {TEMPLATES} templates")
+
+    st = time.time()
+    for text in texts:
+        index.match(text)
+    ed = time.time()
+    print(f"FuzzyIndex: {RUN / (ed - st):.2f} msg/s, {TEMPLATES} templates")
@@ -0,0 +1,44 @@
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.element import At
+from graia.ariadne.message.parser.keywords import KeywordIndex
+
+RUN = 200
+
+
+def gen_word(rand: random.Random) -> str:
+    return "".join(rand.choices(string.ascii_lowercase, k=rand.randint(2, 6)))
+
+
+if __name__ == "__main__":
+    rand = random.Random(42)
+    chains = [
+        MessageChain([" ".join(gen_word(rand) for _ in range(rand.randint(3, 20))), At(1), gen_word(rand)])
+        for _ in range(RUN)
+    ]
+    for count in (10, 100, 1000, 3000):
+        keywords = [gen_word(rand) for _ in range(count)]
+        index = KeywordIndex(cache_size=0)
+        index.add_keyword(*keywords)
+        for chain in chains:
+            assert index.scan(chain).keywords == {k for k in keywords if k in chain}
+
+        st = time.time()
+        for chain in chains:
+            for keyword in keywords:
+                _ = keyword in chain
+        ed = time.time()
+        print(f"{count:>5} keywords, `in` loop: {RUN / (ed - st):.2f} msg/s")
+
+        st = time.time()
+        for chain in chains:
+            index.scan(chain)
+        ed = time.time()
+        print(f"{count:>5} keywords, KeywordIndex: {RUN / (ed - st):.2f} msg/s")
@@ -0,0 +1,36 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.util.async_exec import ParallelExecutor
+
+ITEMS = 5000
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+async def main() -> None:
+    executor = ParallelExecutor(max_process=2, min_process=2)
+    await executor.warm_up()
+    try:
+        st = time.perf_counter()
+        await asyncio.gather(*(executor.to_process(square, i) for i in range(ITEMS)))
+        print(f"to_process: {ITEMS / (time.perf_counter() - st):10.2f} calls/s")
+        for chunksize in (1, 16, 256):
+            st = time.perf_counter()
+            assert await executor.map(square, range(ITEMS), chunksize=chunksize) == [
+                i * i for i in range(ITEMS)
+            ]
+            print(f"map, chunksize={chunksize:>3}: {ITEMS / (time.perf_counter() - st):10.2f} calls/s")
+        print(executor.process_pool)
+    finally:
+        executor.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+import creart
+from graia.amnesia.builtins.aiohttp import AiohttpServerService
+
+from graia.ariadne.app import Ariadne
+from graia.ariadne.connection.config import (
+    HttpClientConfig,
+    HttpServerConfig,
+    WebsocketClientConfig,
+    WebsocketServerConfig,
+    config,
+)
+from graia.ariadne.event.lifecycle import ApplicationLaunch
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.model import Group
+from graia.ariadne.testing import EventReplayer, LatencyProbe, MockMiraiServer, load_events
+
+ACCOUNT = 123456789
+VERIFY_KEY = "ServiceVerifyKey"
+BOT_PORT = 21447
+RUN = 5000
+RATE = None  # events/s, None for as fast as possible
+MODES = ("http_client", "ws_client", "http_server", "ws_server")
+
+
+def group_message(index: int) -> dict:
+    return {
+        "type": "GroupMessage",
+        "sender": {
+            "id": 10000 + index % 50,
+            "memberName": f"member {index % 50}",
+            "permission": "MEMBER",
+            "group": {"id": 20000 + index % 5, "name": f"group {index % 5}", "permission": "MEMBER"},
+        },
+        "messageChain": [
+            {"type": "Source", "id": index, "time": 1660000000 + index},
+            {"type": "Plain", "text": f"hello {index}"},
+        ],
+    }
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "ws_client"
+    assert mode in MODES, f"mode should be one of {MODES}"
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        for i in range(500):
+            f.write(json.dumps({"time": i / 100, "event": group_message(i)}) + "\n")
+    events = load_events(f.name)
+    os.unlink(f.name)
+
+    loop = creart.it(asyncio.AbstractEventLoop)
+    server = MockMiraiServer(VERIFY_KEY)
+    loop.run_until_complete(server.start())
+
+    configs = {
+        "http_client": HttpClientConfig(server.url),
+        "ws_client": WebsocketClientConfig(server.url),
+        "http_server": HttpServerConfig("/http"),
+        "ws_server": WebsocketServerConfig("/ws"),
+    }
+    infos = [configs[mode]]
+    if mode != "http_client":
+        infos.append(HttpClientConfig(server.url))
+    app = Ariadne(config(ACCOUNT, VERIFY_KEY, *infos))
+    if mode in {"http_server", "ws_server"}:
+        Ariadne.launch_manager.add_service(AiohttpServerService("127.0.0.1", BOT_PORT))
+
+    probe = LatencyProbe(Ariadne.broadcast)
+    probe.attach()
+
+    @Ariadne.broadcast.receiver(GroupMessage)
+    async def handler(group: Group):
+        await asyncio.sleep(0)
+
+    async def replay():
+        # 服务器类连接在收到第一个事件前不会被视为可用
+        if mode == "http_server":
+            await asyncio.sleep(1)
+            server.add_http_target(f"http://127.0.0.1:{BOT_PORT}/http", ACCOUNT)
+        elif mode == "ws_server":
+            await asyncio.sleep(1)
+            await server.connect_websocket(f"ws://127.0.0.1:{BOT_PORT}/ws", ACCOUNT)
+            while not app.connection.status.session_key:
+                await app.connection.status.wait_for_update()
+        else:
+            await app.connection.status.wait_for_available()
+        report = await EventReplayer(server, events, account=ACCOUNT, rate=RATE).run(probe, count=RUN)
+        print(f"{mode}: {report}")
+        Ariadne.stop()
+
+    @Ariadne.broadcast.receiver(ApplicationLaunch)
+    async def start():
+        asyncio.create_task(replay())
+
+    Ariadne.launch_blocking()
+    loop.run_until_complete(server.stop())
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.util.async_exec import ParallelExecutor
+
+RUN = 10
+SIZES = (1, 10, 50)  # MB
+
+
+def echo(data: bytes) -> bytes:
+    return data
+
+
+async def bench(executor: ParallelExecutor, data: bytes) -> float:
+    await executor.to_process(echo, b"warm up")
+    st = time.perf_counter()
+    for _ in range(RUN):
+        assert len(await executor.to_process(echo, data)) == len(data)
+    return time.perf_counter() - st
+
+
+async def main() -> None:
+    pickled = ParallelExecutor(max_process=1)
+    shared = ParallelExecutor(max_process=1, shared_threshold=64 * 1024)
+    try:
+        for size in SIZES:
+            data = os.urandom(size * 1024 * 1024)
+            for name, executor in (("pickle", pickled), ("shared memory", shared)):
+                elapsed = await bench(executor, data)
+                print(
+                    f"{size:>3} MB, {name:>13}: {RUN / elapsed:7.2f} calls/s, "
+                    f"{RUN * size * 2 / elapsed:8.2f} MB/s round trip"
+                )
+    finally:
+        pickled.close()
+        shared.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+import os
+import random
+import runpy
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.ariadne.message.chain import MessageChain
+from graia.ariadne.message.commander.util import split as commander_split
+from graia.ariadne.message.commander.util import split_cache
+from graia.ariadne.message.element import At
+from graia.ariadne.message.parser.util import split as parser_split
+
+RUN = 2000
+LENGTH = 4096
+
+legacy = runpy.run_path(os.path.join(os.path.dirname(__file__), "..", "test", "message", "split.py"))
+legacy_parser_split = legacy["legacy_parser_split"]
+legacy_commander_split = legacy["legacy_commander_split"]
+
+if __name__ == "__main__":
+    rand = random.Random(0)
+    words = ["".join(rand.choice("abcdefghij") for _ in range(rand.randint(1, 12))) for _ in range(200)]
+    words += ['"quoted text"', "'single quoted'", "\\escaped", "“中文 引号”"]
+    text = ""
+    while len(text) < LENGTH:
+        text += rand.choice(words) + " "
+    chain = MessageChain([text, At(123), text])
+    print(f"Text length: {len(text)}")
+
+    assert parser_split(text, keep_quote=True) == legacy_parser_split(text, keep_quote=True)
+    split_cache.clear()
+    assert commander_split(chain) == legacy_commander_split(chain)
+
+    for name, func in (
+        ("Legacy parser.util.split", legacy_parser_split),
+        ("parser.util.split", parser_split),
+    ):
+        st = time.time()
+        for _ in range(RUN):
+            func(text, keep_quote=True)
+        ed = time.time()
+        print(f"{name}: {RUN / (ed - st):.2f}msg/s")
+
+    for name, func in (
+        ("Legacy commander split", legacy_commander_split),
+        ("commander split", commander_split),
+    ):
+        st = time.time()
+        for _ in range(RUN):
+            split_cache.clear()
+            chain.invalidate_fingerprint()
+            func(chain)
+        ed = time.time()
+        print(f"{name}: {RUN / (ed - st):.2f}msg/s")
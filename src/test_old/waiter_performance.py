@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.broadcast import Broadcast
+from graia.broadcast.interrupt import InterruptControl
+
+from graia.ariadne.connection.util import build_event
+from graia.ariadne.event.message import GroupMessage
+from graia.ariadne.util.interrupt import EventWaiter, KeyedWaiter
+
+WAITERS = 2000
+RUN = 200
+
+
+def group_message(sender: int, text: str) -> GroupMessage:
+    return build_event(
+        {
+            "type": "GroupMessage",
+            "sender": {
+                "id": sender,
+                "memberName": "member",
+                "permission": "MEMBER",
+                "group": {"id": 1, "name": "group", "permission": "MEMBER"},
+            },
+            "messageChain": [{"type": "Source", "id": 1, "time": 0}, {"type": "Plain", "text": text}],
+        }
+    )  # type: ignore
+
+
+async def post(broadcast: Broadcast, events: list) -> float:
+    st = time.perf_counter()
+    await asyncio.gather(*(broadcast.postEvent(event) for event in events))
+    return time.perf_counter() - st
+
+
+async def main() -> None:
+    # messages from users who have no pending conversation
+    events = [group_message(WAITERS + i, "hello") for i in range(RUN)]
+
+    broadcast = Broadcast()
+    inc = InterruptControl(broadcast)
+    tasks = [
+        asyncio.create_task(
+            inc.wait(
+                EventWaiter(
+                    [GroupMessage],
+                    extra_validator=lambda ev, sender=sender: ev.sender.id == sender,  # type: ignore
+                ),
+                timeout=60,
+            )
+        )
+        for sender in range(WAITERS)
+    ]
+    await asyncio.sleep(0)
+    print(f"EventWaiter: {RUN / await post(broadcast, events):.2f} msg/s with {WAITERS} waiters")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    broadcast = Broadcast()
+    waiter = KeyedWaiter([GroupMessage])
+    waiter.install(broadcast)
+    tasks = [asyncio.create_task(waiter.wait((1, sender), timeout=60)) for sender in range(WAITERS)]
+    await asyncio.sleep(0)
+    print(f"KeyedWaiter: {RUN / await post(broadcast, events):.2f} msg/s with {WAITERS} waiters")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
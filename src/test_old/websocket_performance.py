@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from aiohttp import ClientSession
+from graia.amnesia.builtins.aiohttp import AiohttpClientConnectionRider
+from graia.amnesia.transport.common.websocket import WebsocketConnectEvent, WebsocketReceivedEvent
+from graia.amnesia.transport.exceptions import ConnectionClosed
+
+from graia.ariadne.connection import WebsocketClientConnection
+from graia.ariadne.connection.config import WebsocketClientConfig, WebsocketTransportConfig, config
+from graia.ariadne.connection.util import CallMethod
+from graia.ariadne.testing import MockMiraiServer
+
+ACCOUNT = 123456789
+VERIFY_KEY = "ServiceVerifyKey"
+ROUNDS = 20
+CONCURRENCY = 50
+MEMBERS = 2000
+MODES = {
+    "plain": WebsocketTransportConfig(),
+    "compress": WebsocketTransportConfig(compress=15),
+    "compress=9": WebsocketTransportConfig(compress=9),
+}
+
+
+class CountingProxy:
+    """转发 TCP 流量并统计两个方向的字节数"""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.sent = 0
+        self.received = 0
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, upstream: bool) -> None:
+        while data := await reader.read(65536):
+            if upstream:
+                self.sent += len(data)
+            else:
+                self.received += len(data)
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        remote_reader, remote_writer = await asyncio.open_connection("127.0.0.1", self.port)
+        await asyncio.gather(
+            self._pipe(reader, remote_writer, True), self._pipe(remote_reader, writer, False)
+        )
+
+    async def start(self) -> str:
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def member(index: int) -> dict:
+    return {
+        "id": 10000 + index,
+        "memberName": f"member {index}",
+        "specialTitle": "",
+        "permission": "MEMBER",
+        "joinTimestamp": 1660000000 + index,
+        "lastSpeakTimestamp": 1660000000 + index,
+        "muteTimeRemaining": 0,
+        "group": {"id": 1, "name": "group", "permission": "MEMBER"},
+    }
+
+
+async def receive(connection: WebsocketClientConnection, io) -> None:
+    (on_receive,) = connection.get_callbacks(WebsocketReceivedEvent)
+    try:
+        async for data in io.packets():
+            await on_receive(io, data)
+    except ConnectionClosed:
+        pass
+
+
+async def run(server: MockMiraiServer, mode: str) -> None:
+    proxy = CountingProxy(server.port)
+    (info,) = config(ACCOUNT, VERIFY_KEY, WebsocketClientConfig(await proxy.start(), transport=MODES[mode]))
+    connection = WebsocketClientConnection(info)  # type: ignore
+    async with ClientSession() as session:
+        transport = info.transport  # type: ignore
+        rider = AiohttpClientConnectionRider(
+            None,  # type: ignore
+            session.ws_connect,
+            {
+                "url": connection.get_url(),
+                "compress": transport.compress,
+                "max_msg_size": transport.max_msg_size,
+            },
+        )
+        await rider
+        io = rider.io()
+        for callback in connection.get_callbacks(WebsocketConnectEvent):
+            await callback(io)
+        receiver = asyncio.create_task(receive(connection, io))
+        await connection.status.wait_for_available()
+        sent, received = proxy.sent, proxy.received
+
+        calls = 0
+        cpu, st = time.process_time(), time.perf_counter()
+        for _ in range(ROUNDS):
+            jobs = [connection.call("memberList", CallMethod.GET, {"target": 1})]
+            jobs.extend(
+                connection.call(
+                    "sendGroupMessage",
+                    CallMethod.POST,
+                    {"target": 1, "messageChain": [{"type": "Plain", "text": f"hello {i} " * 20}]},
+                )
+                for i in range(CONCURRENCY)
+            )
+            await asyncio.gather(*jobs)
+            calls += len(jobs)
+        cpu, ed = time.process_time() - cpu, time.perf_counter()
+
+        print(
+            f"{mode:>18}: {calls / (ed - st):8.2f} calls/s, "
+            f"{cpu / calls * 1e6:7.1f} us CPU/call, "
+            f"sent {(proxy.sent - sent) / calls:7.1f} B/call, "
+            f"received {(proxy.received - received) / calls:8.1f} B/call"
+        )
+        await io.close()
+        receiver.cancel()
+
+
+async def main() -> None:
+    server = MockMiraiServer(VERIFY_KEY, members={1: [member(i) for i in range(MEMBERS)]})
+    await server.start()
+    try:
+        for mode in MODES:
+            await run(server, mode)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())